@@ -1,9 +1,9 @@
 # ./src/core/show_feedback.py
 import pygame
-from pathlib import Path
 
 import utils.config as cfg
 from utils.logger import get_logger
+from ui.ied_ui import load_block_image
 
 logger = get_logger("./src/core/show_feedback")    # create logger
 
@@ -13,34 +13,15 @@ def show_feedback(screen: pygame.Surface, correct: bool) -> None:
     - correct == True: show correct feedback image
     - correct == False: show incorrect feedback image
     """
-    # Load image
+    # Load image (max_W = RECT_W - 50 / max_H = RECT_H - 50; decoded once, see ui.ied_ui.load_block_image)
     if correct:
         img_path = cfg.FB_CORRECT
     else:
         img_path = cfg.FB_INCORRECT
-    p = Path(img_path)
-    if not p.exists():
-        logger.error(f"show_feedback: file not found -> {img_path}")
+    img = load_block_image(img_path)
+    if img is None:
         return None
 
-    try:
-        img = pygame.image.load(str(p)).convert_alpha()
-    except Exception as e:
-        logger.error(f"show_feedback: failed to load image -> {img_path} | {e}")
-        return None
-
-    # Resize image (max_W = RECT_W - 50 / max_H = RECT_H - 50)
-    orig_w, orig_h = img.get_size()
-    max_w, max_h = cfg.RECT_W - 50, cfg.RECT_H - 50
-    if orig_w <= 0 or orig_h <= 0:
-        logger.error(f"show_feedback: invalid image size -> {img_path} ({orig_w}x{orig_h})")
-        return None
-
-    scale = min(max_w / orig_w, max_h / orig_h)
-    new_size = (max(1, int(orig_w * scale)), max(1, int(orig_h * scale)))
-    if new_size != (orig_w, orig_h):
-        img = pygame.transform.smoothscale(img, new_size)
-
     # Compute center
     w, h = screen.get_size()
     cx, cy = w / 2, h / 2
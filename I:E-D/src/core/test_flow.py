@@ -7,7 +7,7 @@ from pathlib import Path
 import utils.config as cfg
 from utils.logger import get_logger
 from core.pygame_setup import toggle_full_screen
-from ui.ied_ui import show_ied_ui, place_single_image, place_overlapped_images, place_side_by_side_images
+from ui.frame_compositor import show_trial_frame
 from core.show_feedback import show_feedback
 from core.saves import update_save
 
@@ -29,14 +29,8 @@ def _load_stimulus_for_practice(screen: pygame.Surface, phase: int, correct_ind:
     Select target stimulus path from the assignd phase
     Load and placetarget stimulus
     """
-    show_ied_ui(screen)
-    
-    # Place stimuli to target location
-    correct_img = getattr(cfg, f"{phase}_CORRECT")
-    incorrect_img = getattr(cfg, f"{phase}_INCORRECT")
-
-    place_single_image(screen, correct_img, correct_ind)
-    place_single_image(screen, incorrect_img, incorrect_ind)
+    # Blit the pre-composed four-box frame (built once per trial, see ui.frame_compositor)
+    show_trial_frame(screen, "single", phase, correct_ind, incorrect_ind)
 
 
 def run_practice(screen: pygame.Surface, phase: str) -> None:
@@ -156,14 +150,8 @@ def _load_single_stimulus(screen: pygame.Surface, phase: int, correct_ind: int,
     Select target stimulus path from the assignd phase
     Load and place target stimulus
     """
-    show_ied_ui(screen)
-    
-    # Place stimuli to target location
-    correct_img = getattr(cfg, f"{phase}_CORRECT")
-    incorrect_img = getattr(cfg, f"{phase}_INCORRECT")
-
-    place_single_image(screen, correct_img, correct_ind)
-    place_single_image(screen, incorrect_img, incorrect_ind)
+    # Blit the pre-composed four-box frame (built once per trial, see ui.frame_compositor)
+    show_trial_frame(screen, "single", phase, correct_ind, incorrect_ind)
 
 
 def run_single_stimulus_phase(screen: pygame.Surface, phase: str, show_FE_FB: bool) -> None:
@@ -335,14 +323,8 @@ def _load_side_by_side_multiple_stimulus(screen: pygame.Surface, phase: int, cor
     Select target stimulus path from the assignd phase
     Load and place target stimulus
     """
-    show_ied_ui(screen)
-    
-    # Place stimuli to target location
-    correct_img = getattr(cfg, f"{phase}_CORRECT")
-    incorrect_img = getattr(cfg, f"{phase}_INCORRECT")
-
-    place_side_by_side_images(screen, correct_img, buffer1_img, correct_ind)
-    place_side_by_side_images(screen, incorrect_img, buffer2_img, incorrect_ind)
+    # Blit the pre-composed four-box frame (built once per trial, see ui.frame_compositor)
+    show_trial_frame(screen, "side_by_side", phase, correct_ind, incorrect_ind, (buffer1_img, buffer2_img))
 
 
 def run_side_by_side_multiple_stimulus_phase(screen: pygame.Surface, phase: str) -> None:
@@ -502,14 +484,8 @@ def _load_overlapped_multiple_stimulus_targeting_shape(screen: pygame.Surface, p
     Select target stimulus path from the assignd phase
     Load and place target stimulus
     """
-    show_ied_ui(screen)
-    
-    # Place stimuli to target location
-    correct_img = getattr(cfg, f"{phase}_CORRECT")
-    incorrect_img = getattr(cfg, f"{phase}_INCORRECT")
-
-    place_overlapped_images(screen, correct_img, buffer1_img, correct_ind)
-    place_overlapped_images(screen, incorrect_img, buffer2_img, incorrect_ind)
+    # Blit the pre-composed four-box frame (built once per trial, see ui.frame_compositor)
+    show_trial_frame(screen, "overlapped_shape", phase, correct_ind, incorrect_ind, (buffer1_img, buffer2_img))
 
 
 def run_overlapped_multiple_stimulus_phase_targeting_shape(screen: pygame.Surface, phase: str) -> None:
@@ -669,14 +645,8 @@ def _load_overlapped_multiple_stimulus_targeting_line(screen: pygame.Surface, ph
     Select target stimulus path from the assignd phase
     Load and place target stimulus
     """
-    show_ied_ui(screen)
-    
-    # Place stimuli to target location
-    correct_img = getattr(cfg, f"{phase}_CORRECT")
-    incorrect_img = getattr(cfg, f"{phase}_INCORRECT")
-
-    place_overlapped_images(screen, buffer1_img, correct_img, correct_ind)
-    place_overlapped_images(screen, buffer2_img, incorrect_img, incorrect_ind)
+    # Blit the pre-composed four-box frame (built once per trial, see ui.frame_compositor)
+    show_trial_frame(screen, "overlapped_line", phase, correct_ind, incorrect_ind, (buffer1_img, buffer2_img))
 
 
 def run_overlapped_multiple_stimulus_phase_targeting_line(screen: pygame.Surface, phase: str) -> None:
@@ -0,0 +1,90 @@
+# ./src/ui/frame_compositor.py
+from __future__ import annotations
+import pygame
+from typing import Tuple
+from pathlib import Path
+from collections import OrderedDict
+
+import utils.config as cfg
+from utils.logger import get_logger
+from ui.ied_ui import draw_blocks, place_single_image, place_side_by_side_images, place_overlapped_images
+
+
+logger = get_logger("./src/ui/frame_compositor")  # create logger
+
+
+# Composed four-box frames, keyed by (screen size, layout, phase, correct_ind, incorrect_ind, buffer placement)
+_frames: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+
+
+def _compose(screen: pygame.Surface, layout: str, phase: str, correct_ind: int, incorrect_ind: int,
+             buffers: Tuple[Path, Path] | None) -> pygame.Surface:
+    """
+    Draw the complete four-box display for one trial onto an offscreen surface
+        - layout == "single": one stimulus per box (PRACTICE1 / PRACTICE2 / P1 / P2)
+        - layout == "side_by_side": shape + line side by side (P3)
+        - layout == "overlapped_shape": line over shape, target = shape (P4-P7)
+        - layout == "overlapped_line": line over shape, target = line (P8 / P9)
+    """
+    frame = pygame.Surface(screen.get_size()).convert()
+    draw_blocks(frame)
+
+    correct_img = getattr(cfg, f"{phase}_CORRECT")
+    incorrect_img = getattr(cfg, f"{phase}_INCORRECT")
+
+    if layout == "single":
+        place_single_image(frame, correct_img, correct_ind)
+        place_single_image(frame, incorrect_img, incorrect_ind)
+
+    elif layout == "side_by_side":
+        buffer1_img, buffer2_img = buffers
+        place_side_by_side_images(frame, correct_img, buffer1_img, correct_ind)
+        place_side_by_side_images(frame, incorrect_img, buffer2_img, incorrect_ind)
+
+    elif layout == "overlapped_shape":
+        buffer1_img, buffer2_img = buffers
+        place_overlapped_images(frame, correct_img, buffer1_img, correct_ind)
+        place_overlapped_images(frame, incorrect_img, buffer2_img, incorrect_ind)
+
+    elif layout == "overlapped_line":
+        buffer1_img, buffer2_img = buffers
+        place_overlapped_images(frame, buffer1_img, correct_img, correct_ind)
+        place_overlapped_images(frame, buffer2_img, incorrect_img, incorrect_ind)
+
+    else:
+        logger.error(f"compose_trial_frame: unsupported layout -> {layout}")
+
+    return frame
+
+
+def get_trial_frame(screen: pygame.Surface, layout: str, phase: str, correct_ind: int, incorrect_ind: int,
+                    buffers: Tuple[Path, Path] | None = None) -> pygame.Surface:
+    """
+    Return the composed four-box frame for one trial
+    The frame is built once per (phase, correct_ind, incorrect_ind, buffer placement) and reused for every
+    following frame of the trial; at most cfg.FRAME_CACHE_SIZE frames are kept (least recently used dropped first)
+    """
+    key = (screen.get_size(), layout, phase, correct_ind, incorrect_ind, buffers)
+
+    frame = _frames.get(key)
+    if frame is not None:
+        _frames.move_to_end(key)
+        return frame
+
+    frame = _compose(screen, layout, phase, correct_ind, incorrect_ind, buffers)
+    _frames[key] = frame
+    logger.debug(f"Composed trial frame: phase={phase} layout={layout} correct_ind={correct_ind} incorrect_ind={incorrect_ind}")
+
+    while len(_frames) > cfg.FRAME_CACHE_SIZE:
+        _frames.popitem(last=False)
+
+    return frame
+
+
+def show_trial_frame(screen: pygame.Surface, layout: str, phase: str, correct_ind: int, incorrect_ind: int,
+                     buffers: Tuple[Path, Path] | None = None) -> None:
+    """
+    Display the four-box frame of the current trial (for 1 frame only, need to be used within a while loop)
+    """
+    screen.blit(get_trial_frame(screen, layout, phase, correct_ind, incorrect_ind, buffers), (0, 0))
+
@@ -3,6 +3,7 @@ from __future__ import annotations
 import pygame
 from typing import Tuple
 from pathlib import Path
+from functools import lru_cache
 
 import utils.config as cfg
 from utils.logger import get_logger
@@ -12,10 +13,12 @@ from core.pygame_setup import toggle_full_screen
 logger = get_logger("./src/ui/ied_ui")  # create logger
 
 
+@lru_cache(maxsize=None)
 def _compute_centers(size: Tuple[int, int]) -> dict[str, tuple[int, int]]:
     """
     Measure the center of screen
     Locate the center for 4 blocks
+    (cached per screen size: only recomputed after the resolution changes)
     """
     w, h = size
     cx, cy = w / 2, h / 2
@@ -37,6 +40,44 @@ def _compute_centers(size: Tuple[int, int]) -> dict[str, tuple[int, int]]:
     }
 
 
+_block_images: dict[Path, pygame.Surface] = {}    # decoded & scaled stimulus images (fit into one block)
+
+
+def load_block_image(img_path: str) -> pygame.Surface | None:
+    """
+    Load a stimulus image scaled to fit into one block (max_W = RECT_W - 50 / max_H = RECT_H - 50)
+    Each file is decoded from disk only once, then served from memory
+    """
+    p = Path(img_path)
+    img = _block_images.get(p)
+    if img is not None:
+        return img
+
+    if not p.exists():
+        logger.error(f"place_image: file not found -> {img_path}")
+        return None
+
+    try:
+        img = pygame.image.load(str(p)).convert_alpha()
+    except Exception as e:
+        logger.error(f"place_image: failed to load image -> {img_path} | {e}")
+        return None
+
+    orig_w, orig_h = img.get_size()
+    max_w, max_h = cfg.RECT_W - 50, cfg.RECT_H - 50
+    if orig_w <= 0 or orig_h <= 0:
+        logger.error(f"place_image: invalid image size -> {img_path} ({orig_w}x{orig_h})")
+        return None
+
+    scale = min(max_w / orig_w, max_h / orig_h)
+    new_size = (max(1, int(orig_w * scale)), max(1, int(orig_h * scale)))
+    if new_size != (orig_w, orig_h):
+        img = pygame.transform.smoothscale(img, new_size)
+
+    _block_images[p] = img
+    return img
+
+
 def _rect_from_center(center: tuple[int,int]) -> pygame.Rect:
     """Place the 4 blocks based on their located centers"""
     x, y = center
@@ -75,30 +116,11 @@ def place_single_image(screen: pygame.Surface, img_path: str, ind: int) -> None:
         - 3: left
         - 4: right
     """
-    # Load image
-    p = Path(img_path)
-    if not p.exists():
-        logger.error(f"place_image: file not found -> {img_path}")
-        return None
-
-    try:
-        img = pygame.image.load(str(p)).convert_alpha()
-    except Exception as e:
-        logger.error(f"place_image: failed to load image -> {img_path} | {e}")
+    # Load image (decoded once, see load_block_image)
+    img = load_block_image(img_path)
+    if img is None:
         return None
 
-    # Resize image (max_W = RECT_W - 50 / max_H = RECT_H - 50)
-    orig_w, orig_h = img.get_size()
-    max_w, max_h = cfg.RECT_W - 50, cfg.RECT_H - 50
-    if orig_w <= 0 or orig_h <= 0:
-        logger.error(f"place_image: invalid image size -> {img_path} ({orig_w}x{orig_h})")
-        return None
-
-    scale = min(max_w / orig_w, max_h / orig_h)
-    new_size = (max(1, int(orig_w * scale)), max(1, int(orig_h * scale)))
-    if new_size != (orig_w, orig_h):
-        img = pygame.transform.smoothscale(img, new_size)
-
     # Calculate centers
     centers = _compute_centers(screen.get_size())
     key_map = {1: "top", 2: "bottom", 3: "left", 4: "right"}
@@ -128,34 +150,14 @@ def place_side_by_side_images(screen: pygame.Surface, shape_img_path: str, line_
         - 4: right
     """
 
-    # ---------- Load images ----------
+    # ---------- Load images (decoded once, see load_block_image) ----------
     paths = {"shape": shape_img_path, "line": line_img_path}
     images = {}
 
     for key, path in paths.items():
-        p = Path(path)
-        if not p.exists():
-            logger.error(f"place_image: file not found -> {path}")
-            return None
-
-        try:
-            img = pygame.image.load(str(p)).convert_alpha()
-        except Exception as e:
-            logger.error(f"place_image: failed to load image -> {path} | {e}")
-            return None
-
-        # ---------- Resize (copied directly from place_practice_image) ----------
-        orig_w, orig_h = img.get_size()
-        max_w, max_h = cfg.RECT_W - 50, cfg.RECT_H - 50
-        if orig_w <= 0 or orig_h <= 0:
-            logger.error(f"place_image: invalid image size -> {path} ({orig_w}x{orig_h})")
+        img = load_block_image(path)
+        if img is None:
             return None
-
-        scale = min(max_w / orig_w, max_h / orig_h)
-        new_size = (max(1, int(orig_w * scale)), max(1, int(orig_h * scale)))
-        if new_size != (orig_w, orig_h):
-            img = pygame.transform.smoothscale(img, new_size)
-
         images[key] = img
 
     # ---------- Locate position ----------
@@ -194,34 +196,14 @@ def place_overlapped_images(screen: pygame.Surface, shape_img_path: str, line_im
         - 4: right
     """
 
-    # ---------- Load images ----------
+    # ---------- Load images (decoded once, see load_block_image) ----------
     paths = {"shape": shape_img_path, "line": line_img_path}
     images = {}
 
     for key, path in paths.items():
-        p = Path(path)
-        if not p.exists():
-            logger.error(f"place_image: file not found -> {path}")
-            return None
-
-        try:
-            img = pygame.image.load(str(p)).convert_alpha()
-        except Exception as e:
-            logger.error(f"place_image: failed to load image -> {path} | {e}")
+        img = load_block_image(path)
+        if img is None:
             return None
-
-        # ---------- Resize (copied directly from place_practice_image) ----------
-        orig_w, orig_h = img.get_size()
-        max_w, max_h = cfg.RECT_W - 50, cfg.RECT_H - 50
-        if orig_w <= 0 or orig_h <= 0:
-            logger.error(f"place_image: invalid image size -> {path} ({orig_w}x{orig_h})")
-            return None
-
-        scale = min(max_w / orig_w, max_h / orig_h)
-        new_size = (max(1, int(orig_w * scale)), max(1, int(orig_h * scale)))
-        if new_size != (orig_w, orig_h):
-            img = pygame.transform.smoothscale(img, new_size)
-
         images[key] = img
 
     # ---------- Locate position ----------
@@ -65,6 +65,9 @@ RECT_W = 300
 RECT_H = 200
 BORDER_PX = 10
 
+# composed trial frames kept in memory (one full-screen surface each; see ui/frame_compositor.py)
+FRAME_CACHE_SIZE = 12
+
 # ---------- Instructions settings ----------
 INSTRUCTION_COUNT = 28
 
@@ -2,9 +2,13 @@
 from pathlib import Path
 import csv
 import datetime
+from typing import Optional
 
 from utils import config as cfg
 from utils.logger import get_logger
+from utils.session_writer import SessionWriter
+from utils.results_writer import results_writer
+from utils.session_store import open_store
 
 
 logger = get_logger("./src/core/saves")    # create logger
@@ -66,27 +70,45 @@ def create_save() -> None:
     logger.info(f"Results file created at {csv_path}")
 
 
-def update_save(phase: str, correct: int) -> None:
-    """Append one trial result to the participant's CSV file."""
+# Session writer opened by open_save() (one participant per session)
+_writer: Optional[SessionWriter] = None
+
+
+def open_save() -> SessionWriter:
+    """Return the session writer on the participant's results CSV, opening it (and creating the file) once."""
+    global _writer
     csv_path = cfg.RESULTS_DIR / f"{cfg.PID}_IED_results.csv"
+    if _writer is None or _writer.closed or _writer.requested_path != csv_path:
+        if _writer is not None:
+            _writer.close()
+        if results_writer.store is None:
+            # Launch option --results-db [PATH]: rows also go to a SQLite database
+            results_writer.store = open_store("IED", cfg.RESULTS_DIR)
+        _writer = SessionWriter(csv_path, COLUMNS, "trial_number", cfg.RESULTS_DURABILITY)
+    return _writer
 
-    # Ensure file exists with header
-    if not csv_path.exists():
-        create_save(cfg.PID)
 
-    # Count existing trials (exclude header)
-    with csv_path.open("r", newline="", encoding="utf-8") as rf:
-        reader = csv.reader(rf)
-        rows = list(reader)
-        has_header = bool(rows) and rows[0] == COLUMNS
-        data_rows = rows[1:] if has_header else rows
-        next_trial_number = len(data_rows) + 1
+def end_block_save() -> None:
+    """Apply the durability policy at the end of a block (flush, or fsync)."""
+    if _writer is not None:
+        _writer.end_block()
 
+
+def close_save() -> None:
+    """Close the session writer opened by open_save()."""
+    global _writer
+    if _writer is not None:
+        _writer.close()
+        _writer = None
+
+
+def update_save(phase: str, correct: int) -> None:
+    """Append one trial result to the participant's CSV file."""
     # Prepare one record
     record = {
         "participant_id": cfg.PID,
         "version": cfg.VERSION,
-        "trial_number": next_trial_number,
+        "trial_number": "",     # sequential across the session, filled in by the session writer
         "phase": phase,
         "condition": phase_to_condition[phase],
         "difficulty": phase_to_difficulty[phase],
@@ -98,11 +120,6 @@ def update_save(phase: str, correct: int) -> None:
     }
 
     # Write record in fixed column order
-    write_header = not has_header
-    with csv_path.open("a", newline="", encoding="utf-8") as wf:
-        writer = csv.DictWriter(wf, fieldnames=COLUMNS)
-        if write_header:
-            writer.writeheader()
-        writer.writerow({k: record.get(k, "") for k in COLUMNS})
+    open_save().append(record)
     
     logger.info(f"Results file updated")
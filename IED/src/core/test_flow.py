@@ -1,4 +1,5 @@
 # ./src/core/test_flow.py
+import time
 import pygame
 import random
 from typing import Tuple
@@ -6,12 +7,14 @@ from typing import Tuple
 import utils.config as cfg
 from utils.logger import get_logger
 from utils.pygame_setup import toggle_full_screen
-from ui.ied_ui import show_ied_ui, place_image
-from utils.show_feedback import show_feedback
-from utils.saves import update_save
+from ui.ied_ui import show_ied_ui, place_image, load_image
+from utils.show_feedback import show_feedback, load_feedback
+from utils.saves import update_save, open_save, end_block_save
+from utils.warm_up import WarmUp, render_offscreen
 
 
 logger = get_logger("./src/core/test_flow") # create logger
+_warm_up = WarmUp()     # one-time costs paid before the first stimulus of each phase
 
 
 def _roll_place_ind_for_stimuli() -> tuple[int, int]:
@@ -38,6 +41,29 @@ def _load_stimuli_for_phase(screen: pygame.Surface, phase: int, correct_ind: int
     place_image(screen, incorrect_img, incorrect_ind)
 
 
+def warm_up_phase(screen: pygame.Surface, phase: int) -> None:
+    """
+    Warm-up pass for a phase, before its first stimulus is drawn
+    Decode and scale the phase stimuli and feedback images, blit them once offscreen, open the results file
+    """
+    def _images() -> None:
+        load_image(getattr(cfg, f"P{phase}_CORRECT"))
+        load_image(getattr(cfg, f"P{phase}_INCORRECT"))
+        load_feedback(True)
+        load_feedback(False)
+
+    def _render() -> None:
+        surfaces = [load_image(getattr(cfg, f"P{phase}_CORRECT")), load_image(getattr(cfg, f"P{phase}_INCORRECT")),
+                    load_feedback(True), load_feedback(False)]
+        render_offscreen(screen, [s for s in surfaces if s is not None], cfg.GRAY_RGB)
+
+    _warm_up.run(f"phase {phase}", [
+        ("images", _images),
+        ("render", _render),
+        ("results_file", open_save),
+    ])
+
+
 def run_test_phase(screen: pygame.Surface, phase: int) -> None:
     """
     Run one phase (round) of test
@@ -53,6 +79,9 @@ def run_test_phase(screen: pygame.Surface, phase: int) -> None:
     logger.info(f"Correct ind is set to {cfg.correct_ind}")
     cfg.correct_count = 0   # clear correct count at the beginning of each phase
     cfg.trial_count = 0     # clear trial count at the beginning of each phase
+    warm_up_phase(screen, phase)
+    trial_onset_ns = time.perf_counter_ns()     # stimuli shown from the next frame on (session timebase column)
+    onset_pending = True    # stimuli of the current trial not flipped yet
     
     while running:
 
@@ -61,6 +90,7 @@ def run_test_phase(screen: pygame.Surface, phase: int) -> None:
                 running = False
                 cfg.force_quit = True
             elif waiting and event.type == pygame.KEYDOWN:
+                response_ns = time.perf_counter_ns()
                 if event.key == pygame.K_ESCAPE:
                     toggle_full_screen(screen)
                 
@@ -71,13 +101,13 @@ def run_test_phase(screen: pygame.Surface, phase: int) -> None:
                         cfg.correct_count += 1  # count 1 correct answer if answered correctly
                         cfg.trial_count += 1    # count 1 trial made
                         logger.info(f"Correct response -> current correct count: {cfg.correct_count}, need: {cfg.CORRECT_REQUIREMENT}")
-                        update_save(phase, 1)
+                        update_save(phase, 1, trial_onset_ns, response_ns)
                     else:
                         feedback_is_correct = False
                         cfg.correct_count = 0   # clear correct count if made a mistake (ensure consecutive correct responses)
                         cfg.trial_count += 1
                         logger.info(f"Incorrect response -> reset correct count to 0")
-                        update_save(phase, 0)
+                        update_save(phase, 0, trial_onset_ns, response_ns)
                     feedback_until = pygame.time.get_ticks() + cfg.FB_DURATION
                     waiting = False
                 
@@ -88,13 +118,13 @@ def run_test_phase(screen: pygame.Surface, phase: int) -> None:
                         cfg.correct_count += 1
                         cfg.trial_count += 1
                         logger.info(f"Correct response -> current correct count: {cfg.correct_count}, need: {cfg.CORRECT_REQUIREMENT}")
-                        update_save(phase, 1)
+                        update_save(phase, 1, trial_onset_ns, response_ns)
                     else:
                         feedback_is_correct = False
                         cfg.correct_count = 0
                         cfg.trial_count += 1
                         logger.info(f"Incorrect response -> reset correct count to 0")
-                        update_save(phase, 0)
+                        update_save(phase, 0, trial_onset_ns, response_ns)
                     feedback_until = pygame.time.get_ticks() + cfg.FB_DURATION
                     waiting = False
                 
@@ -105,13 +135,13 @@ def run_test_phase(screen: pygame.Surface, phase: int) -> None:
                         cfg.correct_count += 1
                         cfg.trial_count += 1
                         logger.info(f"Correct response -> current correct count: {cfg.correct_count}, need: {cfg.CORRECT_REQUIREMENT}")
-                        update_save(phase, 1)
+                        update_save(phase, 1, trial_onset_ns, response_ns)
                     else:
                         feedback_is_correct = False
                         cfg.correct_count = 0
                         cfg.trial_count += 1
                         logger.info(f"Incorrect response -> reset correct count to 0")
-                        update_save(phase, 0)
+                        update_save(phase, 0, trial_onset_ns, response_ns)
                     feedback_until = pygame.time.get_ticks() + cfg.FB_DURATION
                     waiting = False
                 
@@ -122,17 +152,18 @@ def run_test_phase(screen: pygame.Surface, phase: int) -> None:
                         cfg.correct_count += 1
                         cfg.trial_count += 1
                         logger.info(f"Correct response -> current correct count: {cfg.correct_count}, need: {cfg.CORRECT_REQUIREMENT}")
-                        update_save(phase, 1)
+                        update_save(phase, 1, trial_onset_ns, response_ns)
                     else:
                         feedback_is_correct = False
                         cfg.correct_count = 0
                         cfg.trial_count += 1
                         logger.info(f"Incorrect response -> reset correct count to 0")
-                        update_save(phase, 0)
+                        update_save(phase, 0, trial_onset_ns, response_ns)
                     feedback_until = pygame.time.get_ticks() + cfg.FB_DURATION
                     waiting = False
         
         _load_stimuli_for_phase(screen, phase, correct_ind, incorrect_ind)
+        first_frame = onset_pending
 
         # Show feedback & update stimuli (proceed to next trial)
         now = pygame.time.get_ticks()
@@ -149,6 +180,8 @@ def run_test_phase(screen: pygame.Surface, phase: int) -> None:
                 cfg.correct_ind = correct_ind
                 logger.info(f"Correct ind is set to {cfg.correct_ind}")
                 waiting = True
+                trial_onset_ns = time.perf_counter_ns()
+                onset_pending = True
 
                 if cfg.correct_count >= cfg.CORRECT_REQUIREMENT:
                     logger.info(f"Passed phase {phase}")
@@ -160,4 +193,11 @@ def run_test_phase(screen: pygame.Surface, phase: int) -> None:
                     cfg.force_quit = True
 
         pygame.display.flip()
-        clock.tick(60)
\ No newline at end of file
+        if first_frame:
+            # First frame of this trial's stimuli on screen
+            _warm_up.onset((time.perf_counter_ns() - trial_onset_ns) / 1_000_000)
+            onset_pending = False
+        clock.tick(60)
+
+    end_block_save()    # flush (or fsync) the results per cfg.RESULTS_DURABILITY
+    logger.info(f"Onset latency, first trial vs steady state | phase={phase}: {_warm_up.report()}")
\ No newline at end of file
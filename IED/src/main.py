@@ -1,5 +1,7 @@
 # ./src/main.py
+from utils.realtime import apply_launch_options
 from ui.main_window import run
 
 if __name__ == "__main__":
+    apply_launch_options()     # --realtime [--cpu N]; before pygame.init() so its threads inherit it
     run()
\ No newline at end of file
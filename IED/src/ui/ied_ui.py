@@ -11,6 +11,8 @@ from utils.pygame_setup import toggle_full_screen
 
 logger = get_logger("./src/ui/ied_ui")  # create logger
 
+_images: dict[str, pygame.Surface] = {}     # stimulus path -> image scaled to fit a block
+
 
 def _compute_centers(size: Tuple[int, int]) -> dict[str, tuple[int, int]]:
     """
@@ -67,31 +69,31 @@ def show_ied_ui(screen: pygame.Surface) -> None:
     draw_blocks(screen)
 
 
-def place_image(screen: pygame.Surface, img_path: str, ind: int) -> None:
+def load_image(img_path: str) -> pygame.Surface | None:
     """
-    Place stimulus image on assigned position
-        - 1: top
-        - 2: bottom
-        - 3: left
-        - 4: right
+    Load a stimulus image and scale it to fit a block
+    Decoded and scaled once per path, then served from the cache
     """
-    # Load image
+    img = _images.get(str(img_path))
+    if img is not None:
+        return img
+
     p = Path(img_path)
     if not p.exists():
-        logger.error(f"place_image: file not found -> {img_path}")
+        logger.error(f"load_image: file not found -> {img_path}")
         return None
 
     try:
         img = pygame.image.load(str(p)).convert_alpha()
     except Exception as e:
-        logger.error(f"place_image: failed to load image -> {img_path} | {e}")
+        logger.error(f"load_image: failed to load image -> {img_path} | {e}")
         return None
 
     # Resize image (max_W = RECT_W - 50 / max_H = RECT_H - 50)
     orig_w, orig_h = img.get_size()
     max_w, max_h = cfg.RECT_W - 50, cfg.RECT_H - 50
     if orig_w <= 0 or orig_h <= 0:
-        logger.error(f"place_image: invalid image size -> {img_path} ({orig_w}x{orig_h})")
+        logger.error(f"load_image: invalid image size -> {img_path} ({orig_w}x{orig_h})")
         return None
 
     scale = min(max_w / orig_w, max_h / orig_h)
@@ -99,6 +101,23 @@ def place_image(screen: pygame.Surface, img_path: str, ind: int) -> None:
     if new_size != (orig_w, orig_h):
         img = pygame.transform.smoothscale(img, new_size)
 
+    _images[str(img_path)] = img
+    return img
+
+
+def place_image(screen: pygame.Surface, img_path: str, ind: int) -> None:
+    """
+    Place stimulus image on assigned position
+        - 1: top
+        - 2: bottom
+        - 3: left
+        - 4: right
+    """
+    # Load image (cached)
+    img = load_image(img_path)
+    if img is None:
+        return None
+
     # Calculate centers
     centers = _compute_centers(screen.get_size())
     key_map = {1: "top", 2: "bottom", 3: "left", 4: "right"}
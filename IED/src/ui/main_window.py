@@ -8,7 +8,7 @@ import utils.config as cfg
 from utils.logger import get_logger
 from utils.pygame_setup import init_display, get_participant_id, _compute_version_from_pid
 from core.test_flow import run_test_phase
-from utils.saves import create_save
+from utils.saves import create_save, close_save
 
 
 logger = get_logger("./src/ui/main_window") # create logger
@@ -37,4 +37,5 @@ def run() -> None:
             run_test_phase(screen, i+1)
         logger.info(f"Running phase {i+1}")
 
+    close_save()
     pygame.quit()
@@ -31,6 +31,10 @@ else:
     pass
 
 
+# results file durability (see utils/session_writer.py):
+# "trial" = flush every trial / "fsync" = flush every trial, fsync at block end
+RESULTS_DURABILITY = "trial"
+
 # ---------- Pygame UI settings ----------
 
 # color
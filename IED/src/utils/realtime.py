@@ -0,0 +1,153 @@
+# ./src/utils/realtime.py
+"""
+Real-time process mode (launch option: python main.py --realtime [--cpu N]).
+
+Public API:
+    apply_launch_options(argv=None) -> dict
+    enable_realtime(cpu=None) -> dict
+    realtime_summary() -> str
+
+- Raises the scheduling priority (SCHED_RR, or a lower nice value when real-time
+  scheduling is not permitted) and lowers the timer slack, so sleeps and frame
+  waits wake up closer to their deadline. With --cpu N the process (every thread)
+  is also pinned to core N; without it, the affinity is left alone.
+- Each step falls back to leaving the setting unchanged (insufficient permissions,
+  non-Linux platform); what was applied is logged and written with every results row.
+- Must run before pygame.init() and before any thread is started, so that all
+  threads inherit the settings.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from utils.logger import get_logger
+
+
+logger = get_logger("./src/utils/realtime")    # create logger
+
+REALTIME_FLAG = "--realtime"
+CPU_FLAG = "--cpu"
+
+REALTIME_PRIORITY = 10      # SCHED_RR priority (1-99)
+NICE_VALUE = -10            # tried when real-time scheduling is not permitted
+TIMER_SLACK_NS = 1          # how late the kernel may wake a sleeping thread (Linux default: 50 us)
+PR_SET_TIMERSLACK = 29
+
+# What enable_realtime() managed to apply
+realtime_status: Dict[str, str] = {"mode": "off"}
+
+
+def parse_options(argv: Optional[List[str]] = None) -> Tuple[bool, Optional[int]]:
+    """
+    Read the launch options.
+
+    Args:
+        argv (Optional[List[str]]): Command line arguments (default: sys.argv[1:])
+
+    Returns:
+        Tuple[bool, Optional[int]]: Real-time mode requested, core to pin to (None: default)
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    cpu = None
+    for i, arg in enumerate(argv):
+        if arg == CPU_FLAG and i + 1 < len(argv):
+            cpu = argv[i + 1]
+        elif arg.startswith(CPU_FLAG + "="):
+            cpu = arg.split("=", 1)[1]
+    try:
+        cpu = int(cpu) if cpu is not None else None
+    except ValueError:
+        logger.warning(f"Ignoring {CPU_FLAG} {cpu}: not a core number")
+        cpu = None
+    return REALTIME_FLAG in argv, cpu
+
+
+def _set_priority() -> str:
+    if hasattr(os, "sched_setscheduler") and hasattr(os, "SCHED_RR"):
+        try:
+            os.sched_setscheduler(0, os.SCHED_RR, os.sched_param(REALTIME_PRIORITY))
+            return f"SCHED_RR {REALTIME_PRIORITY}"
+        except (PermissionError, OSError):
+            pass  # not permitted: try a lower nice value instead
+    try:
+        return f"nice {os.nice(NICE_VALUE - os.nice(0))}"
+    except (PermissionError, OSError, AttributeError):
+        return "unchanged (not permitted)"
+
+
+def _set_affinity(cpu: Optional[int]) -> str:
+    if not hasattr(os, "sched_setaffinity"):
+        return "unchanged (unavailable)"
+    if cpu is None:
+        # Not pinned by default: the audio, results-writer and decoder threads inherit the affinity and
+        # would share one core with a main thread that busy-polls for responses
+        return "unchanged (no --cpu)"
+    if cpu not in os.sched_getaffinity(0):
+        return f"unchanged (core {cpu} not available)"
+    try:
+        os.sched_setaffinity(0, {cpu})
+        return f"core {cpu}"
+    except OSError as e:
+        return f"unchanged ({e.strerror})"
+
+
+def _set_timer_slack() -> str:
+    if not sys.platform.startswith("linux"):
+        return "unchanged (unavailable)"
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if libc.prctl(PR_SET_TIMERSLACK, TIMER_SLACK_NS, 0, 0, 0) != 0:
+            return f"unchanged ({os.strerror(ctypes.get_errno())})"
+        return f"{TIMER_SLACK_NS} ns"
+    except (OSError, AttributeError, TypeError):
+        return "unchanged (unavailable)"
+
+
+def enable_realtime(cpu: Optional[int] = None) -> Dict[str, str]:
+    """
+    Apply priority, core affinity and timer slack, as far as permitted.
+
+    Args:
+        cpu (Optional[int]): Core to pin every thread to (None: not pinned)
+
+    Returns:
+        Dict[str, str]: What was applied to each setting
+    """
+    global realtime_status
+    realtime_status = {
+        "mode": "realtime",
+        "priority": _set_priority(),
+        "affinity": _set_affinity(cpu),
+        "timer_slack": _set_timer_slack(),
+    }
+    logger.info(f"Real-time mode: {realtime_status}")
+    return realtime_status
+
+
+def apply_launch_options(argv: Optional[List[str]] = None) -> Dict[str, str]:
+    """
+    Enable real-time mode if the task was started with --realtime [--cpu N].
+
+    Args:
+        argv (Optional[List[str]]): Command line arguments (default: sys.argv[1:])
+
+    Returns:
+        Dict[str, str]: realtime_status
+    """
+    realtime, cpu = parse_options(argv)
+    if realtime:
+        enable_realtime(cpu)
+    return realtime_status
+
+
+def realtime_summary() -> str:
+    """
+    What real-time mode applied, as one line (written to the "realtime" results column).
+
+    Returns:
+        str: "off", or e.g. "priority=nice -10; affinity=core 3; timer_slack=1 ns"
+    """
+    return "; ".join(f"{key}={value}" for key, value in realtime_status.items() if key != "mode") or "off"
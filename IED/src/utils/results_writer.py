@@ -0,0 +1,267 @@
+# ./src/utils/results_writer.py
+"""
+Background thread that writes the results rows, so disk latency never lands in a trial.
+
+Public API:
+    ResultsWriter(queue_size=RESULTS_QUEUE_SIZE, batch_size=RESULTS_BATCH_SIZE, store=None)
+    writer.write(path, rows, header=None, task=None) / writer.open(path, header=None, task=None)
+    writer.end_block() / writer.set_column(path, column, value)
+    writer.flush(sync=False, timeout=None) -> bool / writer.close_file(path, timeout=None) -> bool
+    writer.close(timeout=None) / writer.report()
+    results_writer (shared instance)
+
+- write() only queues the rows; the writer thread takes everything queued at once,
+  writes it per file and flushes each file once per batch.
+- The queue is bounded: if the disk falls that far behind, write() waits for room
+  rather than dropping a trial (counted in report()["blocked"]).
+- flush() / close_file() are queued behind the pending rows and wait until the
+  thread has handled them, so the rows before them are on disk when they return.
+- With a session store (utils/session_store.py, launch option --results-db) the rows
+  also go to a SQLite database, one transaction per block (end_block()).
+- close() runs at interpreter exit, so queued rows are written after pygame.quit(),
+  SystemExit or an uncaught exception raised from the event loops.
+"""
+
+import atexit
+import csv
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, TextIO, Union
+
+from utils.logger import get_logger
+from utils.session_store import SessionStore
+
+
+logger = get_logger("./src/utils/results_writer")    # create logger
+
+RESULTS_QUEUE_SIZE = 1024   # queued items (rows, open / flush / close requests) before write() waits
+RESULTS_BATCH_SIZE = 256    # most queued items written per batch
+
+PathLike = Union[str, Path]
+
+
+class ResultsWriter:
+    def __init__(self, queue_size: int = RESULTS_QUEUE_SIZE, batch_size: int = RESULTS_BATCH_SIZE,
+                 store: Optional[SessionStore] = None) -> None:
+        """
+        Args:
+            queue_size (int): Maximum number of queued items
+            batch_size (int): Maximum number of items written per batch
+            store (Optional[SessionStore]): Results database the rows also go to (set before the first row)
+        """
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.store = store
+        self.rows = 0                   # rows written
+        self.batches = 0
+        self.errors = 0
+        self.queue_max = 0              # deepest queue seen by write()
+        self.blocked = 0                # write() calls that had to wait for room in the queue
+        self.enqueue_ms_max = 0.0       # longest write() call (the time a trial spends here)
+        self.write_ms: List[float] = [] # duration of each batch on the writer thread
+
+        self._files: Dict[str, TextIO] = {}    # path -> append handle (writer thread only)
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="results-writer", daemon=True)
+                self._thread.start()
+
+    def _put(self, item: tuple) -> None:
+        self._start()
+        start_ns = time.perf_counter_ns()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.blocked += 1
+            self._queue.put(item)
+        self.enqueue_ms_max = max(self.enqueue_ms_max, (time.perf_counter_ns() - start_ns) / 1_000_000)
+        self.queue_max = max(self.queue_max, self._queue.qsize())
+
+    def _request(self, action: str, path: Optional[PathLike] = None, sync: bool = False,
+                 timeout: Optional[float] = None) -> bool:
+        """Queue a control request behind the pending rows and wait until the writer thread has handled it."""
+        done = threading.Event()
+        self._put((action, None if path is None else str(path), sync, done))
+        return done.wait(timeout)
+
+    def write(self, path: PathLike, rows: Sequence[Sequence[object]], header: Optional[Sequence[str]] = None,
+              task: Optional[str] = None) -> None:
+        """
+        Queue rows for a file.
+
+        Args:
+            path (PathLike): Results file (opened in append mode by the writer thread)
+            rows (Sequence[Sequence[object]]): Rows, each a sequence of values
+            header (Optional[Sequence[str]]): Header row, written first if the file is empty
+            task (Optional[str]): Table of a side file in the results database
+        """
+        self._put(("rows", str(path), header, rows, task))
+
+    def open(self, path: PathLike, header: Optional[Sequence[str]] = None, task: Optional[str] = None) -> None:
+        """Have the writer thread open a file (and write header if it is empty) before the first row."""
+        self._put(("rows", str(path), header, [], task))
+
+    def end_block(self) -> None:
+        """End of a block: the rows queued so far are inserted into the results database in one transaction."""
+        if self.store is not None:
+            self._put(("commit", None, None, None))
+
+    def set_column(self, path: PathLike, column: str, value: object) -> None:
+        """Set a column of every stored row of the session of a file (results database only)."""
+        if self.store is not None:
+            self._put(("set", str(path), (column, value), None))
+
+    def flush(self, sync: bool = False, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued row is written and flushed.
+
+        Args:
+            sync (bool): Also fsync the open files
+            timeout (Optional[float]): Longest wait (s)
+
+        Returns:
+            bool: False if the timeout expired first
+        """
+        return self._request("flush", sync=sync, timeout=timeout)
+
+    def close_file(self, path: PathLike, timeout: Optional[float] = None) -> bool:
+        """Write the rows queued for a file, then fsync and close it. Returns False on timeout."""
+        return self._request("close", path=path, timeout=timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Write every queued row, fsync and close the files, and stop the writer thread."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._request("close", timeout=timeout)
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        """Writer thread: write the queued items in batches."""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            self._write_batch([item for item in batch if item is not None])
+            if stop:
+                break
+
+    def _write_batch(self, batch: List[tuple]) -> None:
+        start_ns = time.perf_counter_ns()
+        touched: Set[str] = set()
+        rows = 0
+        for item in batch:
+            action, path = item[0], item[1]
+            try:
+                if action == "rows":
+                    header, item_rows = item[2], item[3]
+                    f = self._file(path, header)
+                    csv.writer(f).writerows(item_rows)
+                    touched.add(path)
+                    rows += len(item_rows)
+                    self._store("insert", path, header, item_rows, item[4])
+                elif action == "commit":
+                    self._store("commit")
+                elif action == "set":
+                    self._store("set_column", path, *item[2])
+                else:
+                    # Control request: everything queued before it is written first
+                    self._flush(touched)
+                    touched = set()
+                    if action == "flush":
+                        self._flush(self._files, sync=item[2])
+                        self._store("commit")
+                    else:
+                        self._close(path)
+                        self._store("commit" if path is not None else "close")
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Error writing results to {path}: {e}")
+            finally:
+                if action in ("flush", "close"):
+                    item[3].set()
+        self._flush(touched)
+        if rows:
+            self.rows += rows
+            self.batches += 1
+            self.write_ms.append((time.perf_counter_ns() - start_ns) / 1_000_000)
+
+    def _store(self, method: str, *args: object) -> None:
+        """Pass rows / a commit on to the results database; its errors never stop the CSV writes."""
+        if self.store is None:
+            return
+        try:
+            getattr(self.store, method)(*args)
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Error writing results to the database {self.store.path}: {e}")
+
+    def _file(self, path: str, header: Optional[Sequence[str]]) -> TextIO:
+        f = self._files.get(path)
+        if f is None:
+            f = open(path, mode="a", newline="", encoding="utf-8")
+            self._files[path] = f
+            if header is not None and f.tell() == 0:
+                csv.writer(f).writerow(header)
+        return f
+
+    def _flush(self, paths: Union[Set[str], Dict[str, TextIO]], sync: bool = False) -> None:
+        for path in list(paths):
+            f = self._files.get(path)
+            if f is None:
+                continue
+            try:
+                f.flush()
+                if sync:
+                    os.fsync(f.fileno())
+            except OSError as e:
+                self.errors += 1
+                logger.warning(f"Error flushing results to {path}: {e}")
+
+    def _close(self, path: Optional[str] = None) -> None:
+        """Fsync and close a file (every file if None)."""
+        for p in [path] if path is not None else list(self._files):
+            if p in self._files:
+                self._flush({p}, sync=True)
+                self._files.pop(p).close()
+
+    def report(self) -> Dict[str, Optional[float]]:
+        """
+        Queue depth and write latency since the start.
+
+        Returns:
+            Dict[str, Optional[float]]: rows, batches, queue_depth, queue_max, blocked,
+                enqueue_ms_max, write_ms_mean, write_ms_max, errors (and db_rows, db_commits,
+                db_commit_ms_max with a results database)
+        """
+        write_ms = list(self.write_ms)
+        report = {
+            "rows": self.rows,
+            "batches": self.batches,
+            "queue_depth": self._queue.qsize(),
+            "queue_max": self.queue_max,
+            "blocked": self.blocked,
+            "enqueue_ms_max": round(self.enqueue_ms_max, 3),
+            "write_ms_mean": round(sum(write_ms) / len(write_ms), 3) if write_ms else None,
+            "write_ms_max": round(max(write_ms), 3) if write_ms else None,
+            "errors": self.errors,
+        }
+        if self.store is not None:
+            report.update(self.store.report())
+        return report
+
+
+results_writer = ResultsWriter()    # shared by every results file of the task
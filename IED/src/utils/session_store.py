@@ -0,0 +1,357 @@
+# ./src/utils/session_store.py
+"""
+Optional SQLite results backend (launch option: python main.py --results-db [PATH]).
+
+Public API:
+    SessionStore(path, task)
+    results_key(results_file) -> str
+    store.header(results_file, header, task=None) / store.insert(results_file, header, rows, task=None)
+    store.commit() / store.set_column(results_file, column, value) / store.close() / store.report()
+    open_store(task, results_dir, argv=None) -> Optional[SessionStore]
+    export_csv(db_path, out_dir, task=None, participant_id=None, overwrite=False) -> List[str]
+    check_restart_round_trip() -> bool
+
+- Every row written to a results CSV also goes to a local SQLite database in WAL
+  mode, so lab-wide queries can read it while a session writes.
+- One table per task schema (results_nb, results_gss, ...; columns are added as the
+  header grows) and a sessions table with one row per run and results file (station,
+  task, participant, the file relative to the task folder's parent, column order,
+  start / end, row count).
+- A run that appends to an existing results file (after a restart, see
+  utils/session_writer.py) gets a session of its own whose row numbers continue
+  those of the file's earlier sessions.
+- Rows are inserted on the results writer thread (utils/results_writer.py), in one
+  transaction per block (commit()); the connection is opened on that thread.
+- export_csv() writes the per-task CSVs back out (same name, columns and values; the
+  sessions of one file are combined into that file), under out_dir/<station>/;
+  from src/: python -m utils.session_store <db> <out_dir> [--task IED] [--participant P01]
+  (python -m utils.session_store --check: restart round-trip self-check)
+"""
+
+import argparse
+import csv
+import json
+import os
+import socket
+import sqlite3
+import sys
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from utils.logger import get_logger
+
+
+logger = get_logger("./src/utils/session_store")    # create logger
+
+RESULTS_DB_FLAG = "--results-db"
+RESULTS_DB_NAME = "results.sqlite"
+STORE_MAX_PENDING = 1000    # rows kept in memory before they are inserted without waiting for the end of the block
+STATION = socket.gethostname()  # machine the sessions run on (a results database may be shared by several stations)
+
+
+def table_name(task: str) -> str:
+    """Table of a task's rows, e.g. "IED" -> results_ied."""
+    return "results_" + "".join(c if c.isalnum() else "_" for c in task.lower())
+
+
+def quote(name: str) -> str:
+    """SQL identifier for a column name."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def results_key(results_file: str) -> str:
+    """Results file as stored: relative to the folder holding the task, e.g. IED/results/P01_IED_results.csv."""
+    path = os.path.abspath(results_file)
+    return os.path.relpath(path, os.path.dirname(os.path.dirname(os.path.dirname(path))))
+
+
+def sql_value(value: object) -> object:
+    """Value as stored: numbers stay numbers (for indexed queries), the rest as the text the CSV holds."""
+    if value is None or isinstance(value, (int, float, str)) and not isinstance(value, bool):
+        return value
+    return str(value)
+
+
+class SessionStore:
+    def __init__(self, path: str, task: str) -> None:
+        """
+        Args:
+            path (str): Database file
+            task (str): Task code, as in the results file names (NB, GSS, IED, ...)
+        """
+        self.path = path
+        self.task = task
+        self.rows = 0                   # rows inserted
+        self.commits = 0
+        self.commit_ms_max = 0.0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._columns: Dict[str, List[str]] = {}        # table -> its columns
+        self._headers: Dict[str, List[str]] = {}        # results file -> header
+        self._tasks: Dict[str, str] = {}                # results file -> task (schema) of its rows
+        self._sessions: Dict[str, int] = {}             # results file -> session id
+        self._next_rows: Dict[str, int] = {}            # results file -> number of its next row (continued across runs)
+        self._pending: Dict[str, List[Sequence[object]]] = {}  # results file -> rows not inserted yet
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=30)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            create_schema(self._connection)
+        return self._connection
+
+    def header(self, results_file: str, header: Optional[Sequence[str]], task: Optional[str] = None) -> None:
+        """
+        Record the columns of a results file.
+
+        Args:
+            results_file (str): Results CSV
+            header (Optional[Sequence[str]]): Its columns (None: unchanged)
+            task (Optional[str]): Schema of a side file (default: the task's results)
+        """
+        if header is not None:
+            self._headers[results_file] = list(header)
+        if task is not None:
+            self._tasks[results_file] = task
+
+    def insert(self, results_file: str, header: Optional[Sequence[str]], rows: Sequence[Sequence[object]],
+               task: Optional[str] = None) -> None:
+        """Queue rows of a results file for the next commit()."""
+        self.header(results_file, header, task)
+        self._pending.setdefault(results_file, []).extend(rows)
+        if sum(len(pending) for pending in self._pending.values()) >= STORE_MAX_PENDING:
+            self.commit()
+
+    def _add_columns(self, connection: sqlite3.Connection, table: str, header: Sequence[str]) -> None:
+        columns = self._columns.get(table)
+        if columns is None:
+            connection.execute(f"CREATE TABLE IF NOT EXISTS {quote(table)} ("
+                               "session_id INTEGER NOT NULL REFERENCES sessions(id), row_number INTEGER NOT NULL)")
+            connection.execute(f"CREATE INDEX IF NOT EXISTS {quote(table + '_session')} "
+                               f"ON {quote(table)} (session_id, row_number)")
+            columns = self._columns[table] = [row[1] for row in connection.execute(f"PRAGMA table_info({quote(table)})")]
+        for column in header:
+            if column not in columns:
+                connection.execute(f"ALTER TABLE {quote(table)} ADD COLUMN {quote(column)}")
+                columns.append(column)
+
+    def _session(self, connection: sqlite3.Connection, task: str, results_file: str, header: List[str],
+                 first_row: Sequence[object]) -> int:
+        session_id = self._sessions.get(results_file)
+        if session_id is None:
+            key = results_key(results_file)
+            # Rows already stored for this file by earlier runs (the file is appended to after a restart)
+            stored = connection.execute(
+                f"SELECT coalesce(max(r.row_number), 0) FROM {quote(table_name(task))} r "
+                "JOIN sessions s ON s.id = r.session_id WHERE s.station = ? AND s.task = ? AND s.results_file = ?",
+                (STATION, task, key)).fetchone()[0]
+            participant_id = first_row[header.index("participant_id")] if "participant_id" in header else None
+            session_id = connection.execute(
+                "INSERT INTO sessions (station, task, participant_id, results_file, columns, started_at, rows) "
+                "VALUES (?, ?, ?, ?, ?, ?, 0)",
+                (STATION, task, sql_value(participant_id), key, json.dumps(header),
+                 time.strftime("%Y-%m-%d %H:%M:%S"))).lastrowid
+            self._sessions[results_file] = session_id
+            self._next_rows[results_file] = stored + 1
+        return session_id
+
+    def commit(self) -> None:
+        """Insert the queued rows, one transaction for all of them (end of a block)."""
+        pending = {f: rows for f, rows in self._pending.items() if rows}
+        self._pending = {}
+        if not pending:
+            return
+        start_ns = time.perf_counter_ns()
+        connection = self._connect()
+        with connection:
+            for results_file, rows in pending.items():
+                header = self._headers.get(results_file)
+                if header is None:
+                    logger.warning(f"Results database: no header for {results_file}, {len(rows)} rows not stored")
+                    continue
+                task = self._tasks.get(results_file, self.task)
+                table = table_name(task)
+                self._add_columns(connection, table, header)
+                session_id = self._session(connection, task, results_file, header, rows[0])
+                first = self._next_rows[results_file]
+                columns = ", ".join(quote(c) for c in ["session_id", "row_number"] + header)
+                marks = ", ".join("?" * (len(header) + 2))
+                connection.executemany(
+                    f"INSERT INTO {quote(table)} ({columns}) VALUES ({marks})",
+                    [[session_id, first + i] + [sql_value(v) for v in row] for i, row in enumerate(rows)])
+                self._next_rows[results_file] = first + len(rows)
+                connection.execute("UPDATE sessions SET rows = rows + ?, ended_at = ? WHERE id = ?",
+                                   (len(rows), time.strftime("%Y-%m-%d %H:%M:%S"), session_id))
+                self.rows += len(rows)
+        self.commits += 1
+        self.commit_ms_max = max(self.commit_ms_max, (time.perf_counter_ns() - start_ns) / 1_000_000)
+
+    def set_column(self, results_file: str, column: str, value: object) -> None:
+        """Set a column of every stored row of a results file, all runs included (e.g. a value settled at the end of the session)."""
+        self.commit()
+        connection = self._connect()
+        task = self._tasks.get(results_file, self.task)
+        table = table_name(task)
+        with connection:
+            self._add_columns(connection, table, [column])
+            connection.execute(f"UPDATE {quote(table)} SET {quote(column)} = ? WHERE session_id IN "
+                               "(SELECT id FROM sessions WHERE station = ? AND task = ? AND results_file = ?)",
+                               (sql_value(value), STATION, task, results_key(results_file)))
+
+    def close(self) -> None:
+        """Insert the queued rows and close the connection."""
+        self.commit()
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+            self._columns = {}
+
+    def report(self) -> Dict[str, float]:
+        return {"db_rows": self.rows, "db_commits": self.commits, "db_commit_ms_max": round(self.commit_ms_max, 3)}
+
+
+def create_schema(connection: sqlite3.Connection) -> None:
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS sessions ("
+        "id INTEGER PRIMARY KEY, station TEXT, task TEXT NOT NULL, participant_id TEXT, results_file TEXT NOT NULL, "
+        "columns TEXT NOT NULL, started_at TEXT, ended_at TEXT, rows INTEGER NOT NULL DEFAULT 0)")
+    if "station" not in [row[1] for row in connection.execute("PRAGMA table_info(sessions)")]:
+        connection.execute("ALTER TABLE sessions ADD COLUMN station TEXT")   # database of an earlier version
+    connection.execute("CREATE INDEX IF NOT EXISTS sessions_participant ON sessions (task, participant_id)")
+    connection.execute("CREATE INDEX IF NOT EXISTS sessions_file ON sessions (station, task, results_file)")
+
+
+def open_store(task: str, results_dir: os.PathLike, argv: Optional[List[str]] = None) -> Optional[SessionStore]:
+    """
+    Session store for the launch option --results-db [PATH].
+
+    Args:
+        task (str): Task code
+        results_dir (os.PathLike): Directory of the default database (results_dir/results.sqlite)
+        argv (Optional[List[str]]): Launch arguments (default: sys.argv[1:])
+
+    Returns:
+        Optional[SessionStore]: None without the launch option
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    for i, arg in enumerate(argv):
+        if arg == RESULTS_DB_FLAG:
+            has_path = i + 1 < len(argv) and not argv[i + 1].startswith("--")
+            path = argv[i + 1] if has_path else os.path.join(results_dir, RESULTS_DB_NAME)
+        elif arg.startswith(RESULTS_DB_FLAG + "="):
+            path = arg.split("=", 1)[1]
+        else:
+            continue
+        logger.info(f"Results database: {path}")
+        return SessionStore(str(path), task)
+    return None
+
+
+def export_csv(db_path: str, out_dir: str, task: Optional[str] = None, participant_id: Optional[str] = None,
+               overwrite: bool = False) -> List[str]:
+    """
+    Write every stored results file back out (the same name, columns and values as the CSV written during
+    the sessions), to out_dir/<station>/<task folder>/results/<file name>. The sessions of one file (runs
+    that appended to it after a restart) are combined in order into that one file.
+
+    Args:
+        db_path (str): Database file
+        out_dir (str): Directory the CSVs are written to
+        task (Optional[str]): Only the files of this task
+        participant_id (Optional[str]): Only the files of this participant
+        overwrite (bool): Replace files that already exist in out_dir (skipped otherwise)
+
+    Returns:
+        List[str]: Paths written
+    """
+    connection = sqlite3.connect(db_path)
+    create_schema(connection)
+    query = "SELECT station, task, results_file, columns FROM sessions WHERE 1"
+    params: List[str] = []
+    if task is not None:
+        query += " AND task = ?"
+        params.append(task)
+    if participant_id is not None:
+        query += " AND participant_id = ?"
+        params.append(participant_id)
+    files: Dict[Tuple[Optional[str], str, str], List[str]] = {}    # (station, task, results file) -> columns
+    for station, session_task, results_file, columns in connection.execute(query + " ORDER BY id", params):
+        header = files.setdefault((station, session_task, results_file), [])
+        header.extend(c for c in json.loads(columns) if c not in header)
+
+    written = []
+    for (station, session_task, results_file), header in files.items():
+        out_path = os.path.join(out_dir, station or "unknown_station", results_file)
+        if os.path.exists(out_path) and not overwrite:
+            logger.warning(f"Skipping {out_path}: already exists")
+            continue
+        rows = connection.execute(
+            f"SELECT {', '.join('r.' + quote(c) for c in header)} FROM {quote(table_name(session_task))} r "
+            "JOIN sessions s ON s.id = r.session_id WHERE s.station IS ? AND s.task = ? AND s.results_file = ? "
+            "ORDER BY s.id, r.row_number", (station, session_task, results_file))
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        with open(out_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+        written.append(out_path)
+    connection.close()
+    logger.info(f"Exported {len(written)} results files to {out_dir}")
+    return written
+
+
+def check_restart_round_trip() -> bool:
+    """
+    Write one results file in two runs through SessionWriter (the second recovers the counter and appends,
+    as after a restart), each with its own ResultsWriter and SessionStore, then export the database and
+    compare the export with the CSV.
+
+    Returns:
+        bool: True if the exported file holds the same rows as the CSV
+    """
+    import tempfile
+    from pathlib import Path
+    from utils.results_writer import ResultsWriter
+    from utils.session_writer import SessionWriter
+
+    columns = ["participant_id", "trial_number", "value"]
+    with tempfile.TemporaryDirectory() as tmp:
+        results_file = Path(tmp) / "task" / "results" / "P01_CHECK_results.csv"
+        results_file.parent.mkdir(parents=True)
+        db_path = os.path.join(tmp, RESULTS_DB_NAME)
+        for values in ([0.5, "a", ""], [1, "b"]):
+            writer = ResultsWriter(store=SessionStore(db_path, "CHECK"))
+            session = SessionWriter(results_file, columns, writer=writer)
+            for value in values:
+                session.append({"participant_id": "P01", "value": value})
+            session.end_block()
+            session.close()
+            writer.close()
+        written = export_csv(db_path, os.path.join(tmp, "exported"))
+        with results_file.open(newline="", encoding="utf-8") as f:
+            expected = list(csv.reader(f))
+        exported: List[List[str]] = []
+        if len(written) == 1:
+            with open(written[0], newline="", encoding="utf-8") as f:
+                exported = list(csv.reader(f))
+    ok = exported == expected
+    logger.info(f"Restart round trip: {'OK' if ok else 'FAILED'} "
+                f"({len(expected) - 1} rows written, {max(len(exported) - 1, 0)} exported)")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the per-task results CSVs from a results database")
+    parser.add_argument("db", nargs="?")
+    parser.add_argument("out_dir", nargs="?")
+    parser.add_argument("--task")
+    parser.add_argument("--participant")
+    parser.add_argument("--overwrite", action="store_true")
+    parser.add_argument("--check", action="store_true", help="Check that a file appended to after a restart exports whole")
+    args = parser.parse_args()
+    if args.check:
+        sys.exit(0 if check_restart_round_trip() else 1)
+    if args.db is None or args.out_dir is None:
+        parser.error("db and out_dir are required")
+    export_csv(args.db, args.out_dir, args.task, args.participant, args.overwrite)
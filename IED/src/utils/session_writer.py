@@ -0,0 +1,189 @@
+# ./src/utils/session_writer.py
+"""
+Append-only writer for a session's results CSV.
+
+Public API:
+    SessionWriter(path, columns, counter_column="trial_number", durability="trial", writer=None)
+    writer.append(record) -> int
+    writer.end_block() / writer.flush(sync=False) / writer.close()
+    DURABILITY_POLICIES
+
+- The trial counter is kept in memory and rows are handed to the results writer
+  thread (utils/results_writer.py), which keeps the file open for the session:
+  a trial never waits for the disk, regardless of how many rows the file holds.
+- After a restart, the counter is recovered from the last row of the file (only
+  the tail is read). A torn last row (the process died while writing it) is
+  truncated away and logged before the file is reopened.
+- A file whose header differs from the current columns (written by an older
+  version of the task) is never appended to: the rows go to the first free
+  versioned file instead (<name>_v2.csv, _v3, ...).
+- Durability policy (how much may be lost if the process or machine dies):
+    "trial": the writer thread flushes every batch of rows to the OS (a crash of
+             the task loses at most the rows still queued)
+    "fsync": same, and end_block() waits until the block's rows are written and
+             fsyncs them (a power loss loses at most the current block)
+  There is no per-block flush policy: the writer thread already flushes every
+  batch, so deferring the flush to end_block() would only delay the rows.
+  Queued rows are written at exit, also after SystemExit from an event loop.
+"""
+
+import csv
+import os
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Sequence
+
+from utils.logger import get_logger
+from utils.results_writer import ResultsWriter, results_writer
+
+
+logger = get_logger("./src/utils/session_writer")    # create logger
+
+DURABILITY_POLICIES = ("trial", "fsync")
+TAIL_BYTES = 64 * 1024      # read at most this much from the end of the file to find the last row
+
+
+class SessionWriter:
+    def __init__(self, path: Path, columns: Sequence[str], counter_column: str = "trial_number",
+                 durability: str = "trial", writer: Optional[ResultsWriter] = None) -> None:
+        """
+        Open (or create) the results file and recover the trial counter.
+
+        Args:
+            path (Path): Results CSV
+            columns (Sequence[str]): Column order; written as the header of a new file
+            counter_column (str): Column numbering the rows (1, 2, ...), filled in by append()
+            durability (str): "trial" or "fsync" (see module docstring)
+            writer (Optional[ResultsWriter]): Writer thread the rows go through (default: the shared one)
+        """
+        if durability not in DURABILITY_POLICIES:
+            raise ValueError(f"Unknown durability policy: {durability!r} (expected one of {DURABILITY_POLICIES})")
+        self.requested_path = Path(path)
+        self.columns = list(columns)
+        self.counter_column = counter_column
+        self.durability = durability
+        self.path = self._select_path()    # requested_path, or a versioned file if its header is outdated
+        self.rows = self._recover()     # number of the last row written (0: none yet)
+        self._writer = writer or results_writer
+        self._writer.open(self.path, self.columns)     # header written by the writer thread if the file is new
+        self._open = True
+        logger.info(f"Session writer opened {self.path} | next {counter_column}={self.rows + 1}, durability={durability}")
+
+    def _select_path(self) -> Path:
+        """Return the requested file, or the first versioned file whose header matches the current columns."""
+        path, version = self.requested_path, 1
+        while self._read_header(path) not in (None, self.columns):
+            version += 1
+            path = self.requested_path.with_name(f"{self.requested_path.stem}_v{version}{self.requested_path.suffix}")
+        if version > 1:
+            logger.warning(f"{self.requested_path}: header differs from the current columns; writing to {path.name}")
+        return path
+
+    @staticmethod
+    def _read_header(path: Path) -> Optional[List[str]]:
+        """Header of an existing file (None for a missing or empty file, or a header torn before its newline)."""
+        if not path.exists():
+            return None
+        with path.open("rb") as f:
+            line = f.readline()
+        if not line.endswith(b"\n"):
+            return None
+        return next(csv.reader([line.decode("utf-8", errors="replace")]), [])
+
+    def _recover(self) -> int:
+        """Return the counter of the last complete row of an existing file (0 for a new or empty file)."""
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            return 0
+        with self.path.open("r+b") as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(size - 1)
+            if f.read(1) != b"\n":
+                # Torn last row (the process died while writing it): cut the file back to the last complete line
+                end = self._last_line_end(f, size)
+                f.seek(end)
+                dropped = f.read()
+                f.truncate(end)
+                logger.warning(f"{self.path}: last row is incomplete (interrupted write), dropped {len(dropped)} bytes: "
+                               f"{dropped.decode('utf-8', errors='replace')!r}")
+                size = end
+            f.seek(max(0, size - TAIL_BYTES))
+            tail = f.read(size - f.tell())
+        if size == 0:
+            return 0
+
+        index = self.columns.index(self.counter_column)
+        for line in reversed(tail.decode("utf-8", errors="replace").splitlines()):
+            row = next(csv.reader([line]), [])
+            if not row or row == self.columns:
+                continue
+            try:
+                return int(row[index])
+            except (IndexError, ValueError):
+                return self._count_rows()
+        # No data row in the tail: the file holds only the header, unless the tail was a single long row
+        return 0 if size <= TAIL_BYTES else self._count_rows()
+
+    @staticmethod
+    def _last_line_end(f: BinaryIO, size: int) -> int:
+        """Offset just past the last newline of the file (0 if it has none), read backwards TAIL_BYTES at a time."""
+        end = size
+        while end > 0:
+            start = max(0, end - TAIL_BYTES)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b"\n")
+            if newline >= 0:
+                return start + newline + 1
+            end = start
+        return 0
+
+    def _count_rows(self) -> int:
+        """Fallback when the tail holds no readable counter: count the data rows of the whole file."""
+        with self.path.open("r", newline="", encoding="utf-8") as f:
+            rows = sum(1 for row in csv.reader(f) if row and row != self.columns)
+        logger.warning(f"{self.path}: no counter in the last row; counted {rows} rows instead")
+        return rows
+
+    def append(self, record: Dict[str, object]) -> int:
+        """
+        Append one row; the counter column is filled in.
+
+        Args:
+            record (Dict[str, object]): Column -> value (missing columns are left empty)
+
+        Returns:
+            int: Number of the row
+        """
+        if not self._open:
+            raise ValueError(f"Session writer for {self.path} is closed")
+        self.rows += 1
+        row = [record.get(column, "") for column in self.columns]
+        row[self.columns.index(self.counter_column)] = self.rows
+        self._writer.write(self.path, [row], self.columns)
+        return self.rows
+
+    def flush(self, sync: bool = False) -> None:
+        """
+        Wait until the queued rows are handed to the OS.
+
+        Args:
+            sync (bool): Also fsync, so the rows survive a power loss
+        """
+        if self._open:
+            self._writer.flush(sync=sync)
+
+    def end_block(self) -> None:
+        """Apply the durability policy at the end of a block (and commit the block to the results database)."""
+        self._writer.end_block()
+        if self.durability == "fsync":
+            self.flush(sync=True)
+
+    def close(self) -> None:
+        """Write (and fsync) the queued rows and close the file."""
+        if not self._open:
+            return
+        self._writer.close_file(self.path)
+        self._open = False
+        logger.info(f"Session writer closed {self.path} | {self.rows} rows | writer: {self._writer.report()}")
+
+    @property
+    def closed(self) -> bool:
+        return not self._open
@@ -1,4 +1,5 @@
 # ./utils/show_feedback.py
+from __future__ import annotations
 import pygame
 from pathlib import Path
 
@@ -7,13 +8,18 @@ from utils.logger import get_logger
 
 logger = get_logger("./src/utils/show_feedback")    # create logger
 
-def show_feedback(screen: pygame.Surface, correct: bool) -> None:
+_feedback_images = {}   # correct -> feedback image, scaled once
+
+
+def load_feedback(correct: bool) -> pygame.Surface | None:
     """
-    Show feedback at the center of the screen
-    - correct == True: show correct feedback image
-    - correct == False: show incorrect feedback image
+    Load the feedback image and scale it to fit a block (once per image)
+    - correct == True: correct feedback image
+    - correct == False: incorrect feedback image
     """
-    # Load image
+    if correct in _feedback_images:
+        return _feedback_images[correct]
+
     if correct:
         img_path = cfg.FB_CORRECT
     else:
@@ -41,6 +47,21 @@ def show_feedback(screen: pygame.Surface, correct: bool) -> None:
     if new_size != (orig_w, orig_h):
         img = pygame.transform.smoothscale(img, new_size)
 
+    _feedback_images[correct] = img
+    return img
+
+
+def show_feedback(screen: pygame.Surface, correct: bool) -> None:
+    """
+    Show feedback at the center of the screen
+    - correct == True: show correct feedback image
+    - correct == False: show incorrect feedback image
+    """
+    # Load image (cached)
+    img = load_feedback(correct)
+    if img is None:
+        return None
+
     # Compute center
     w, h = screen.get_size()
     cx, cy = w / 2, h / 2
@@ -0,0 +1,92 @@
+import os
+import json
+import numpy as np
+
+from VideoDecoder import VIDEO_SIZE, DEFAULT_VIDEO_FPS
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Location of the pre-decoded frame store (built by build_frame_store.py)
+FRAME_STORE_DIR = os.path.join(SCRIPT_DIR, "stimuli", "frame_store")
+FRAME_STORE_DATA = "frames.raw"    # all frames back to back, uint8 RGB, (height, width, 3) each
+FRAME_STORE_INDEX = "index.json"   # clip key -> offset / frame count / fps
+
+
+def clip_key(video_path):
+    """Key of a clip in the store: path relative to the task folder, with forward slashes"""
+    if video_path.startswith("./"):
+        video_path = video_path[2:]
+    if os.path.isabs(video_path):
+        video_path = os.path.relpath(video_path, SCRIPT_DIR)
+    return video_path.replace(os.sep, "/")
+
+
+class StoredClip:
+    def __init__(self, frames, fps):
+        """
+        Play back one clip straight from the memory-mapped store (no decoding).
+        Offers the same next_frame() / stop() interface as VideoDecoder; frames are views into the map.
+        :param frames: Memory-mapped frame array of shape (frame_count, height, width, 3)
+        :param fps: Native frame rate of the clip
+        """
+        self.frames = frames
+        self.fps = fps
+        self.size = (frames.shape[2], frames.shape[1])
+        self._position = 0
+        self.allocations = 0   # frames are served straight from the memory map
+
+    def next_frame(self):
+        """Return the next frame (contiguous (height, width, 3) RGB view), or None once the clip has ended."""
+        if self._position >= len(self.frames):
+            return None
+        frame = self.frames[self._position]
+        self._position += 1
+        return frame
+
+    def stop(self):
+        """Nothing to release (the memory map stays open for the whole session)."""
+        self._position = len(self.frames)
+
+
+class FrameStore:
+    def __init__(self, store_dir=FRAME_STORE_DIR):
+        """
+        Open the pre-decoded frame store, if it has been built.
+        Clips missing from the store have to be decoded with cv2 (see VideoDecoder).
+        :param store_dir: Folder holding frames.raw and index.json
+        """
+        self.clips = {}
+        self.frames = None
+
+        index_path = os.path.join(store_dir, FRAME_STORE_INDEX)
+        data_path = os.path.join(store_dir, FRAME_STORE_DATA)
+        if not (os.path.exists(index_path) and os.path.exists(data_path)):
+            return
+
+        try:
+            with open(index_path, "r") as f:
+                index = json.load(f)
+
+            width, height = index["width"], index["height"]
+            if (width, height) != VIDEO_SIZE:
+                print(f"Frame store was built for {width}x{height}, expected {VIDEO_SIZE[0]}x{VIDEO_SIZE[1]}; ignoring it")
+                return
+
+            self.frames = np.memmap(data_path, dtype=np.uint8, mode="r",
+                                    shape=(index["total_frames"], height, width, 3))
+            self.clips = index["clips"]
+            print(f"Frame store loaded: {len(self.clips)} clips, {index['total_frames']} frames")
+        except Exception as e:
+            print(f"Error loading frame store {store_dir}: {e}")
+            self.clips = {}
+            self.frames = None
+
+    def has(self, video_path):
+        """Whether the clip has been pre-decoded"""
+        return clip_key(video_path) in self.clips
+
+    def open_clip(self, video_path):
+        """Return a StoredClip for a pre-decoded clip"""
+        clip = self.clips[clip_key(video_path)]
+        frames = self.frames[clip["offset"]:clip["offset"] + clip["frame_count"]]
+        return StoredClip(frames, clip["fps"] or DEFAULT_VIDEO_FPS)
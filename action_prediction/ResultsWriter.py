@@ -0,0 +1,219 @@
+import atexit
+import csv
+import os
+import queue
+import threading
+import time
+
+# Rows (and open / flush / close requests) waiting for the writer thread; write() blocks when it is full
+RESULTS_QUEUE_SIZE = 1024
+# Most queued items written per batch (one flush per file per batch)
+RESULTS_BATCH_SIZE = 256
+
+
+class ResultsWriter:
+    def __init__(self, queue_size=RESULTS_QUEUE_SIZE, batch_size=RESULTS_BATCH_SIZE, store=None):
+        """
+        Write the results rows on a background thread, so disk latency (e.g. a synced results folder
+        stalling for 20-200 ms) never lands in the presentation loop: write() only queues the rows.
+        The writer thread takes everything queued at once, writes it per file and flushes each file once
+        per batch. The queue is bounded: if the disk falls that far behind, write() waits rather than
+        dropping a trial. Queued rows are written before the process exits (close() runs at exit, also
+        after pygame.quit(); sys.exit() or an uncaught exception in the event loops).
+        :param queue_size: Maximum number of queued items
+        :param batch_size: Maximum number of items written per batch
+        :param store: SessionStore the rows also go to (see SessionStore.open_store), or None
+        """
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.store = store
+        self.rows = 0               # rows written
+        self.batches = 0
+        self.errors = 0
+        self.queue_max = 0          # deepest queue seen by write()
+        self.blocked = 0            # write() calls that had to wait for room in the queue
+        self.enqueue_ms_max = 0.0   # longest write() call (the time the presentation loop spends here)
+        self.write_ms = []          # duration of each batch on the writer thread
+
+        self._files = {}            # path -> append handle (writer thread only)
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="results-writer", daemon=True)
+                self._thread.start()
+
+    def _put(self, item):
+        self._start()
+        start_ns = time.perf_counter_ns()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.blocked += 1
+            self._queue.put(item)
+        self.enqueue_ms_max = max(self.enqueue_ms_max, (time.perf_counter_ns() - start_ns) / 1_000_000)
+        self.queue_max = max(self.queue_max, self._queue.qsize())
+
+    def _request(self, action, path=None, sync=False, timeout=None):
+        """Queue a control request behind the pending rows and wait until the writer thread has handled it"""
+        done = threading.Event()
+        self._put((action, path, sync, done))
+        return done.wait(timeout)
+
+    def write(self, path, rows, header=None, task=None):
+        """
+        Queue rows for path
+        :param rows: List of rows (each a list of values)
+        :param header: Header row, written first if the file is empty
+        :param task: Table of a side file in the results database (see SessionStore.header)
+        """
+        self._put(("rows", path, header, rows, task))
+
+    def open(self, path, header=None, task=None):
+        """Have the writer thread open path (and write header if the file is empty) before the first row"""
+        self._put(("rows", path, header, [], task))
+
+    def end_block(self):
+        """End of a block: the rows queued so far are inserted into the results database in one transaction"""
+        if self.store is not None:
+            self._put(("commit", None, None, None))
+
+    def set_column(self, path, column, value):
+        """Set a column of every stored row of the session of path (results database only)"""
+        if self.store is not None:
+            self._put(("set", path, (column, value), None))
+
+    def flush(self, sync=False, timeout=None):
+        """
+        Wait until every queued row is written and flushed
+        :param sync: Also fsync the open files
+        :return: False if timeout (s) expired first
+        """
+        return self._request("flush", sync=sync, timeout=timeout)
+
+    def close_file(self, path, timeout=None):
+        """Write the rows queued for path, then fsync and close it (e.g. before the file is rewritten)"""
+        return self._request("close", path=path, timeout=timeout)
+
+    def close(self, timeout=None):
+        """Write every queued row, fsync and close the files, and stop the writer thread"""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._request("close", timeout=timeout)
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self):
+        """Writer thread: write the queued items in batches"""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            self._write_batch([item for item in batch if item is not None])
+            if stop:
+                break
+
+    def _write_batch(self, batch):
+        start_ns = time.perf_counter_ns()
+        touched = set()
+        rows = 0
+        for item in batch:
+            action, path = item[0], item[1]
+            try:
+                if action == "rows":
+                    header, item_rows = item[2], item[3]
+                    f = self._file(path, header)
+                    csv.writer(f).writerows(item_rows)
+                    touched.add(path)
+                    rows += len(item_rows)
+                    self._store("insert", path, header, item_rows, item[4])
+                elif action == "commit":
+                    self._store("commit")
+                elif action == "set":
+                    self._store("set_column", path, *item[2])
+                else:
+                    # Control request: everything queued before it is written first
+                    self._flush(touched)
+                    touched = set()
+                    if action == "flush":
+                        self._flush(self._files, sync=item[2])
+                        self._store("commit")
+                    else:
+                        self._close(path)
+                        self._store("commit" if path is not None else "close")
+            except Exception as e:
+                self.errors += 1
+                print(f"Error writing results to {path}: {e}")
+            finally:
+                if action in ("flush", "close"):
+                    item[3].set()
+        self._flush(touched)
+        if rows:
+            self.rows += rows
+            self.batches += 1
+            self.write_ms.append((time.perf_counter_ns() - start_ns) / 1_000_000)
+
+    def _store(self, method, *args):
+        """Pass rows / a commit on to the results database; its errors never stop the CSV writes"""
+        if self.store is None:
+            return
+        try:
+            getattr(self.store, method)(*args)
+        except Exception as e:
+            self.errors += 1
+            print(f"Error writing results to the database {self.store.path}: {e}")
+
+    def _file(self, path, header):
+        f = self._files.get(path)
+        if f is None:
+            f = open(path, mode="a", newline="")
+            self._files[path] = f
+            if header is not None and f.tell() == 0:
+                csv.writer(f).writerow(header)
+        return f
+
+    def _flush(self, paths, sync=False):
+        for path in list(paths):
+            f = self._files.get(path)
+            if f is None:
+                continue
+            try:
+                f.flush()
+                if sync:
+                    os.fsync(f.fileno())
+            except OSError as e:
+                self.errors += 1
+                print(f"Error flushing results to {path}: {e}")
+
+    def _close(self, path=None):
+        """Fsync and close path (every file if None)"""
+        for p in [path] if path is not None else list(self._files):
+            if p in self._files:
+                self._flush([p], sync=True)
+                self._files.pop(p).close()
+
+    def report(self):
+        """Queue depth and write latency: {"rows", "batches", "queue_max", "blocked", "enqueue_ms_max", ...}"""
+        write_ms = list(self.write_ms)
+        report = {
+            "rows": self.rows,
+            "batches": self.batches,
+            "queue_depth": self._queue.qsize(),
+            "queue_max": self.queue_max,
+            "blocked": self.blocked,
+            "enqueue_ms_max": round(self.enqueue_ms_max, 3),
+            "write_ms_mean": round(sum(write_ms) / len(write_ms), 3) if write_ms else None,
+            "write_ms_max": round(max(write_ms), 3) if write_ms else None,
+            "errors": self.errors,
+        }
+        if self.store is not None:
+            report.update(self.store.report())
+        return report
@@ -0,0 +1,52 @@
+import pygame
+
+# Loaded fonts: (font name, size) -> Font
+_fonts = {}
+# Rendered text: (font name, size, text, colour) -> Surface
+_texts = {}
+# Pre-rendered screens: (screen size, labels, background) -> Surface
+_overlays = {}
+
+
+def get_font(size, name=None):
+    """Return the SysFont for (name, size), looking it up only once per session"""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(name, size)
+        _fonts[key] = font
+    return font
+
+
+def render_text(text, size, color, name=None):
+    """Return the anti-aliased rendering of text, rendering it only once per (font, size, text, colour)"""
+    key = (name, size, text, tuple(color))
+    surface = _texts.get(key)
+    if surface is None:
+        surface = get_font(size, name).render(text, True, color)
+        _texts[key] = surface
+    return surface
+
+
+def get_overlay(screen_size, labels, background=None):
+    """
+    Return a screen-sized surface with all labels drawn on it, built once per screen size,
+    so a response screen is a single blit per frame.
+    :param screen_size: (width, height) of the display
+    :param labels: Tuple of (text, font size, colour, (x, y)) where (x, y) is the midtop of the text
+    :param background: Fill colour (opaque overlay), or None for a transparent overlay
+    """
+    key = (tuple(screen_size), labels, background)
+    overlay = _overlays.get(key)
+    if overlay is None:
+        if background is None:
+            overlay = pygame.Surface(screen_size, pygame.SRCALPHA).convert_alpha()
+            overlay.fill((0, 0, 0, 0))
+        else:
+            overlay = pygame.Surface(screen_size).convert()
+            overlay.fill(background)
+        for text, size, color, (x, y) in labels:
+            text_surface = render_text(text, size, color)
+            overlay.blit(text_surface, text_surface.get_rect(midtop=(int(x), int(y))))
+        _overlays[key] = overlay
+    return overlay
@@ -0,0 +1,101 @@
+import threading
+import queue
+import cv2
+import numpy as np
+
+# Display size of the video clips (width, height)
+VIDEO_SIZE = (850, 475)
+# Number of decoded frames held ahead of the presentation loop
+FRAME_BUFFER_SIZE = 32
+# Frame rate assumed when a clip does not report CAP_PROP_FPS
+DEFAULT_VIDEO_FPS = 30
+
+
+class VideoDecoder:
+    def __init__(self, video_path, size=VIDEO_SIZE, buffer_size=FRAME_BUFFER_SIZE):
+        """
+        Decode a video clip on a background thread into a bounded buffer of ready-to-upload RGB frames.
+        Decoding starts as soon as the object is created, so a decoder can be created for the
+        next trial while the current trial's response page is still up.
+        Frames are written into a fixed-size pool of contiguous (height, width, 3) uint8 buffers, filled
+        on the first pass through the pool and re-used after that, so no new frame memory is allocated
+        once the pool is full. allocations counts the frame buffers actually allocated for the clip.
+        :param video_path: Path to the video file
+        :param size: Display size (width, height) every frame is resized to
+        :param buffer_size: Maximum number of decoded frames waiting to be presented
+        """
+        self.video_path = video_path
+        self.size = size
+        self.cap = cv2.VideoCapture(video_path)
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or DEFAULT_VIDEO_FPS
+        self.frames = queue.Queue(maxsize=buffer_size)
+
+        # Buffer pool: buffer_size frames can wait in the queue, one is being filled by the producer
+        # and one is being uploaded by the presentation loop
+        self._pool = []
+        self._pool_size = buffer_size + 2
+        self.allocations = 0    # frame-sized buffers allocated for this clip (pool, resize and decode buffers)
+        self._resized = self._allocate()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._decode, daemon=True)
+        self._thread.start()
+
+    def _allocate(self):
+        """New (height, width, 3) uint8 frame buffer, counted in allocations"""
+        width, height = self.size
+        self.allocations += 1
+        return np.empty((height, width, 3), dtype=np.uint8)
+
+    def _decode(self):
+        """Producer: read, resize and convert every frame, then push it into the buffer."""
+        cap = self.cap
+        raw = None
+        slot = 0
+        try:
+            while not self._stop.is_set():
+                # Re-use the decode buffer of the previous frame (OpenCV allocates a new one if it cannot)
+                ret, decoded = cap.read(raw)
+                if not ret:
+                    break
+                if decoded is not raw:
+                    self.allocations += 1
+                    raw = decoded
+
+                if slot == len(self._pool):
+                    self._pool.append(self._allocate())
+                frame = self._pool[slot]
+                slot = (slot + 1) % self._pool_size
+                cv2.resize(raw, self.size, dst=self._resized)
+                cv2.cvtColor(self._resized, cv2.COLOR_BGR2RGB, dst=frame)
+
+                # Block while the buffer is full (stop() unblocks it)
+                while not self._stop.is_set():
+                    try:
+                        self.frames.put(frame, timeout=0.05)
+                        break
+                    except queue.Full:
+                        continue
+        except Exception as e:
+            print(f"Error decoding video {self.video_path}: {e}")
+        finally:
+            cap.release()
+            # End-of-clip marker
+            while not self._stop.is_set():
+                try:
+                    self.frames.put(None, timeout=0.05)
+                    break
+                except queue.Full:
+                    continue
+
+    def next_frame(self):
+        """
+        Consumer: return the next decoded frame (blocks until it is ready).
+        The returned buffer is only valid until the following call (it goes back into the pool).
+        Returns None once the clip has ended.
+        """
+        return self.frames.get()
+
+    def stop(self):
+        """Stop decoding and release the video file."""
+        self._stop.set()
+        self._thread.join()
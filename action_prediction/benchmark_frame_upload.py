@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Compare the per-frame cost of the two video upload paths on one clip:
+  - legacy:   cv2.resize + cvtColor into new arrays, then pygame.surfarray.make_surface (new Surface per frame)
+  - in-place: cv2.resize / cvtColor into pre-allocated buffers, then surfarray.blit_array into one reused Surface
+Reports frame time (mean / p95 / max), and the frame-sized buffers (measured with tracemalloc) and
+Surfaces (counted at their constructors) allocated per clip, on a separate untimed pass.
+
+Usage: python benchmark_frame_upload.py [path/to/clip.mp4]
+"""
+import os
+import sys
+import glob
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import cv2
+import numpy as np
+import pygame
+
+from VideoDecoder import VIDEO_SIZE
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def read_raw_frames(video_path):
+    """Decode the clip once so both paths are timed on the same input (decode time excluded)"""
+    cap = cv2.VideoCapture(video_path)
+    frames = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def legacy_path():
+    """Old path: fresh arrays and a fresh Surface for every frame"""
+    def upload(raw):
+        frame = cv2.resize(raw, VIDEO_SIZE)
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        return pygame.surfarray.make_surface(frame.swapaxes(0, 1))
+    return upload
+
+
+def in_place_path():
+    """New path: pre-allocated buffers and one reused Surface"""
+    width, height = VIDEO_SIZE
+    resized = np.empty((height, width, 3), dtype=np.uint8)
+    rgb = np.empty((height, width, 3), dtype=np.uint8)
+    frame_surface = pygame.Surface(VIDEO_SIZE)
+
+    def upload(raw):
+        cv2.resize(raw, VIDEO_SIZE, dst=resized)
+        cv2.cvtColor(resized, cv2.COLOR_BGR2RGB, dst=rgb)
+        pygame.surfarray.blit_array(frame_surface, rgb.swapaxes(0, 1))
+        return frame_surface
+    return upload
+
+
+class SurfaceCounter:
+    """Count the Surfaces created while active (pygame.Surface and surfarray.make_surface are wrapped)"""
+    def __init__(self):
+        self.created = 0
+
+    def __enter__(self):
+        self._surface, self._make_surface = pygame.Surface, pygame.surfarray.make_surface
+
+        def counted(create):
+            def wrapper(*args, **kwargs):
+                self.created += 1
+                return create(*args, **kwargs)
+            return wrapper
+
+        pygame.Surface = counted(self._surface)
+        pygame.surfarray.make_surface = counted(self._make_surface)
+        return self
+
+    def __exit__(self, *exc):
+        pygame.Surface, pygame.surfarray.make_surface = self._surface, self._make_surface
+        return False
+
+
+def time_run(path, raw_frames):
+    """Per-frame time of one path (no tracing active)"""
+    upload = path()
+    frame_ns = []
+    for raw in raw_frames:
+        start_ns = time.perf_counter_ns()
+        upload(raw)
+        frame_ns.append(time.perf_counter_ns() - start_ns)
+    return frame_ns
+
+
+def count_allocations(path, raw_frames):
+    """
+    Separate pass (tracing slows the frames down): frame-sized numpy / OpenCV buffers and Surfaces allocated
+    per clip, setup included. Buffers are measured with tracemalloc (numpy reports its data allocations to
+    it): for the setup and for every frame, the traced peak above the memory in use before it, in frame-sized
+    units (buffers freed before the next one is allocated count once). Surface pixels are SDL memory,
+    invisible to tracemalloc, so Surfaces are counted by wrapping their constructors.
+    :return: (frame-sized buffers, Surfaces created, traced peak in bytes)
+    """
+    width, height = VIDEO_SIZE
+    frame_bytes = width * height * 3
+    with SurfaceCounter() as surfaces:
+        tracemalloc.start()
+        upload = path()
+        traced_peak = tracemalloc.get_traced_memory()[1]
+        buffers = traced_peak // frame_bytes
+        for raw in raw_frames:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            upload(raw)
+            _, peak = tracemalloc.get_traced_memory()
+            buffers += (peak - before) // frame_bytes
+            traced_peak = max(traced_peak, peak)
+        tracemalloc.stop()
+    return buffers, surfaces.created, traced_peak
+
+
+def report(name, frame_ns, buffers, surfaces, traced_peak):
+    frame_ms = np.array(frame_ns) / 1_000_000
+    print(f"{name:>9}: mean {frame_ms.mean():.3f} ms | p95 {np.percentile(frame_ms, 95):.3f} ms | "
+          f"max {frame_ms.max():.3f} ms | per clip: {buffers} frame-sized buffers, {surfaces} Surfaces | "
+          f"traced peak: {traced_peak / 1_000_000:.1f} MB")
+
+
+def main():
+    if len(sys.argv) > 1:
+        video_path = sys.argv[1]
+    else:
+        candidates = sorted(glob.glob(os.path.join(SCRIPT_DIR, "stimuli", "videos", "*_videos", "*.mp4")))
+        if not candidates:
+            print("No video found; pass a clip path")
+            return
+        video_path = candidates[0]
+
+    pygame.init()
+    raw_frames = read_raw_frames(video_path)
+    print(f"{video_path}: {len(raw_frames)} frames -> {VIDEO_SIZE[0]}x{VIDEO_SIZE[1]}")
+
+    for name, path in (("legacy", legacy_path), ("in-place", in_place_path)):
+        frame_ns = time_run(path, raw_frames)
+        buffers, surfaces, traced_peak = count_allocations(path, raw_frames)
+        report(name, frame_ns, buffers, surfaces, traced_peak)
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Offline build step: decode every test / demo video once at the display size (850x475 RGB)
+into a single raw frame file plus an index, so run_trials can memory-map the frames instead
+of decoding the clips during the session.
+
+Usage: python build_frame_store.py
+"""
+import os
+import glob
+import json
+import cv2
+
+from VideoDecoder import VIDEO_SIZE
+from FrameStore import FRAME_STORE_DIR, FRAME_STORE_DATA, FRAME_STORE_INDEX, clip_key
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+VIDEO_DIR = os.path.join(SCRIPT_DIR, "stimuli", "videos")
+
+
+def build_frame_store(video_dir=VIDEO_DIR, store_dir=FRAME_STORE_DIR):
+    """Decode all *_videos/*.mp4 clips into frames.raw and write index.json"""
+    os.makedirs(store_dir, exist_ok=True)
+    width, height = VIDEO_SIZE
+
+    video_paths = sorted(glob.glob(os.path.join(video_dir, "*_videos", "*.mp4")))
+    clips = {}
+    offset = 0
+
+    # Write to temporary files first so an interrupted build never leaves a broken store behind
+    data_tmp = os.path.join(store_dir, FRAME_STORE_DATA + ".tmp")
+    index_tmp = os.path.join(store_dir, FRAME_STORE_INDEX + ".tmp")
+
+    with open(data_tmp, "wb") as data_file:
+        for i, video_path in enumerate(video_paths):
+            cap = cv2.VideoCapture(video_path)
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            frame_count = 0
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                frame = cv2.resize(frame, VIDEO_SIZE)
+                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                data_file.write(frame.tobytes())
+                frame_count += 1
+            cap.release()
+
+            if frame_count == 0:
+                print(f"Skipped (no frames decoded): {video_path}")
+                continue
+
+            clips[clip_key(video_path)] = {
+                "offset": offset,
+                "frame_count": frame_count,
+                "fps": fps,
+            }
+            offset += frame_count
+            print(f"[{i + 1}/{len(video_paths)}] {clip_key(video_path)}: {frame_count} frames @ {fps:.2f} fps")
+
+    with open(index_tmp, "w") as f:
+        json.dump({
+            "width": width,
+            "height": height,
+            "total_frames": offset,
+            "clips": clips,
+        }, f, indent=2)
+
+    os.replace(data_tmp, os.path.join(store_dir, FRAME_STORE_DATA))
+    os.replace(index_tmp, os.path.join(store_dir, FRAME_STORE_INDEX))
+    print(f"Frame store written to {store_dir}: {len(clips)} clips, {offset} frames")
+
+
+if __name__ == "__main__":
+    build_frame_store()
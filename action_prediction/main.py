@@ -6,10 +6,21 @@ import csv
 import time
 import random
 import pygame.event
-import cv2
 
 from Instruction import Instruction
 from FeedbackIcon import FeedbackIcon
+from VideoDecoder import VideoDecoder
+from FrameStore import FrameStore
+from InstructionPager import InstructionPager
+from TextCache import render_text, get_overlay
+from InputCapture import InputCapture, KEY_DOWN, POLL_INTERVAL_S
+from SessionClock import SessionClock, SESSION_COLUMNS
+from GCQuiet import GCQuiet
+from RealtimeMode import apply_launch_options, REALTIME_COLUMNS, realtime_columns
+from WarmUp import WarmUp, render_offscreen
+from IdleScreen import IdleScreen, IDLE_TIMEOUT_MS
+from ResultsWriter import ResultsWriter
+from SessionStore import open_store
 
 # Meta-parameters
 MODE = "test"
@@ -42,6 +53,8 @@ BREAK2_PAGE = 16
 TEST3_PAGE = 18
 BREAK3_PAGE = 19
 TEST4_PAGE = 22
+# Block started by SPACE on the page before it (the warm-up runs while that page is up)
+BLOCK_PAGES = {DEMO_PAGE: "demo", TEST1_PAGE: "test1", TEST2_PAGE: "test2", TEST3_PAGE: "test3", TEST4_PAGE: "test4"}
 
 # Participant info
 participant_info = ""
@@ -49,6 +62,8 @@ input_active = True
 instruction_active = False
 
 global_start_time = None
+# Session timebase (wall-clock anchor + perf_counter_ns origin) for the onset/response columns
+session_clock = SessionClock()
 # Global variable to track unique filename across all trials
 unique_filename = None
 global_end_time = None
@@ -65,6 +80,9 @@ phase_data = {
     "test4": []
 }
 
+# Real-time process mode (launch option --realtime [--cpu N]); before pygame.init() so its threads inherit it
+apply_launch_options()
+
 # Initialize pygame
 pygame.init()
 
@@ -110,8 +128,22 @@ def get_participant_id(screen):
     input_text = ""
     active = True
 
+    changed = True
     while active:
-        for event in pygame.event.get():
+        # Redraw only after input, and sleep until the next event
+        with idle_screen.measure("participant_id"):
+            if idle_screen.redraw(changed):
+                screen.fill(GRAY_RGB)
+                prompt = font_medium.render("Enter Participant ID (press enter when completed):", True, BLACK_RGB)
+                text_surface = font_medium.render(input_text, True, BLACK_RGB)
+                screen.blit(prompt, (SCREEN_WIDTH // 2 - prompt.get_width() // 2, SCREEN_HEIGHT // 2 - 100))
+                screen.blit(text_surface, (SCREEN_WIDTH // 2 - text_surface.get_width() // 2, SCREEN_HEIGHT // 2))
+                pygame.display.flip()
+                changed = False
+            events = idle_screen.wait()
+
+        for event in events:
+            changed = True
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
@@ -127,32 +159,31 @@ def get_participant_id(screen):
                 else:
                     input_text += event.unicode
 
-        screen.fill(GRAY_RGB)
-        prompt = font_medium.render("Enter Participant ID (press enter when completed):", True, BLACK_RGB)
-        text_surface = font_medium.render(input_text, True, BLACK_RGB)
-        screen.blit(prompt, (SCREEN_WIDTH // 2 - prompt.get_width() // 2, SCREEN_HEIGHT // 2 - 100))
-        screen.blit(text_surface, (SCREEN_WIDTH // 2 - text_surface.get_width() // 2, SCREEN_HEIGHT // 2))
-        pygame.display.flip()
-
     pygame.event.clear()
     return input_text
 
 def load_instructions():
-    instruction_objects = []
-    for i in range(1, TOTAL_INSTRUCTION_PAGES + 1):
-        img_path = os.path.join(INSTRUCTION_DIR, f"{i}.jpg")
-        instruction_objects.append(Instruction(img_path))
+    # Pages are decoded and scaled in the background a few pages ahead of the one on screen
+    instruction_pages = InstructionPager(
+        [os.path.join(INSTRUCTION_DIR, f"{i}.jpg") for i in range(1, TOTAL_INSTRUCTION_PAGES + 1)],
+        lambda img_path: Instruction(img_path).image)
+    instruction_pages.prefetch(0)
 
     instruction_index = 0
     instruction_locked = True
     unlock_timer = pygame.time.get_ticks()
     READ_TIME = ACTUAL_READ_TIME if MODE == "actual" else TEST_READ_TIME
 
+    warmed_up_page = None
+
+    events = []
+    changed = True
     running = True
     while running:
         current_time = pygame.time.get_ticks()
 
-        for event in pygame.event.get():
+        changed = changed or bool(events)
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
@@ -204,46 +235,164 @@ def load_instructions():
         if current_time - unlock_timer >= READ_TIME:
             instruction_locked = False
 
-        screen.fill(GRAY_RGB)
-        if instruction_index < TOTAL_INSTRUCTION_PAGES:
-            img = instruction_objects[instruction_index].image
-            if img:
-                img_rect = img.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-                screen.blit(img, img_rect)
-                pygame.display.flip()
-            else:
-                break
-        elif instruction_index > TOTAL_INSTRUCTION_PAGES:
-            # Show final completion screen
-            screen.fill(GRAY_RGB)
-            completion_text = font_large.render("Task completed!", True, BLACK_RGB)
-            thanks_text = font_medium.render("Thank you for participating!", True, BLACK_RGB)
-            instruction_text = font_medium.render("Press SPACE to exit", True, BLACK_RGB)
+        # Redraw only when the page changed (page turn, block, fullscreen toggle)
+        with idle_screen.measure("instructions"):
+            if idle_screen.redraw(changed):
+                changed = False
+                screen.fill(GRAY_RGB)
+                if instruction_index < TOTAL_INSTRUCTION_PAGES:
+                    img = instruction_pages.get(instruction_index)
+                    if img:
+                        img_rect = img.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+                        screen.blit(img, img_rect)
+                        pygame.display.flip()
+                    else:
+                        break
+                elif instruction_index > TOTAL_INSTRUCTION_PAGES:
+                    # Show final completion screen
+                    screen.fill(GRAY_RGB)
+                    completion_text = font_large.render("Task completed!", True, BLACK_RGB)
+                    thanks_text = font_medium.render("Thank you for participating!", True, BLACK_RGB)
+                    instruction_text = font_medium.render("Press SPACE to exit", True, BLACK_RGB)
             
-            screen.blit(completion_text, (SCREEN_WIDTH // 2 - completion_text.get_width() // 2, SCREEN_HEIGHT // 2 - 100))
-            screen.blit(thanks_text, (SCREEN_WIDTH // 2 - thanks_text.get_width() // 2, SCREEN_HEIGHT // 2))
-            screen.blit(instruction_text, (SCREEN_WIDTH // 2 - instruction_text.get_width() // 2, SCREEN_HEIGHT // 2 + 100))
-            pygame.display.flip()
+                    screen.blit(completion_text, (SCREEN_WIDTH // 2 - completion_text.get_width() // 2, SCREEN_HEIGHT // 2 - 100))
+                    screen.blit(thanks_text, (SCREEN_WIDTH // 2 - thanks_text.get_width() // 2, SCREEN_HEIGHT // 2))
+                    screen.blit(instruction_text, (SCREEN_WIDTH // 2 - instruction_text.get_width() // 2, SCREEN_HEIGHT // 2 + 100))
+                    pygame.display.flip()
+
+        if not running:
+            break
+
+        # Last page before a block: warm up while it is being read
+        next_phase = BLOCK_PAGES.get(instruction_index + 1)
+        if next_phase and warmed_up_page != instruction_index:
+            warm_up_block(next_phase)
+            warmed_up_page = instruction_index
+
+        # Sleep until the next key press, or until the reading time of the page is over
+        with idle_screen.measure("instructions"):
+            events = idle_screen.wait(unlock_timer + READ_TIME - pygame.time.get_ticks() if instruction_locked else IDLE_TIMEOUT_MS)
+
+    instruction_pages.close()
+    print(f"Instruction pages: {instruction_pages.stats()}")
+    print(f"CPU usage of the waiting screens: {idle_screen.report()}")
+
+
+def resolve_video_path(stimuli_path):
+    """Fix relative path (./stimuli/...) to be absolute"""
+    if stimuli_path.startswith("./"):
+        return os.path.join(SCRIPT_DIR, stimuli_path[2:])  # Remove "./" and make absolute
+    return stimuli_path
+
+def open_video(video_path):
+    """Play from the pre-decoded frame store if the clip is there, otherwise decode it with cv2"""
+    if frame_store.has(video_path):
+        return frame_store.open_clip(video_path)
+    return VideoDecoder(video_path)
+
+# One display surface per clip size, re-used for every frame of every clip of that size
+video_surfaces = {}
+
+def get_video_surface(size):
+    """Return (surface, newly_allocated) for the given (width, height)"""
+    if size in video_surfaces:
+        return video_surfaces[size], False
+    video_surfaces[size] = pygame.Surface(size).convert()
+    return video_surfaces[size], True
+
+def play_video(decoder):
+    """
+    Present a clip at its native frame rate (decoder.fps).
+    Frame i is scheduled at start + i / fps on the monotonic clock: early frames are held until their
+    deadline, and a frame is dropped if the next one is already due when it becomes available.
+    Frames are written in place into one pre-allocated surface per clip size.
+    Returns (frame_onsets, dropped_frames, upload_stats, first_onset_ns); frame_onsets = [(frame_index, planned_onset_ms, actual_onset_ms), ...],
+    first_onset_ns = perf_counter_ns of the first frame on screen (None if no frame was shown)
+    """
+    frame_interval_ns = int(1_000_000_000 / decoder.fps)
+    frame_onsets = []
+    dropped_frames = 0
+    frame_index = 0
+    start_ns = None
+    first_onset_ns = None
+    upload_ns = []
+    frame_surface, surface_allocated = get_video_surface(decoder.size)
 
-def run_trials(phase):
+    while True:
+        frame = decoder.next_frame()
+        if frame is None:
+            break
+
+        if start_ns is None:
+            start_ns = time.perf_counter_ns()
+        planned_ns = start_ns + frame_index * frame_interval_ns
+
+        # Behind schedule: the next frame is already due -> drop this one
+        if time.perf_counter_ns() >= planned_ns + frame_interval_ns:
+            dropped_frames += 1
+            frame_index += 1
+            continue
+
+        # Write the frame into the reusable surface in place (no new Surface per frame)
+        upload_start_ns = time.perf_counter_ns()
+        pygame.surfarray.blit_array(frame_surface, frame.swapaxes(0, 1))
+        upload_ns.append(time.perf_counter_ns() - upload_start_ns)
+
+        screen.fill(GRAY_RGB)
+        img_rect = frame_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+        screen.blit(frame_surface, img_rect)
+
+        # Ahead of schedule: hold the frame until its deadline (sleep, then spin for the last 2 ms)
+        remaining_ns = planned_ns - time.perf_counter_ns()
+        if remaining_ns > 2_000_000:
+            time.sleep((remaining_ns - 2_000_000) / 1_000_000_000)
+        while time.perf_counter_ns() < planned_ns:
+            pass
+
+        pygame.display.flip()
+        actual_ns = time.perf_counter_ns()
+        if first_onset_ns is None:
+            first_onset_ns = actual_ns
+        frame_onsets.append((
+            frame_index,
+            round((planned_ns - start_ns) / 1_000_000, 3),
+            round((actual_ns - start_ns) / 1_000_000, 3),
+        ))
+        frame_index += 1
+
+    # Per-clip upload statistics: frame buffers + surfaces allocated, mean time to upload one frame
+    upload_stats = {
+        "allocations": decoder.allocations + int(surface_allocated),
+        "upload_ms_mean": round(sum(upload_ns) / len(upload_ns) / 1_000_000, 3) if upload_ns else "",
+    }
+
+    return frame_onsets, dropped_frames, upload_stats, first_onset_ns
+
+def get_response_overlay():
+    """Response page: D/K letters with their left/right labels on the gray background"""
+    spacing = 200  # Spacing between D and K
+    center_x = SCREEN_WIDTH // 2
+    letter_y = SCREEN_HEIGHT // 2 - 30
+    direction_y = letter_y + 50  # Direction labels below letters
+    return get_overlay((SCREEN_WIDTH, SCREEN_HEIGHT), (
+        ("D", 72, BLACK_RGB, (center_x - spacing, letter_y)),
+        ("K", 72, BLACK_RGB, (center_x + spacing, letter_y)),
+        ("left", 72, BLACK_RGB, (center_x - spacing, direction_y)),
+        ("right", 72, BLACK_RGB, (center_x + spacing, direction_y)),
+    ), background=GRAY_RGB)
+
+
+def read_trial_conditions(phase):
+    """Trial conditions of a block, in a random order (None if the condition file cannot be read)"""
     if MODE == "actual":
-        max_respond_time = ACTUAL_MAX_RESPOND_TIME
-        feedback_time = ACTUAL_FEEDBACK_TIME
         # For actual mode, use full test files for all 4 blocks
-        if phase == "demo":
-            suffix = "" if VERSION == 1 else "_flipped"
-        elif phase in ["test1", "test2", "test3", "test4"]:
-            suffix = "" if VERSION == 1 else "_flipped"
+        suffix = "" if VERSION == 1 else "_flipped"
+    elif phase == "demo":
+        suffix = "" if VERSION == 1 else "_flipped"
     else:
-        max_respond_time = TEST_MAX_RESPOND_TIME
-        feedback_time = TEST_FEEDBACK_TIME
-        if phase == "demo":
-            suffix = "" if VERSION == 1 else "_flipped"
-        elif phase in ["test1", "test2", "test3", "test4"]:
-            suffix = "_short" if VERSION == 1 else "_short_flipped"
+        suffix = "_short" if VERSION == 1 else "_short_flipped"
 
     condition_path = os.path.join(CONDITION_DIR, f"{phase}{suffix}.csv")
-    feedback_icons = FeedbackIcon()
 
     trial_conditions = []
     try:
@@ -261,150 +410,156 @@ def run_trials(phase):
                 })
     except Exception as e:
         print(f"Failed to read condition info for {phase}: {e}")
-        return
+        return None
 
     random.shuffle(trial_conditions)
+    return trial_conditions
+
+# Blocks prepared by the warm-up: phase -> (trial conditions, decoder of the first clip or None)
+prepared_blocks = {}
+
+def warm_up_block(phase):
+    """
+    Warm-up before a block (while its last instruction page is up): read the conditions and start decoding
+    the first clip, load the fonts, render the response page, feedback and video surface offscreen,
+    and open the results files
+    """
+    def video():
+        trial_conditions = read_trial_conditions(phase)
+        decoder = None
+        if trial_conditions:
+            video_path = resolve_video_path(trial_conditions[0]["stimuli_path"])
+            if os.path.exists(video_path) or frame_store.has(video_path):
+                decoder = open_video(video_path)
+        prepared_blocks[phase] = (trial_conditions, decoder)
+
+    def fonts():
+        get_response_overlay()
+        render_text("Too Slow", 48, YELLOW_RGB)
+
+    def render():
+        _, decoder = prepared_blocks.get(phase, (None, None))
+        surfaces = [get_response_overlay(), render_text("Too Slow", 48, YELLOW_RGB)]
+        if decoder is not None:
+            frame_surface, _ = get_video_surface(decoder.size)
+            # surfarray round trip: the upload path used for every frame
+            pygame.surfarray.blit_array(frame_surface, pygame.surfarray.array3d(frame_surface))
+            surfaces.append(frame_surface)
+        render_offscreen(screen, surfaces, GRAY_RGB)
+
+    def results_file():
+        results_writer.open(get_results_path(), RESULTS_HEADER)
+        results_writer.open(get_frame_timing_path(), FRAME_TIMING_HEADER, task=FRAME_TIMING_TASK)
+
+    warm_up.run(phase, [("video", video), ("fonts", fonts), ("render", render), ("results_file", results_file)])
+
+
+def run_trials(phase):
+    if MODE == "actual":
+        max_respond_time = ACTUAL_MAX_RESPOND_TIME
+        feedback_time = ACTUAL_FEEDBACK_TIME
+    else:
+        max_respond_time = TEST_MAX_RESPOND_TIME
+        feedback_time = TEST_FEEDBACK_TIME
+
+    feedback_icons = FeedbackIcon()
+
+    # Conditions and first decoder from the warm-up (read now if the block was not warmed up)
+    trial_conditions, first_decoder = prepared_blocks.pop(phase, (None, None))
+    if trial_conditions is None:
+        trial_conditions = read_trial_conditions(phase)
+        if trial_conditions is None:
+            return
     record = []
 
+    # Decoders started ahead of time (trial index -> VideoDecoder)
+    prefetched = {0: first_decoder} if first_decoder is not None else {}
+
     for idx, cond in enumerate(trial_conditions):
-        # Fix relative path to be absolute
-        video_path = cond["stimuli_path"]
-        if video_path.startswith("./"):
-            video_path = os.path.join(SCRIPT_DIR, video_path[2:])  # Remove "./" and make absolute
+        video_path = resolve_video_path(cond["stimuli_path"])
         
-        if not os.path.exists(video_path):
+        if not os.path.exists(video_path) and not frame_store.has(video_path):
             print(f"Video file not found: {video_path}")
             continue
 
-        # -------- Phase 1: Play full video --------
-        cap = cv2.VideoCapture(video_path)
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            frame = cv2.resize(frame, (850, 475))
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frame_surface = pygame.surfarray.make_surface(frame.swapaxes(0, 1))
+        gc_quiet.begin()
+        trial_start_ns = time.perf_counter_ns()
 
-            screen.fill(GRAY_RGB)
-            img_rect = frame_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-            screen.blit(frame_surface, img_rect)
-            pygame.display.flip()
-            pygame.time.delay(30)
-        cap.release()
+        # -------- Phase 1: Play full video --------
+        # Frames come from the memory-mapped frame store, or are decoded on a background thread; this loop only blits them
+        decoder = prefetched.pop(idx, None) or open_video(video_path)
+        frame_onsets, dropped_frames, upload_stats, first_onset_ns = play_video(decoder)
+        decoder.stop()
+        if first_onset_ns is not None:
+            # Onset latency: from the start of the trial to the first frame on screen
+            warm_up.onset((first_onset_ns - trial_start_ns) / 1_000_000)
+
+        # Start decoding the next trial's clip while the response page is up
+        if idx + 1 < len(trial_conditions):
+            next_video_path = resolve_video_path(trial_conditions[idx + 1]["stimuli_path"])
+            if os.path.exists(next_video_path) or frame_store.has(next_video_path):
+                prefetched[idx + 1] = open_video(next_video_path)
 
         # -------- Fixation delay before response page --------
         pygame.time.delay(FIXATION_CROSS)
 
         # -------- Phase 2: Show response page --------
-        # Clear cache but preserve ESC events to avoid key leak
-        escape_events = []
-        for event in pygame.event.get():
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                escape_events.append(event)
-        
-        # Re-post any ESC events that were in the queue
-        for event in escape_events:
-            pygame.event.post(event)
-            
         responded = False
         correct = False
         key_response = None
-        respond_start = pygame.time.get_ticks()
 
-        while not responded and (pygame.time.get_ticks() - respond_start < max_respond_time):
-            screen.fill(GRAY_RGB)
-
-            # Render D/K options
-            label_font = pygame.font.SysFont(None, 72)  # Same font size for both letters and direction labels
-            
-            # Render letters
-            text_d = label_font.render("D", True, BLACK_RGB)
-            text_k = label_font.render("K", True, BLACK_RGB)
-            
-            # Render direction labels without parentheses and in lowercase
-            text_left = label_font.render("left", True, BLACK_RGB)
-            text_right = label_font.render("right", True, BLACK_RGB)
-            
-            # Position letters closer together and more centered
-            spacing = 200  # Increased spacing between D and K
-            center_x = SCREEN_WIDTH // 2
-            d_x = center_x - spacing - text_d.get_width() // 2
-            k_x = center_x + spacing - text_k.get_width() // 2
-            letter_y = SCREEN_HEIGHT // 2 - 30
-            
-            # Position direction labels below letters
-            left_x = center_x - spacing - text_left.get_width() // 2
-            right_x = center_x + spacing - text_right.get_width() // 2
-            direction_y = letter_y + 50
-            
-            # Draw everything
-            screen.blit(text_d, (d_x, letter_y))
-            screen.blit(text_k, (k_x, letter_y))
-            screen.blit(text_left, (left_x, direction_y))
-            screen.blit(text_right, (right_x, direction_y))
+        with input_capture:
+            # Drop keys pressed during the video, but keep ESC presses (fullscreen toggle) to avoid key leak
+            input_capture.poll()
+            input_capture.keep(lambda record: record.key == pygame.K_ESCAPE and record.action == KEY_DOWN)
 
+            # D/K response mapping, pre-rendered once per screen size
+            screen.blit(get_response_overlay(), (0, 0))
             pygame.display.flip()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
+            respond_start_ns = time.perf_counter_ns()
+            respond_end_ns = respond_start_ns + max_respond_time * 1_000_000
+            response_ns = None
+
+            # Key presses are timestamped when they are taken off the SDL queue (every POLL_INTERVAL_S)
+            while not responded and time.perf_counter_ns() < respond_end_ns:
+                input_capture.poll()
+                if input_capture.quit_requested:
                     pygame.quit()
                     sys.exit()
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
+                for record in input_capture.events():
+                    if record.action != KEY_DOWN or responded:
+                        continue
+                    if record.key == pygame.K_ESCAPE:
                         toggle_fullscreen()
-                    elif event.key == pygame.K_d:
+                        screen.blit(get_response_overlay(), (0, 0))
+                        pygame.display.flip()
+                    elif record.key == pygame.K_d:
                         key_response = "d"
                         responded = True
                         correct = (cond["key_correct"] == "d")
-                    elif event.key == pygame.K_k:
+                        response_ns = record.ns
+                    elif record.key == pygame.K_k:
                         key_response = "k"
                         responded = True
                         correct = (cond["key_correct"] == "k")
-            pygame.time.delay(10)
+                        response_ns = record.ns
+                time.sleep(POLL_INTERVAL_S)
 
-        reaction_time = pygame.time.get_ticks() - respond_start
+        if response_ns is None:
+            response_ns = time.perf_counter_ns()
+        reaction_time = round((response_ns - respond_start_ns) / 1_000_000, 3)
 
         # -------- Phase 3: Show feedback --------
         if phase == "demo":
             # Show feedback on the same screen as D/K mapping
-            screen.fill(GRAY_RGB)
-            
-            # Render D/K options (same as response phase)
-            label_font = pygame.font.SysFont(None, 72)
-            
-            # Render letters
-            text_d = label_font.render("D", True, BLACK_RGB)
-            text_k = label_font.render("K", True, BLACK_RGB)
-            
-            # Render direction labels without parentheses and in lowercase
-            text_left = label_font.render("left", True, BLACK_RGB)
-            text_right = label_font.render("right", True, BLACK_RGB)
-            
-            # Position letters
-            spacing = 200
+            screen.blit(get_response_overlay(), (0, 0))
             center_x = SCREEN_WIDTH // 2
-            d_x = center_x - spacing - text_d.get_width() // 2
-            k_x = center_x + spacing - text_k.get_width() // 2
-            letter_y = SCREEN_HEIGHT // 2 - 30
-            
-            # Position direction labels below letters
-            left_x = center_x - spacing - text_left.get_width() // 2
-            right_x = center_x + spacing - text_right.get_width() // 2
-            direction_y = letter_y + 50
-            
-            # Draw D/K mapping
-            screen.blit(text_d, (d_x, letter_y))
-            screen.blit(text_k, (k_x, letter_y))
-            screen.blit(text_left, (left_x, direction_y))
-            screen.blit(text_right, (right_x, direction_y))
+            direction_y = SCREEN_HEIGHT // 2 + 20  # Row of the left/right labels
             
             # Add feedback icon/text below the mapping
             if not responded:
                 # Show "Too Slow" text in yellow like cognitive control
-                feedback_font = pygame.font.SysFont(None, 48)
-                feedback_text = feedback_font.render("Too Slow", True, YELLOW_RGB)
+                feedback_text = render_text("Too Slow", 48, YELLOW_RGB)
                 feedback_y = direction_y + 80
                 feedback_rect = feedback_text.get_rect(center=(center_x, feedback_y))
                 screen.blit(feedback_text, feedback_rect)
@@ -422,6 +577,8 @@ def run_trials(phase):
             pygame.display.flip()
             pygame.time.delay(feedback_time)
 
+        gc_quiet.release()  # collect between trials, before saving
+
         # -------- Record result --------
         trial_data = {
             "item_number": idx + 1,
@@ -435,6 +592,13 @@ def run_trials(phase):
             "key_response": key_response,
             "correct": int(correct),
             "reaction_time": reaction_time,
+            "onset_ns": respond_start_ns,
+            "response_ns": response_ns if responded else None,
+            "video_fps": round(decoder.fps, 3),
+            "video_frames_shown": len(frame_onsets),
+            "video_frames_dropped": dropped_frames,
+            "video_frame_allocations": upload_stats["allocations"],
+            "video_upload_ms_mean": upload_stats["upload_ms_mean"],
         }
         
         # Add to phase data (for backward compatibility)
@@ -442,9 +606,14 @@ def run_trials(phase):
         
         # Save immediately to CSV (like cognitive control)
         save_single_trial(trial_data, phase)
+        save_frame_timing(trial_data, phase, frame_onsets)
         
         record.append(correct)
 
+    # One database transaction for the rows of the block (--results-db)
+    results_writer.end_block()
+    print(f"Garbage collection pauses for {phase}: {gc_quiet.report()}")
+    print(f"Onset latency, first trial vs steady state, for {phase}: {warm_up.report()}")
     return record
 
 def show_results(phase, result):
@@ -473,7 +642,10 @@ def show_results(phase, result):
 
     waiting = True
     while waiting:
-        for event in pygame.event.get():
+        # Nothing changes on this page: sleep until the next key press
+        with idle_screen.measure("results"):
+            events = idle_screen.wait()
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
@@ -514,21 +686,43 @@ def get_unique_filename(base_filename):
         
         version += 1
 
-def save_single_trial(trial_data, phase):
-    """Save a single trial result immediately to CSV"""
+def get_results_path():
+    """Path of this session's results file (the versioned name is chosen on first use)"""
     global unique_filename
     
     if not os.path.exists(RESULT_DIR):
         os.makedirs(RESULT_DIR)
     
-    # Initialize unique filename on first trial if not already set
+    # Initialize unique filename on first use if not already set
     if unique_filename is None:
         base_filename = f"{participant_info}_SOC_results.csv"
         unique_filename = get_unique_filename(base_filename)
     
     # Use the globally tracked unique filename
-    filepath = os.path.join(RESULT_DIR, unique_filename)
-    
+    return os.path.join(RESULT_DIR, unique_filename)
+
+def get_frame_timing_path():
+    """Path of the frame timing side file ([unique results filename]_frame_timing.csv)"""
+    name_part, ext = os.path.splitext(os.path.basename(get_results_path()))
+    return os.path.join(RESULT_DIR, f"{name_part}_frame_timing{ext}")
+
+RESULTS_HEADER = [
+    "participant_id", "version", "item_number", "block", "type", "player_name", "miss_goal", "left_right",
+    "condition", "difficulty", "stimuli_path", "key_correct", "key_response",
+    "correct", "reaction_time_ms", "start_time", "end_time", "break_duration_ms",
+    "video_fps", "video_frames_shown", "video_frames_dropped",
+    "video_frame_allocations", "video_upload_ms_mean"
+] + SESSION_COLUMNS + REALTIME_COLUMNS
+
+# Table of the frame timing side file in the results database (--results-db)
+FRAME_TIMING_TASK = "SOC_frame_timing"
+FRAME_TIMING_HEADER = [
+    "participant_id", "version", "phase", "item_number", "stimuli_path",
+    "frame_index", "planned_onset_ms", "actual_onset_ms"
+]
+
+def save_single_trial(trial_data, phase):
+    """Save a single trial result immediately to CSV (queued for the results writer thread)"""
     # Determine block and type values following cognitive control pattern
     if phase == "demo":
         block = "practice"
@@ -546,53 +740,61 @@ def save_single_trial(trial_data, phase):
         block = "block4"
         type_value = "test"
     
-    # Check if file exists to determine if we need to write header
-    file_exists = os.path.exists(filepath)
-    
-    with open(filepath, "a", newline="") as f:
-        writer = csv.writer(f)
-        
-        # Write header if file doesn't exist
-        if not file_exists:
-            writer.writerow([
-                "participant_id", "version", "item_number", "block", "type", "player_name", "miss_goal", "left_right",
-                "condition", "difficulty", "stimuli_path", "key_correct", "key_response",
-                "correct", "reaction_time_ms", "start_time", "end_time", "break_duration_ms"
-            ])
-        
-        # Write trial data
-        writer.writerow([
+    # Trial data (the header is written first if the file is empty)
+    results_writer.write(get_results_path(), [[
+        participant_info,
+        VERSION,
+        trial_data["item_number"],
+        block,
+        type_value,
+        trial_data["player_name"],
+        trial_data["miss_goal"],
+        trial_data["left_right"],
+        trial_data["condition"],
+        trial_data["difficulty"],
+        trial_data["stimuli_path"],
+        trial_data["key_correct"],
+        trial_data["key_response"],
+        trial_data["correct"],
+        trial_data["reaction_time"],
+        time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(global_start_time)),
+        time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(global_end_time)) if global_end_time else "",
+        break_duration_ms,
+        trial_data["video_fps"],
+        trial_data["video_frames_shown"],
+        trial_data["video_frames_dropped"],
+        trial_data["video_frame_allocations"],
+        trial_data["video_upload_ms_mean"]
+    ] + session_clock.columns(trial_data["onset_ns"], trial_data["response_ns"]) + realtime_columns()],
+        header=RESULTS_HEADER)
+
+def save_frame_timing(trial_data, phase, frame_onsets):
+    """
+    Append the planned vs. actual onset of every presented frame of one trial to a side file
+    ([unique results filename]_frame_timing.csv, next to the results file)
+    """
+    results_writer.write(get_frame_timing_path(), [
+        [
             participant_info,
             VERSION,
+            phase,
             trial_data["item_number"],
-            block,
-            type_value,
-            trial_data["player_name"],
-            trial_data["miss_goal"],
-            trial_data["left_right"],
-            trial_data["condition"],
-            trial_data["difficulty"],
             trial_data["stimuli_path"],
-            trial_data["key_correct"],
-            trial_data["key_response"],
-            trial_data["correct"],
-            trial_data["reaction_time"],
-            time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(global_start_time)),
-            time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(global_end_time)) if global_end_time else "",
-            break_duration_ms
-        ])
+            frame_index,
+            planned_onset_ms,
+            actual_onset_ms
+        ]
+        for frame_index, planned_onset_ms, actual_onset_ms in frame_onsets
+    ], header=FRAME_TIMING_HEADER, task=FRAME_TIMING_TASK)
 
 def save_all_results():
     """Save all results to single file (backward compatibility function)"""
-    global unique_filename
-    
-    if not os.path.exists(RESULT_DIR):
-        os.makedirs(RESULT_DIR)
-
     # Use the same unique filename that was established during trials
-    if unique_filename is None:
-        base_filename = f"{participant_info}_SOC_results.csv"
-        unique_filename = get_unique_filename(base_filename)
+    get_results_path()
+
+    # The file is rewritten below: write the queued rows and close the per-trial append handles first
+    results_writer.close()
+    print(f"Results writer (queue depth, write latency): {results_writer.report()}")
 
     # Save all phases including the 4 test blocks for actual mode
     if MODE == "actual":
@@ -606,11 +808,7 @@ def save_result_csv(phases, filename):
 
     with open(filepath, "w", newline="") as f:
         writer = csv.writer(f)
-        writer.writerow([
-            "participant_id", "version", "item_number", "block", "type", "player_name", "miss_goal", "left_right",
-            "condition", "difficulty", "stimuli_path", "key_correct", "key_response",
-            "correct", "reaction_time_ms", "start_time", "end_time", "break_duration_ms"
-        ])
+        writer.writerow(RESULTS_HEADER)
 
         for phase in phases:
             # Determine block and type values following cognitive control pattern
@@ -649,10 +847,34 @@ def save_result_csv(phases, filename):
                     trial["reaction_time"],
                     time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(global_start_time)),
                     time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(global_end_time)),
-                    break_duration_ms
-                ])
+                    break_duration_ms,
+                    trial["video_fps"],
+                    trial["video_frames_shown"],
+                    trial["video_frames_dropped"],
+                    trial["video_frame_allocations"],
+                    trial["video_upload_ms_mean"]
+                ] + session_clock.columns(trial["onset_ns"], trial["response_ns"]) + realtime_columns())
             cumulative_id += len(phase_data[phase])
 
+# Pre-decoded video frames (build with build_frame_store.py; clips not in the store fall back to cv2)
+frame_store = FrameStore()
+
+# Timestamped key input for the response pages
+input_capture = InputCapture()
+
+# No garbage collection from video onset to the end of the feedback (collected between trials instead)
+gc_quiet = GCQuiet()
+
+# Warm-up before each block, and first-trial vs steady-state onset latency
+warm_up = WarmUp()
+
+# Results rows are written on a background thread (no disk latency in the trial loop),
+# and also to a SQLite database with the launch option --results-db [PATH]
+results_writer = ResultsWriter(store=open_store("SOC", os.path.join(SCRIPT_DIR, "results")))
+
+# Participant ID, instruction and result screens sleep until there is input (CPU usage per screen type)
+idle_screen = IdleScreen()
+
 # Initialize default values first
 VERSION = 1
 INSTRUCTION_DIR = os.path.join(SCRIPT_DIR, "stimuli", "instructions")
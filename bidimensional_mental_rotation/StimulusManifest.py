@@ -0,0 +1,132 @@
+import os
+import csv
+
+import pygame
+
+# Display size of the stimulus images (width, height)
+STIMULUS_SIZE = (200, 200)
+
+
+class StimulusManifest:
+    def __init__(self, condition_dir, script_dir, condition_filenames, size=STIMULUS_SIZE):
+        """
+        Resolve every condition row of the session to its image file once at startup, and
+        pre-decode / pre-scale all images to display-ready surfaces, so a trial only needs a
+        dict lookup and a blit.
+        Missing condition files and images are collected in self.missing (see report()).
+        :param condition_dir: Folder holding the condition CSVs
+        :param script_dir: Task folder the CSV stimuli paths are relative to
+        :param condition_filenames: Condition CSVs used in this session
+        :param size: Display size (width, height) of the stimulus images
+        """
+        self.size = size
+        self.conditions = {}      # condition filename -> list of condition rows (with "image_path")
+        self.images = {}          # resolved image path -> Surface
+        self.missing = []         # (condition filename, stimuli path) that could not be resolved / loaded
+        self._directories = {}    # image folder -> {number prefix: file name}
+
+        for condition_filename in condition_filenames:
+            if condition_filename in self.conditions:
+                continue
+            condition_path = os.path.join(condition_dir, condition_filename)
+            try:
+                self.conditions[condition_filename] = self._read_conditions(condition_path, script_dir)
+            except Exception as e:
+                print(f"Failed to read condition info from {condition_path}: {e}")
+                self.missing.append((condition_filename, condition_path))
+                continue
+
+            for row in self.conditions[condition_filename]:
+                if row["image_path"] is None:
+                    self.missing.append((condition_filename, row["stimuli_path"]))
+                elif row["image_path"] not in self.images:
+                    try:
+                        self.images[row["image_path"]] = self._load(row["image_path"])
+                    except Exception as e:
+                        print(f"Error loading image {row['image_path']}: {e}")
+                        self.missing.append((condition_filename, row["stimuli_path"]))
+
+    def _read_conditions(self, condition_path, script_dir):
+        trial_conditions = []
+        with open(condition_path, "r") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                # Convert relative path to absolute path
+                stimuli_relative_path = row["stimuli_path"]
+                if stimuli_relative_path.startswith("./"):
+                    stimuli_relative_path = stimuli_relative_path[2:]  # Remove "./"
+                stimuli_absolute_path = os.path.join(script_dir, stimuli_relative_path)
+
+                trial_conditions.append({
+                    "letter_name": row["letter_name"],
+                    "rotation_angle": row["rotation_angle"],
+                    "mirrored": row["mirrored"],
+                    "condition": row["condition"],
+                    "difficulty": row["difficulty"],
+                    "stimuli_path": stimuli_absolute_path,
+                    "image_path": self._resolve(stimuli_absolute_path),
+                    "key_correct": row["key_correct"]
+                })
+        return trial_conditions
+
+    def _index_directory(self, image_dir):
+        """List an image folder once: number prefix ("01") -> first matching "01_*.png" file"""
+        index = {}
+        if os.path.isdir(image_dir):
+            for filename in sorted(os.listdir(image_dir)):
+                number, sep, _ = filename.partition("_")
+                if sep and filename.endswith(".png") and number not in index:
+                    index[number] = filename
+        return index
+
+    def _resolve(self, csv_path):
+        """
+        Find the actual image file that corresponds to the CSV path
+        (e.g. ".../1.png" -> ".../01_<name>.png"), or the CSV path itself if that file exists.
+        Returns None if neither exists.
+        """
+        image_dir = os.path.dirname(csv_path)
+        if image_dir not in self._directories:
+            self._directories[image_dir] = self._index_directory(image_dir)
+
+        # Extract the number from the CSV path and format it with a leading zero if needed
+        number = os.path.basename(csv_path).split('.')[0]
+        if len(number) == 1:
+            number = "0" + number
+
+        filename = self._directories[image_dir].get(number)
+        if filename is not None:
+            return os.path.join(image_dir, filename)
+        if os.path.exists(csv_path):
+            return csv_path
+        return None
+
+    def _load(self, path):
+        """Decode, scale and convert one image to the display pixel format"""
+        image = pygame.image.load(path)
+        image = pygame.transform.scale(image, self.size)
+        if image.get_flags() & pygame.SRCALPHA:
+            return image.convert_alpha()
+        return image.convert()
+
+    def get_conditions(self, condition_filename):
+        """Return a copy of the condition rows of one CSV (None if it could not be read)"""
+        rows = self.conditions.get(condition_filename)
+        if rows is None:
+            return None
+        return [dict(row) for row in rows]
+
+    def get_image(self, cond):
+        """Return the pre-scaled surface of a condition row (None if its image is missing)"""
+        return self.images.get(cond["image_path"])
+
+    def report(self):
+        """Print every missing file at once (call before the session starts)"""
+        rows = sum(len(rows) for rows in self.conditions.values())
+        print(f"Stimulus manifest: {len(self.conditions)} condition files, {rows} rows, "
+              f"{len(self.images)} images at {self.size[0]}x{self.size[1]}")
+        if self.missing:
+            print(f"Warning: {len(self.missing)} stimulus files are missing (those trials will be skipped):")
+            for condition_filename, path in self.missing:
+                print(f"  [{condition_filename}] {path}")
+        return not self.missing
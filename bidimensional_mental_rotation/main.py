@@ -5,33 +5,20 @@ import csv
 import time
 import random
 import pygame.event
-import glob
 
 from Instruction import Instruction
 from FeedbackIcon import FeedbackIcon
-
-def find_image_file(csv_path):
-    """Find the actual image file that corresponds to the CSV path"""
-    # Extract the number from the CSV path (e.g., "1.png" -> "01")
-    filename = os.path.basename(csv_path)
-    number = filename.split('.')[0]
-    
-    # Format the number with leading zero if needed
-    if len(number) == 1:
-        number = "0" + number
-    
-    # Get the directory where the actual images are
-    csv_dir = os.path.dirname(csv_path)
-    
-    # Search for files that start with this number
-    pattern = os.path.join(csv_dir, "{}_*.png".format(number))
-    matching_files = glob.glob(pattern)
-    
-    if matching_files:
-        return matching_files[0]  # Return the first match
-    else:
-        print("No matching file found for {}".format(csv_path))
-        return csv_path  # Return original path as fallback
+from StimulusManifest import StimulusManifest
+from InstructionPager import InstructionPager
+from TextCache import render_text, get_overlay
+from PresentationScheduler import PresentationScheduler
+from SessionClock import SessionClock, SESSION_COLUMNS
+from GCQuiet import GCQuiet
+from RealtimeMode import apply_launch_options, REALTIME_COLUMNS, realtime_columns
+from WarmUp import WarmUp, render_offscreen
+from IdleScreen import IdleScreen, IDLE_TIMEOUT_MS
+from ResultsWriter import ResultsWriter
+from SessionStore import open_store
 
 # Meta-parameters
 # MODE = "test"
@@ -73,8 +60,13 @@ TRANSITION3_PAGE1 = 18  # First transition screen (copy of 12)
 TRANSITION3_PAGE2 = 19  # Second transition screen (copy of 13)
 TRANSITION3_PAGE3 = 20  # Third transition screen (copy of 14)
 FINAL_PAGE = 21  # Final screen (21.png) - shows after all blocks are completed
+# Block started by SPACE on the page before it (the warm-up runs while that page is up)
+BLOCK_PAGES = {DEMO_PAGE: "demo", TEST1_PAGE: "test1", TRANSITION1_PAGE3: "test2",
+               TRANSITION2_PAGE3: "test3", TRANSITION3_PAGE3: "test4"}
 
 global_start_time = None
+# Session timebase (wall-clock anchor + perf_counter_ns origin) for the onset/response columns
+session_clock = SessionClock()
 global_end_time = None
 break1_start_time = None
 break1_end_time = None
@@ -105,6 +97,9 @@ trial_counters = {
     "test4": 0    # Block B (repeat)
 }
 
+# Real-time process mode (launch option --realtime [--cpu N]); before pygame.init() so its threads inherit it
+apply_launch_options()
+
 # Initialize pygame
 pygame.init()
 
@@ -141,6 +136,20 @@ SCREEN_HEIGHT = screen_info.current_h
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN)
 pygame.display.set_caption("Mental Rotation Test")
 
+# Presents the trial screens at absolute onset deadlines
+scheduler = PresentationScheduler()
+# No garbage collection from fixation to the ISI (collected during the ISI instead)
+gc_quiet = GCQuiet()
+# Warm-up before each block, and first-trial vs steady-state onset latency
+warm_up = WarmUp()
+
+# Results rows are written on a background thread (no disk latency in the trial loop),
+# and also to a SQLite database with the launch option --results-db [PATH]
+results_writer = ResultsWriter(store=open_store("2D", os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")))
+
+# Participant ID, instruction and result screens sleep until there is input (CPU usage per screen type)
+idle_screen = IdleScreen()
+
 # Fonts
 font_large = pygame.font.SysFont(None, 72)
 font_medium = pygame.font.SysFont(None, 48)
@@ -152,8 +161,22 @@ def get_participant_id(screen):
     input_text = ""
     active = True
 
+    changed = True
     while active:
-        for event in pygame.event.get():
+        # Redraw only after input, and sleep until the next event
+        with idle_screen.measure("participant_id"):
+            if idle_screen.redraw(changed):
+                screen.fill(GRAY_RGB)
+                prompt = font_medium.render("Enter Participant ID (press enter when completed):", True, BLACK_RGB)
+                text_surface = font_medium.render(input_text, True, BLACK_RGB)
+                screen.blit(prompt, (SCREEN_WIDTH // 2 - prompt.get_width() // 2, SCREEN_HEIGHT // 2 - 100))
+                screen.blit(text_surface, (SCREEN_WIDTH // 2 - text_surface.get_width() // 2, SCREEN_HEIGHT // 2))
+                pygame.display.flip()
+                changed = False
+            events = idle_screen.wait()
+
+        for event in events:
+            changed = True
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
@@ -169,33 +192,31 @@ def get_participant_id(screen):
                 else:
                     input_text += event.unicode
 
-        screen.fill(GRAY_RGB)
-        prompt = font_medium.render("Enter Participant ID (press enter when completed):", True, BLACK_RGB)
-        text_surface = font_medium.render(input_text, True, BLACK_RGB)
-        screen.blit(prompt, (SCREEN_WIDTH // 2 - prompt.get_width() // 2, SCREEN_HEIGHT // 2 - 100))
-        screen.blit(text_surface, (SCREEN_WIDTH // 2 - text_surface.get_width() // 2, SCREEN_HEIGHT // 2))
-        pygame.display.flip()
-
     pygame.event.clear()
     return input_text
 
 
 def load_instructions():
-    instruction_objects = []
-    for i in range(1, TOTAL_INSTRUCTION_PAGES + 1):
-        img_path = os.path.join(INSTRUCTION_DIR, f"{i}.png")
-        instruction_objects.append(Instruction(img_path))
+    # Pages are decoded and scaled in the background a few pages ahead of the one on screen
+    instruction_pages = InstructionPager(
+        [os.path.join(INSTRUCTION_DIR, f"{i}.png") for i in range(1, TOTAL_INSTRUCTION_PAGES + 1)],
+        lambda img_path: Instruction(img_path).image)
+    instruction_pages.prefetch(0)
 
     instruction_index = 0
     instruction_locked = True
     unlock_timer = pygame.time.get_ticks()
     READ_TIME = ACTUAL_READ_TIME if MODE == "actual" else TEST_READ_TIME
+    warmed_up_page = None
 
+    events = []
+    changed = True
     running = True
     while running:
         current_time = pygame.time.get_ticks()
 
-        for event in pygame.event.get():
+        changed = changed or bool(events)
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
@@ -268,21 +289,56 @@ def load_instructions():
         if current_time - unlock_timer >= READ_TIME:
             instruction_locked = False
 
-        screen.fill(GRAY_RGB)
-        if instruction_index < TOTAL_INSTRUCTION_PAGES:
-            img = instruction_objects[instruction_index].image
-            if img:
-                img_rect = img.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-                screen.blit(img, img_rect)
-                pygame.display.flip()
-            else:
-                print(f"No image available for instruction {instruction_index + 1}")
-                # Show error message on screen
-                error_text = font_medium.render(f"Instruction {instruction_index + 1} not available", True, WHITE_RGB)
-                screen.blit(error_text, (SCREEN_WIDTH // 2 - error_text.get_width() // 2, SCREEN_HEIGHT // 2))
-                pygame.display.flip()
-
-def run_trials(phase):
+        # Redraw only when the page changed (page turn, block, fullscreen toggle)
+        with idle_screen.measure("instructions"):
+            if idle_screen.redraw(changed):
+                changed = False
+                screen.fill(GRAY_RGB)
+                if instruction_index < TOTAL_INSTRUCTION_PAGES:
+                    img = instruction_pages.get(instruction_index)
+                    if img:
+                        img_rect = img.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+                        screen.blit(img, img_rect)
+                        pygame.display.flip()
+                    else:
+                        print(f"No image available for instruction {instruction_index + 1}")
+                        # Show error message on screen
+                        error_text = font_medium.render(f"Instruction {instruction_index + 1} not available", True, WHITE_RGB)
+                        screen.blit(error_text, (SCREEN_WIDTH // 2 - error_text.get_width() // 2, SCREEN_HEIGHT // 2))
+                        pygame.display.flip()
+
+        if not running:
+            break
+
+        # Last page before a block: warm up while it is being read
+        next_phase = BLOCK_PAGES.get(instruction_index + 1)
+        if next_phase and warmed_up_page != instruction_index:
+            warm_up_block(next_phase)
+            warmed_up_page = instruction_index
+
+        # Sleep until the next key press, or until the reading time of the page is over
+        with idle_screen.measure("instructions"):
+            events = idle_screen.wait(unlock_timer + READ_TIME - pygame.time.get_ticks() if instruction_locked else IDLE_TIMEOUT_MS)
+
+    instruction_pages.close()
+    print(f"Instruction pages: {instruction_pages.stats()}")
+    print(f"CPU usage of the waiting screens: {idle_screen.report()}")
+
+
+def get_response_overlay():
+    """Response labels: D on the left, K on the right, each with its answer below"""
+    if VERSION == 1:
+        text_D_label, text_K_label = "normal", "mirrored"
+    else:
+        text_D_label, text_K_label = "mirrored", "normal"
+    return get_overlay((SCREEN_WIDTH, SCREEN_HEIGHT), (
+        ("D", 48, BLACK_RGB, (SCREEN_WIDTH // 2.8, SCREEN_HEIGHT // 2 + 150)),
+        (text_D_label, 48, BLACK_RGB, (SCREEN_WIDTH // 2.8, SCREEN_HEIGHT // 2 + 190)),
+        ("K", 48, BLACK_RGB, (1.8 * SCREEN_WIDTH // 2.8, SCREEN_HEIGHT // 2 + 150)),
+        (text_K_label, 48, BLACK_RGB, (1.8 * SCREEN_WIDTH // 2.8, SCREEN_HEIGHT // 2 + 190)),
+    ), background=GRAY_RGB)
+
+def get_condition_filename(phase):
     if MODE == "actual":
         if VERSION == 1:
             if phase == "demo":
@@ -313,54 +369,58 @@ def run_trials(phase):
                 condition_filename = "test_short_flipped.csv"  # Use test_short_flipped for blocks A
             else:  # test2, test4 - Block B (both first and repeat)
                 condition_filename = "test_short_flipped.csv"  # Use test_short_flipped for blocks B
+    return condition_filename
+
+def warm_up_block(phase):
+    """
+    Warm-up before a block (while its last instruction page is up): load the fonts, draw the fixation cross,
+    response labels and every image of the block offscreen, and open the results file
+    """
+    def fonts():
+        get_response_overlay()
+        render_text("Too Slow!", 48, YELLOW_RGB)
+
+    def render():
+        trial_conditions = stimulus_manifest.get_conditions(get_condition_filename(phase)) or []
+        images = [img for img in (stimulus_manifest.get_image(cond) for cond in trial_conditions) if img is not None]
+        canvas = render_offscreen(screen, [get_response_overlay(), render_text("Too Slow!", 48, YELLOW_RGB)] + images,
+                                  GRAY_RGB)
+        pygame.draw.line(canvas, BLACK_RGB, (SCREEN_WIDTH // 2 - 40, SCREEN_HEIGHT // 2),
+                         (SCREEN_WIDTH // 2 + 40, SCREEN_HEIGHT // 2), 6)
+        pygame.draw.line(canvas, BLACK_RGB, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 40),
+                         (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 40), 6)
 
-    condition_path = os.path.join(CONDITION_DIR, condition_filename)
+    def results_file():
+        initialize_results_file(phase)
+        results_writer.open(os.path.join(RESULT_DIR, results_filename), RESULTS_HEADER)
+
+    warm_up.run(phase, [("fonts", fonts), ("render", render), ("results_file", results_file)])
+
+def run_trials(phase):
+    condition_filename = get_condition_filename(phase)
     feedback_icons = FeedbackIcon()
 
     # Initialize the results file for this phase
     initialize_results_file(phase)
 
-    trial_conditions = []
-    try:
-        with open(condition_path, "r") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                # Convert relative path to absolute path
-                stimuli_relative_path = row["stimuli_path"]
-                if stimuli_relative_path.startswith("./"):
-                    # Remove "./" and join with script directory
-                    stimuli_relative_path = stimuli_relative_path[2:]  # Remove "./"
-                    stimuli_absolute_path = os.path.join(SCRIPT_DIR, stimuli_relative_path)
-                else:
-                    stimuli_absolute_path = os.path.join(SCRIPT_DIR, stimuli_relative_path)
-
-                trial_conditions.append({
-                    "letter_name": row["letter_name"],
-                    "rotation_angle": row["rotation_angle"],
-                    "mirrored": row["mirrored"],
-                    "condition": row["condition"],
-                    "difficulty": row["difficulty"],
-                    "stimuli_path": stimuli_absolute_path,
-                    "key_correct": row["key_correct"]
-                })
-    except Exception as e:
-        print(f"Failed to read condition info for {phase}: {e}")
+    # Condition rows and their images were resolved and loaded at startup (see StimulusManifest)
+    trial_conditions = stimulus_manifest.get_conditions(condition_filename)
+    if trial_conditions is None:
+        print(f"Failed to read condition info for {phase}: {condition_filename}")
         return None
 
     random.shuffle(trial_conditions)
     record = []
+    next_onset_ns = None  # Fixation onset deadline of the next trial (end of the previous ISI)
 
     for idx, cond in enumerate(trial_conditions):
-        # Find the actual image file
-        actual_image_path = find_image_file(cond["stimuli_path"])
-        
-        try:
-            img = pygame.image.load(actual_image_path)
-            img = pygame.transform.scale(img, (200, 200))
-        except Exception as e:
-            print(f"Error loading image {actual_image_path}: {e}")
+        img = stimulus_manifest.get_image(cond)
+        if img is None:
+            print(f"Missing image for {cond['stimuli_path']}")
             continue  # Skip this trial and continue with the next one
 
+        gc_quiet.begin()
+
         # 1. Show fixation cross for 250ms (using same style as cognitive_control)
         screen.fill(GRAY_RGB)  # Black background instead of gray
 
@@ -374,52 +434,33 @@ def run_trials(phase):
                          (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 40),
                          (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 40), 6)
 
-        pygame.display.flip()
-        pygame.time.delay(FIXATION_TIME)
+        fixation_onset_ns = scheduler.flip("fixation", next_onset_ns)
 
         # 2. Show stimulus until response (max 7500ms)
-        screen.fill(GRAY_RGB)
+        # Response labels on the gray background (pre-rendered once per screen size), then the stimulus
+        screen.blit(get_response_overlay(), (0, 0))
         img_rect = img.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
         screen.blit(img, img_rect)
-
-        label_font = pygame.font.SysFont(None, 48)
-        if VERSION == 1:
-            # Left side - D key
-            text_D = label_font.render("D", True, BLACK_RGB)
-            text_D_label = label_font.render("normal", True, BLACK_RGB)
-            # Right side - K key
-            text_K = label_font.render("K", True, BLACK_RGB)
-            text_K_label = label_font.render("mirrored", True, BLACK_RGB)
-        else:
-            # Left side - D key
-            text_D = label_font.render("D", True, BLACK_RGB)
-            text_D_label = label_font.render("mirrored", True, BLACK_RGB)
-            # Right side - K key
-            text_K = label_font.render("K", True, BLACK_RGB)
-            text_K_label = label_font.render("normal", True, BLACK_RGB)
-
-        # Position letters and labels - closer to the stimulus image
-        # Left side (D) - positioned closer to the stimulus
-        screen.blit(text_D, (SCREEN_WIDTH // 2.8 - text_D.get_width() // 2, SCREEN_HEIGHT // 2 + 150))
-        screen.blit(text_D_label, (SCREEN_WIDTH // 2.8 - text_D_label.get_width() // 2, SCREEN_HEIGHT // 2 + 190))
-        # Right side (K) - positioned closer to the stimulus
-        screen.blit(text_K, (1.8 * SCREEN_WIDTH // 2.8 - text_K.get_width() // 2, SCREEN_HEIGHT // 2 + 150))
-        screen.blit(text_K_label, (1.8 * SCREEN_WIDTH // 2.8 - text_K_label.get_width() // 2, SCREEN_HEIGHT // 2 + 190))
-        pygame.display.flip()
+        stimulus_planned_ns = fixation_onset_ns + scheduler.duration_ns(FIXATION_TIME)
+        stimulus_onset_ns = scheduler.flip("stimulus", stimulus_planned_ns)
+        warm_up.onset((stimulus_onset_ns - stimulus_planned_ns) / 1_000_000)
 
         pygame.event.clear()
-        trial_start = pygame.time.get_ticks()
         responded = False
         correct = False
         key_response = None
         key_locked = False
+        response_ns = None
 
         if MODE == "ACTUAL":
             max_respond_time = ACTUAL_MAX_RESPOND_TIME
         else:
             max_respond_time = TEST_MAX_RESPOND_TIME
 
-        while pygame.time.get_ticks() - trial_start < max_respond_time:
+        # The response window and reaction_time are measured from the stimulus flip, on the same
+        # clock as onset_ns / response_ns
+        response_deadline_ns = stimulus_onset_ns + max_respond_time * 1_000_000
+        while time.perf_counter_ns() < response_deadline_ns:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     pygame.quit()
@@ -434,15 +475,18 @@ def run_trials(phase):
                             key_response = "d"
                             correct = (cond["key_correct"] == "d")
                             key_locked = True
+                            response_ns = time.perf_counter_ns()
                         elif event.key == pygame.K_k:
                             responded = True
                             key_response = "k"
                             correct = (cond["key_correct"] == "k")
                             key_locked = True
+                            response_ns = time.perf_counter_ns()
             if responded:
                 break
 
-        reaction_time = pygame.time.get_ticks() - trial_start
+        # No response: the time the window stayed open
+        reaction_time = round(((response_ns or time.perf_counter_ns()) - stimulus_onset_ns) / 1_000_000, 3)
 
         # Create trial data (condition column is now correctly set in CSV files)
         trial_data = {
@@ -457,7 +501,9 @@ def run_trials(phase):
             "key_response": key_response,
             "correct": int(correct),
             "reaction_time": reaction_time,
-            "trial_end_time": time.time()  # Add end time for this trial
+            "trial_end_time": time.time(),  # Add end time for this trial
+            "onset_ns": stimulus_onset_ns,
+            "response_ns": response_ns
         }
 
         # Save trial immediately to CSV file
@@ -475,7 +521,7 @@ def run_trials(phase):
 
             if not responded:
                 # Show "Too Slow!" in yellow
-                feedback_text = font_medium.render("Too Slow!", True, YELLOW_RGB)  # Yellow color
+                feedback_text = render_text("Too Slow!", 48, YELLOW_RGB)  # Yellow color
                 feedback_rect = feedback_text.get_rect(center=(SCREEN_WIDTH // 2, feedback_y_position))
                 screen.blit(feedback_text, feedback_rect)
             else:
@@ -484,14 +530,25 @@ def run_trials(phase):
                 feedback_rect = feedback_img.get_rect(center=(SCREEN_WIDTH // 2, feedback_y_position))
                 screen.blit(feedback_img, feedback_rect)
 
-            pygame.display.flip()
-            pygame.time.delay(FEEDBACK_DURATION)  # 200ms additional feedback time
+            feedback_onset_ns = scheduler.flip("feedback")
+            isi_deadline_ns = feedback_onset_ns + scheduler.duration_ns(FEEDBACK_DURATION)  # 200ms additional feedback time
+        else:
+            isi_deadline_ns = None
 
         # 4. ISI - Blank black screen between trials (500ms)
         screen.fill(GRAY_RGB)
-        pygame.display.flip()
-        pygame.time.delay(ISI_TIME)  # 500ms blank screen using new ISI_TIME
-
+        isi_onset_ns = scheduler.flip("isi", isi_deadline_ns)
+        next_onset_ns = isi_onset_ns + scheduler.duration_ns(ISI_TIME)
+        gc_quiet.release()  # collect while the ISI is on screen
+
+    # Keep the last ISI on screen for its full duration
+    if next_onset_ns is not None:
+        scheduler.wait_until(next_onset_ns)
+    # One database transaction for the rows of the block (--results-db)
+    results_writer.end_block()
+    print(f"Screen onsets for {phase} (planned vs actual): {scheduler.report()}")
+    print(f"Garbage collection pauses for {phase}: {gc_quiet.report()}")
+    print(f"Onset latency, first trial vs steady state, for {phase}: {warm_up.report()}")
     return record
 
 def show_results(phase, result):
@@ -520,7 +577,10 @@ def show_results(phase, result):
 
     waiting = True
     while waiting:
-        for event in pygame.event.get():
+        # Nothing changes on this page: sleep until the next key press
+        with idle_screen.measure("results"):
+            events = idle_screen.wait()
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
@@ -532,6 +592,13 @@ def show_results(phase, result):
                     waiting = False
 
 
+# Columns of the results file
+RESULTS_HEADER = [
+    "participant_id", "version", "mode", "item_number", "block", "type", "letter_name", "rotation_angle", "mirrored",
+    "condition", "difficulty", "stimuli_path", "key_correct", "key_response",
+    "correct", "reaction_time_ms", "start_time", "end_time", "break_duration_ms"
+] + SESSION_COLUMNS + REALTIME_COLUMNS
+
 def initialize_results_file(phase):
     """Initialize CSV file with headers at the start of each phase"""
     global results_filename  # Make it global so save_trial_immediately can access it
@@ -559,11 +626,7 @@ def initialize_results_file(phase):
         # Create the new file with headers
         with open(filepath, "w", newline="") as f:
             writer = csv.writer(f)
-            writer.writerow([
-                "participant_id", "version", "mode", "item_number", "block", "type", "letter_name", "rotation_angle", "mirrored",
-                "condition", "difficulty", "stimuli_path", "key_correct", "key_response",
-                "correct", "reaction_time_ms", "start_time", "end_time", "break_duration_ms"
-            ])
+            writer.writerow(RESULTS_HEADER)
         print(f"✅ Initialized results file: {filename}")
     else:
         print(f"✅ Using existing results file: {results_filename}")
@@ -606,30 +669,29 @@ def save_trial_immediately(phase, trial_data):
 
     filepath = os.path.join(RESULT_DIR, results_filename)
 
-    # Append the trial data to the file
-    with open(filepath, "a", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow([
-            participant_id,
-            VERSION,
-            mode_value,
-            trial_data["item_number"] + cumulative_id,
-            block,
-            type_value,
-            trial_data["letter_name"],
-            trial_data["rotation_angle"],
-            trial_data["mirrored"],
-            trial_data["condition"],
-            trial_data["difficulty"],
-            trial_data["stimuli_path"],
-            trial_data["key_correct"],
-            trial_data["key_response"],
-            trial_data["correct"],
-            trial_data["reaction_time"],
-            time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(global_start_time)),
-            time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(trial_data["trial_end_time"])),
-            break_duration
-        ])
+    # Queue the trial data for the results writer thread (appends to the handle opened by the warm-up)
+    results_writer.write(filepath, [[
+        participant_id,
+        VERSION,
+        mode_value,
+        trial_data["item_number"] + cumulative_id,
+        block,
+        type_value,
+        trial_data["letter_name"],
+        trial_data["rotation_angle"],
+        trial_data["mirrored"],
+        trial_data["condition"],
+        trial_data["difficulty"],
+        trial_data["stimuli_path"],
+        trial_data["key_correct"],
+        trial_data["key_response"],
+        trial_data["correct"],
+        trial_data["reaction_time"],
+        time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(global_start_time)),
+        time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(trial_data["trial_end_time"])),
+        break_duration
+    ] + session_clock.columns(trial_data["onset_ns"], trial_data["response_ns"]) + realtime_columns()],
+        header=RESULTS_HEADER)
 
     # Increment the trial counter for this phase
     trial_counters[phase] += 1
@@ -657,7 +719,14 @@ except:
 RESULT_DIR = os.path.join(SCRIPT_DIR, "results")
 CONDITION_DIR = os.path.join(SCRIPT_DIR, "stimuli", "conditions")
 
+# Resolve and pre-load every stimulus of this session before it starts
+stimulus_manifest = StimulusManifest(CONDITION_DIR, SCRIPT_DIR,
+                                     [get_condition_filename(phase) for phase in phase_data])
+stimulus_manifest.report()
+
 load_instructions()
+results_writer.close()
+print(f"Results writer (queue depth, write latency): {results_writer.report()}")
 
 global_end_time = time.time()
 print("Task completed!")
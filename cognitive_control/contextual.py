@@ -4,7 +4,7 @@ from meta_parameters import *
 from generate_trials import *
 from feedback import *
 from framework import *
-from motor import key_logging, run_trials
+from motor import key_logging, run_trials, warm_up_block
 
 class Contextual:
     def __init__(self, screen, all_results, all_acc, version):
@@ -22,6 +22,29 @@ class Contextual:
 
         self.version = version
 
+        # Trials created by the warm-up on the page before their block (block name -> trials)
+        self.prepared_trials = {}
+
+    # Trials of a block: (number of actual trials, number of no-go trials, phase written to the results)
+    def create_block_trials(self, block):
+        num_actual, num_nogo, phase = {
+            "practice4_1": (PRACTICE4_1_NUM_ACTUAL, PRACTICE4_1_NUM_NOGO, "practice4_1"),
+            "practice4_2": (PRACTICE4_2_NUM_ACTUAL, PRACTICE4_2_NUM_NOGO, "practice4_2"),
+            "block5": (BLOCK5_NUM_ACTUAL, BLOCK5_NUM_NOGO, "block5"),
+            "block6": (BLOCK6_NUM_ACTUAL, BLOCK6_NUM_NOGO, "block5"),
+        }[block]
+        return create_contextual_trials(num_actual, num_nogo, phase, self.version)
+
+    def get_block_trials(self, block):
+        trials = self.prepared_trials.pop(block, None)
+        return trials if trials is not None else self.create_block_trials(block)
+
+    # Warm-up on the page before a block
+    def warm_up_for(self, task_func):
+        block = task_func.__name__
+        self.prepared_trials[block] = self.create_block_trials(block)
+        warm_up_block(self.screen, block, "contextual", [trial[0] for trial in self.prepared_trials[block]])
+
     # Read information from trials
     def read_contextual_trial(self, trial):
         print("CONTEXTUAL trial=", trial)
@@ -35,21 +58,21 @@ class Contextual:
         return fixation_time, stimulus_image, type, phase, key_correct
 
     def practice4_1(self, screen):
-        practice4_1_trials = create_contextual_trials(PRACTICE4_1_NUM_ACTUAL, PRACTICE4_1_NUM_NOGO, "practice4_1", self.version)
+        practice4_1_trials = self.get_block_trials("practice4_1")
         for trial in practice4_1_trials:
             print(trial)
         return run_trials(practice4_1_trials, C_RESPONSE_TIME, C_ISI_TIME, "contextual", self.read_contextual_trial, self.screen)
 
     def practice4_2(self, screen):
-        practice4_2_trials = create_contextual_trials(PRACTICE4_2_NUM_ACTUAL, PRACTICE4_2_NUM_NOGO, "practice4_2", self.version)
+        practice4_2_trials = self.get_block_trials("practice4_2")
         return run_trials(practice4_2_trials, C_RESPONSE_TIME, C_ISI_TIME, "contextual", self.read_contextual_trial, self.screen)
 
     def block5(self, screen):
-        block5_trials = create_contextual_trials(BLOCK5_NUM_ACTUAL, BLOCK5_NUM_NOGO, "block5", self.version)
+        block5_trials = self.get_block_trials("block5")
         return run_trials(block5_trials, C_RESPONSE_TIME, C_ISI_TIME, "contextual", self.read_contextual_trial, self.screen)
 
     def block6(self, screen):
-        block6_trials = create_contextual_trials(BLOCK6_NUM_ACTUAL, BLOCK6_NUM_NOGO, "block5", self.version)
+        block6_trials = self.get_block_trials("block6")
         return run_trials(block6_trials, C_RESPONSE_TIME, C_ISI_TIME, "contextual", self.read_contextual_trial, self.screen)
 
     # Segment 1 practice 4-1 + practice 4-2
@@ -70,7 +93,8 @@ class Contextual:
             else:
                 next_segment_func()
 
-        run_instruction_sequence(self.screen, instruction_flow, self.all_results, self.all_acc, after_c_segment1)
+        run_instruction_sequence(self.screen, instruction_flow, self.all_results, self.all_acc, after_c_segment1,
+                                 warm_up=self.warm_up_for)
 
     # Segment 2: repeat practice 4-1 + practice 4-2 (if not pass accuracy requirements)
     def run_c_segment2(self, next_segment_func, repeat_count=1):
@@ -90,7 +114,8 @@ class Contextual:
             else:
                 next_segment_func()
 
-        run_instruction_sequence(self.screen, instruction_flow, self.all_results, self.all_acc, after_c_segment2)
+        run_instruction_sequence(self.screen, instruction_flow, self.all_results, self.all_acc, after_c_segment2,
+                                 warm_up=self.warm_up_for)
 
     # Segment 3: block 5 + block 6
     def run_c_segment3(self, next_segment_func=None):
@@ -110,4 +135,5 @@ class Contextual:
                 pygame.quit()
                 quit()
 
-        run_instruction_sequence(self.screen, instruction_flow, self.all_results, self.all_acc, after_c_segment3)
\ No newline at end of file
+        run_instruction_sequence(self.screen, instruction_flow, self.all_results, self.all_acc, after_c_segment3,
+                                 warm_up=self.warm_up_for)
\ No newline at end of file
@@ -18,23 +18,31 @@ INCORRECT_IMG = pygame.transform.smoothscale(INCORRECT_IMG_RAW, (
     INCORRECT_IMG_RAW.get_height() // 5
 ))
 
+# "Too Slow" text, rendered once (see get_too_slow_text)
+_too_slow_text = None
+
+def get_too_slow_text():
+    global _too_slow_text
+    if _too_slow_text is None:
+        _too_slow_text = pygame.font.SysFont(None, 48).render("Too Slow", True, YELLOW_RGB)
+    return _too_slow_text
+
 # Show feedback (temporary placeholder - will be changed to use images later)
 def show_feedback(screen, correct, timeout, background):
-    from framework import get_scaled_stimulus
+    from framework import get_cached_stimulus
     
-    font = pygame.font.SysFont(None, 48)
     screen_rect = screen.get_rect()
 
     center_x = screen_rect.centerx
     center_y = screen_rect.centery + 200
 
     # Scale and center the background stimulus
-    background_scaled = get_scaled_stimulus(background, screen)
+    background_scaled = get_cached_stimulus(background, screen)
     background_rect = background_scaled.get_rect(center=screen_rect.center)
     screen.blit(background_scaled, background_rect)
     
     if timeout:
-        text = font.render("Too Slow", True, YELLOW_RGB)
+        text = get_too_slow_text()
         text_rect = text.get_rect(center=(center_x, center_y))
         screen.blit(text, text_rect)
     else:
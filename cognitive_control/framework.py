@@ -2,6 +2,11 @@ import pygame
 from meta_parameters import *
 from stimuli import *
 from instructions import *
+from instruction_pager import InstructionPage
+from idle_screen import IdleScreen
+
+# Participant ID and instruction screens sleep until there is input (CPU usage per screen type)
+idle_screen = IdleScreen()
 
 GlobalParticipantName = ""
 
@@ -46,19 +51,26 @@ def get_participant_id(screen):
 
     global GlobalParticipantName
 
+    changed = True
     while active:
-        screen.fill(GRAY_RGB)
-        screen_rect = screen.get_rect()
-        
-        prompt = font.render("Enter Participant ID (press enter when completed):", True, BLACK_RGB)
-        text_surface = font.render(input_text, True, BLACK_RGB)
-        
-        # Center text using dynamic screen dimensions
-        screen.blit(prompt, (screen_rect.centerx - prompt.get_width() // 2, screen_rect.centery - 100))
-        screen.blit(text_surface, (screen_rect.centerx - text_surface.get_width() // 2, screen_rect.centery))
-        pygame.display.flip()
+        # Redraw only after input, and sleep until the next event
+        with idle_screen.measure("participant_id"):
+            if idle_screen.redraw(changed):
+                screen.fill(GRAY_RGB)
+                screen_rect = screen.get_rect()
+
+                prompt = font.render("Enter Participant ID (press enter when completed):", True, BLACK_RGB)
+                text_surface = font.render(input_text, True, BLACK_RGB)
 
-        for event in pygame.event.get():
+                # Center text using dynamic screen dimensions
+                screen.blit(prompt, (screen_rect.centerx - prompt.get_width() // 2, screen_rect.centery - 100))
+                screen.blit(text_surface, (screen_rect.centerx - text_surface.get_width() // 2, screen_rect.centery))
+                pygame.display.flip()
+                changed = False
+            events = idle_screen.wait()
+
+        for event in events:
+            changed = True
             if event.type == pygame.QUIT:
                 pygame.quit()
                 quit()
@@ -109,6 +121,23 @@ def get_scaled_stimulus(image, screen):
     
     return scaled_image
 
+# Scaled stimuli of the current block: (image, screen size) -> scaled surface (filled by the warm-up)
+_scaled_stimuli = {}
+
+def get_cached_stimulus(image, screen):
+    """get_scaled_stimulus, smoothscaled only once per image and screen size (see clear_stimulus_cache)"""
+    key = (id(image), screen.get_size())
+    scaled = _scaled_stimuli.get(key)
+    if scaled is None:
+        scaled = get_scaled_stimulus(image, screen)
+        _scaled_stimuli[key] = (image, scaled)  # keep the image alive, so its id is not reused
+        return scaled
+    return scaled[1]
+
+def clear_stimulus_cache():
+    """Drop the scaled stimuli of the previous block"""
+    _scaled_stimuli.clear()
+
 # Show instruction flow handler
 def run_instruction_flow(screen, instruction_flow, all_results, all_acc, next_segment_func):
     """
@@ -135,7 +164,14 @@ def run_instruction_flow(screen, instruction_flow, all_results, all_acc, next_se
     process_flow(0)
 
 # Show one instruction page, then call next_func
-def show_instruction(screen, instruction_page, next_func):
+def show_instruction(screen, instruction_page, next_func, warm_up=None):
+    # Pages are decoded by a background pager: fetch this one (usually already decoded)
+    if isinstance(instruction_page, InstructionPage):
+        page_path = instruction_page.pager.paths[instruction_page.index]
+        instruction_page = instruction_page.load()
+        if instruction_page is None:
+            raise RuntimeError(f"Instruction page could not be loaded: {page_path}")
+
     # Clear screen with gray background
     screen.fill(GRAY_RGB)
     
@@ -150,11 +186,18 @@ def show_instruction(screen, instruction_page, next_func):
     screen.blit(scaled_instruction, instruction_rect)
     pygame.display.flip()
 
+    # Last page before a block: warm up while it is being read
+    if warm_up is not None:
+        warm_up()
+
     pygame.event.clear()
     page_start_time = pygame.time.get_ticks()
 
     while pygame.time.get_ticks() - page_start_time < READ_TIME:
-        for event in pygame.event.get():
+        # Sleep until the next key press, or until the reading time of the page is over
+        with idle_screen.measure("instructions"):
+            events = idle_screen.wait(page_start_time + READ_TIME - pygame.time.get_ticks())
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 raise SystemExit
@@ -171,7 +214,10 @@ def show_instruction(screen, instruction_page, next_func):
 
     waiting = True
     while waiting:
-        for event in pygame.event.get():
+        # The page only changes on input: sleep until the next key press
+        with idle_screen.measure("instructions"):
+            events = idle_screen.wait()
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 raise SystemExit
@@ -191,18 +237,26 @@ def show_instruction(screen, instruction_page, next_func):
     next_func()
 
 # Reusable recursive flow handler
-def run_instruction_sequence(screen, flow, all_results, all_acc, final_callback, index=0):
+def run_instruction_sequence(screen, flow, all_results, all_acc, final_callback, index=0, warm_up=None):
+    """
+    Show the pages of flow [(page, task_func), ...] in turn; task_func (if any) runs when SPACE is pressed on its page.
+    warm_up(task_func), if given, runs while the page before a task is up.
+    """
     if index >= len(flow):
         final_callback()
         return
 
     page, task_func = flow[index]
 
+    # Start decoding the next page of the flow while this one is showing
+    if index + 1 < len(flow) and isinstance(flow[index + 1][0], InstructionPage):
+        flow[index + 1][0].prefetch()
+
     def next_step():
         if task_func:
             results, acc = task_func(screen)
             all_results.extend(results)
             all_acc.append(acc)
-        run_instruction_sequence(screen, flow, all_results, all_acc, final_callback, index + 1)
+        run_instruction_sequence(screen, flow, all_results, all_acc, final_callback, index + 1, warm_up)
 
-    show_instruction(screen, page, next_step)
+    show_instruction(screen, page, next_step, (lambda: warm_up(task_func)) if warm_up and task_func else None)
@@ -0,0 +1,63 @@
+import sys
+import time
+from contextlib import contextmanager
+
+import pygame
+
+# Longest time a waiting screen blocks before it re-checks its timed state (ms)
+IDLE_TIMEOUT_MS = 500
+# Launch option: python main_*.py --busy-screens (poll and redraw every loop, as before, to compare CPU usage)
+BUSY_SCREENS_FLAG = "--busy-screens"
+
+
+class IdleScreen:
+    def __init__(self, blocking=None):
+        """
+        Event waiting for the screens that only change on input (participant ID entry, instruction and
+        result pages): wait() sleeps in pygame.event.wait() until there is an event instead of spinning on
+        pygame.event.get(), and redraw() tells the loop to draw only when something changed.
+        measure() accumulates CPU time against wall time per screen type, so report() gives the CPU usage
+        of each; with --busy-screens the loops poll and redraw every time, to measure the difference.
+        :param blocking: Block on pygame.event.wait() (default: unless started with --busy-screens)
+        """
+        self.blocking = BUSY_SCREENS_FLAG not in sys.argv[1:] if blocking is None else blocking
+        self.screens = {}   # screen type -> {"wall_s", "cpu_s"}
+
+    @contextmanager
+    def measure(self, name):
+        """Count the enclosed redraw / wait (not the handling of the events) towards screen type name"""
+        stats = self.screens.setdefault(name, {"wall_s": 0.0, "cpu_s": 0.0})
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            stats["wall_s"] += time.perf_counter() - wall
+            stats["cpu_s"] += time.process_time() - cpu
+
+    def redraw(self, changed):
+        """Whether the screen has to be drawn again: only if it changed (always with --busy-screens)"""
+        return changed or not self.blocking
+
+    def wait(self, timeout_ms=IDLE_TIMEOUT_MS):
+        """
+        Wait for input
+        :param timeout_ms: Return after this long even without an event (e.g. to unlock a page after its reading time)
+        :return: The pending events (empty on timeout)
+        """
+        if not self.blocking:
+            return pygame.event.get()
+        event = pygame.event.wait(max(1, int(timeout_ms)))
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
+    def report(self):
+        """{screen type: {"cpu_percent", "cpu_s", "wall_s"}} since the start"""
+        return {
+            name: {
+                "cpu_percent": round(100 * stats["cpu_s"] / stats["wall_s"], 1) if stats["wall_s"] else None,
+                "cpu_s": round(stats["cpu_s"], 3),
+                "wall_s": round(stats["wall_s"], 1),
+            }
+            for name, stats in self.screens.items()
+        }
@@ -0,0 +1,68 @@
+import time
+from collections import namedtuple
+
+import pygame
+
+# Key actions of a KeyRecord
+KEY_DOWN = "down"
+KEY_UP = "up"
+# Pause between two polls of the SDL queue while waiting for a response (0.5 ms)
+POLL_INTERVAL_S = 0.0005
+
+# One key event: pygame key code, KEY_DOWN / KEY_UP, time.perf_counter_ns() when it was taken off the SDL queue
+KeyRecord = namedtuple("KeyRecord", ["key", "action", "ns"])
+
+
+class InputCapture:
+    def __init__(self, event_types=(pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP)):
+        """
+        Drain the SDL event queue on its own cadence and timestamp every key event with
+        time.perf_counter_ns() as it is taken off the queue, instead of with get_ticks() whenever
+        the render loop happens to look. Trial code reads KeyRecords from events().
+        SDL only allows the window's thread to pump events, so poll() is called from the response
+        waits (every POLL_INTERVAL_S) rather than from a separate thread.
+        Use as a context manager to restrict the SDL queue to event_types for the duration of a block.
+        :param event_types: Event types let through to the queue while capturing
+        """
+        self.event_types = list(event_types)
+        self.records = []
+        self.quit_requested = False
+
+    def __enter__(self):
+        # Only the relevant events reach the queue (no mouse motion, window or text events)
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(self.event_types)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pygame.event.set_allowed(None)
+        return False
+
+    def poll(self):
+        """Move all queued key events into records, timestamped now; return the number of new records"""
+        events = pygame.event.get()
+        now_ns = time.perf_counter_ns()
+        count = 0
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                self.records.append(KeyRecord(event.key, KEY_DOWN, now_ns))
+                count += 1
+            elif event.type == pygame.KEYUP:
+                self.records.append(KeyRecord(event.key, KEY_UP, now_ns))
+                count += 1
+            elif event.type == pygame.QUIT:
+                self.quit_requested = True
+        return count
+
+    def events(self):
+        """Return and forget the records captured so far"""
+        records, self.records = self.records, []
+        return records
+
+    def clear(self):
+        """
+        Drop pending key events and captured records (e.g. at the start of a response window);
+        a pending QUIT stays queued for the next poll()
+        """
+        pygame.event.clear([pygame.KEYDOWN, pygame.KEYUP])
+        self.records = []
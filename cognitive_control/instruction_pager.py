@@ -0,0 +1,138 @@
+import threading
+import queue
+from collections import OrderedDict
+
+# Number of pages decoded ahead of the page on screen
+PAGER_LOOKAHEAD = 3
+# Number of decoded pages kept in memory (current page, a few behind and the lookahead)
+PAGER_CACHE_SIZE = 6
+
+
+class InstructionPager:
+    def __init__(self, paths, load_page, lookahead=PAGER_LOOKAHEAD, cache_size=PAGER_CACHE_SIZE):
+        """
+        Serve instruction pages on demand: while page N is on screen (and locked for the reading time),
+        pages N+1..N+lookahead are decoded and scaled on a background thread, and only a small LRU of
+        ready pages is kept in memory instead of every page of the task.
+        :param paths: Image path of every instruction page, in page order
+        :param load_page: Function path -> Surface that decodes and scales one page (None if unavailable)
+        :param lookahead: Number of pages decoded ahead of the current one
+        :param cache_size: Maximum number of decoded pages kept
+        """
+        self.paths = list(paths)
+        self.load_page = load_page
+        self.lookahead = lookahead
+        self.cache_size = max(cache_size, lookahead + 1)
+        self.pages = OrderedDict()   # page index -> Surface (None if the page failed to load)
+        self.hits = 0                # page already decoded when requested
+        self.waits = 0               # page was still being decoded in the background
+        self.misses = 0              # page had to be decoded on the spot
+        self._current = None         # page index of the last get() (counters are per page turn)
+
+        self._pending = set()
+        self._ready = threading.Condition()
+        self._requests = queue.Queue()
+        self._thread = threading.Thread(target=self._decode, daemon=True)
+        self._thread.start()
+
+    def __len__(self):
+        return len(self.paths)
+
+    def _load(self, index):
+        try:
+            return self.load_page(self.paths[index])
+        except Exception as e:
+            print(f"Error loading instruction page {self.paths[index]}: {e}")
+            return None
+
+    def _insert(self, index, page):
+        """Store a decoded page, dropping the least recently shown pages beyond cache_size"""
+        self.pages[index] = page
+        self.pages.move_to_end(index)
+        while len(self.pages) > self.cache_size:
+            self.pages.popitem(last=False)
+
+    def _decode(self):
+        """Background thread: decode the queued pages in order"""
+        while True:
+            index = self._requests.get()
+            if index is None:
+                break
+            page = self._load(index)
+            with self._ready:
+                self._pending.discard(index)
+                self._insert(index, page)
+                self._ready.notify_all()
+
+    def prefetch(self, index):
+        """Queue pages index..index+lookahead-1 that are neither decoded nor queued yet"""
+        with self._ready:
+            for i in range(max(index, 0), min(index + self.lookahead, len(self.paths))):
+                if i not in self.pages and i not in self._pending:
+                    self._pending.add(i)
+                    self._requests.put(i)
+
+    def get(self, index):
+        """
+        Return the surface of page index (None if it could not be loaded), then start decoding the
+        following pages. Waits for the background thread if the page is still being decoded.
+        """
+        turned = index != self._current
+        self._current = index
+        with self._ready:
+            if index in self._pending:
+                self.waits += 1
+                self._ready.wait_for(lambda: index not in self._pending)
+            elif index in self.pages and turned:
+                self.hits += 1
+            cached = index in self.pages
+            if cached:
+                self.pages.move_to_end(index)
+                page = self.pages[index]
+
+        if not cached:
+            self.misses += 1
+            page = self._load(index)
+            with self._ready:
+                self._insert(index, page)
+
+        self.prefetch(index + 1)
+        return page
+
+    def stats(self):
+        """Counters for logging: hits / waits / misses / pages in memory"""
+        with self._ready:
+            return {
+                "hits": self.hits,
+                "waits": self.waits,
+                "misses": self.misses,
+                "pages": len(self.pages),
+            }
+
+    def page(self, index):
+        """Lazy handle on one page, for instruction flows built before the pages are decoded"""
+        return InstructionPage(self, index)
+
+    def close(self):
+        """Stop the background thread (queued pages are still decoded first)"""
+        self._requests.put(None)
+
+
+class InstructionPage:
+    def __init__(self, pager, index):
+        """
+        One page of an InstructionPager. Instruction flows hold these handles instead of decoded
+        surfaces; the surface is only requested when the page is shown (see show_instruction).
+        :param pager: InstructionPager holding the page
+        :param index: Page index in the pager
+        """
+        self.pager = pager
+        self.index = index
+
+    def load(self):
+        """Return the decoded surface (and start decoding the pages that follow it)"""
+        return self.pager.get(self.index)
+
+    def prefetch(self):
+        """Start decoding this page in the background"""
+        self.pager.prefetch(self.index)
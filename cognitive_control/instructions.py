@@ -2,6 +2,7 @@ import pygame
 import os
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 from meta_parameters import *
+from instruction_pager import InstructionPager
 
 class Instructions:
     
@@ -23,6 +24,9 @@ class Instructions:
         self.C_INSTRUCTION_PATH = None
         self.C_ALL_INSTRUCTIONS = []
         self.C_INSTRUCTION_p4 = None
+
+        # Background decoder shared by all pages (created in generate_paths)
+        self.pager = None
     
     def generate_paths(self, version):
 
@@ -47,27 +51,44 @@ class Instructions:
             # Contextual
             C_INSTRUCTION_PATH = os.path.join(SCRIPT_DIR, "instructions_reversed", "contextual")
         
-        # Motor
-        M_ALL_INSTRUCTIONS = [
-                pygame.image.load(os.path.join(M_INSTRUCTION_PATH, f"{i}.jpg")) for i in range(1, M_END_PAGE + 1)
-            ]
+        # Every page is decoded on demand by a background pager (a few pages ahead of the one
+        # on screen), so no instruction image is loaded here
+        page_paths = []
 
-        M_INSTRUCTION_p1 = pygame.image.load(os.path.join(M_INSTRUCTION_PATH, "p1.jpg"))
-        M_INSTRUCTION_p2 = pygame.image.load(os.path.join(M_INSTRUCTION_PATH, "p2.jpg"))
+        def add_pages(instruction_path, names):
+            first = len(page_paths)
+            page_paths.extend(os.path.join(instruction_path, name) for name in names)
+            return list(range(first, len(page_paths)))
 
-        # Sensorimotor
-        SM_ALL_INSTRUCTIONS = [
-            pygame.image.load(os.path.join(SM_INSTRUCTION_PATH, f"{i}.jpg")) for i in range(1,SM_END_PAGE + 1)
-        ]
+        # Motor
+        M_PAGES = add_pages(M_INSTRUCTION_PATH, [f"{i}.jpg" for i in range(1, M_END_PAGE + 1)])
+        M_p1, M_p2 = add_pages(M_INSTRUCTION_PATH, ["p1.jpg", "p2.jpg"])
 
-        SM_INSTRUCTION_p3 = pygame.image.load(os.path.join(SM_INSTRUCTION_PATH, "p3.jpg"))
+        # Sensorimotor
+        SM_PAGES = add_pages(SM_INSTRUCTION_PATH, [f"{i}.jpg" for i in range(1, SM_END_PAGE + 1)])
+        SM_p3, = add_pages(SM_INSTRUCTION_PATH, ["p3.jpg"])
 
         # Contextual
-        C_ALL_INSTRUCTIONS = [
-            pygame.image.load(os.path.join(C_INSTRUCTION_PATH, f"{i}.jpg")) for i in range(1,C_END_PAGE + 1)
-        ]
+        C_PAGES = add_pages(C_INSTRUCTION_PATH, [f"{i}.jpg" for i in range(1, C_END_PAGE + 1)])
+        C_p4, = add_pages(C_INSTRUCTION_PATH, ["p4.jpg"])
+
+        # Missing pages are still reported at startup, as when every page was loaded here
+        for path in page_paths:
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Instruction page not found: {path}")
+
+        self.pager = InstructionPager(page_paths, pygame.image.load)
+        self.pager.prefetch(0)
+
+        M_ALL_INSTRUCTIONS = [self.pager.page(i) for i in M_PAGES]
+        M_INSTRUCTION_p1 = self.pager.page(M_p1)
+        M_INSTRUCTION_p2 = self.pager.page(M_p2)
+
+        SM_ALL_INSTRUCTIONS = [self.pager.page(i) for i in SM_PAGES]
+        SM_INSTRUCTION_p3 = self.pager.page(SM_p3)
 
-        C_INSTRUCTION_p4 = pygame.image.load(os.path.join(C_INSTRUCTION_PATH, "p4.jpg"))
+        C_ALL_INSTRUCTIONS = [self.pager.page(i) for i in C_PAGES]
+        C_INSTRUCTION_p4 = self.pager.page(C_p4)
 
         self.M_INSTRUCTION_PATH = M_INSTRUCTION_PATH
         self.M_ALL_INSTRUCTIONS = M_ALL_INSTRUCTIONS
@@ -7,6 +7,10 @@ from sensorimotor import Sensorimotor
 from contextual import *
 from save_results import *
 from datetime import datetime
+from realtime import apply_launch_options
+
+# ========== Real-time process mode (--realtime [--cpu N]), before pygame.init() so its threads inherit it ==========
+apply_launch_options()
 
 # ========== Initialize Pygame ==========
 pygame.init()
@@ -24,6 +28,9 @@ global_start_time = datetime.now().strftime("%y/%m/%d %H:%M:%S")
 def end_and_save():
     global_end_time = datetime.now().strftime("%y/%m/%d %H:%M:%S")
     # No backup save needed - all results already saved trial-by-trial
+    # Rows were written trial-by-trial; settle the "valid" column in one pass
+    FinaliseResultsCsv()
+    print(f"CPU usage of the waiting screens: {idle_screen.report()}")
     pygame.time.wait(1000)
     pygame.quit()
     quit()
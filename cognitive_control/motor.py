@@ -6,38 +6,90 @@ from feedback import *
 from framework import *
 from save_results import *
 from instructions import *
+import time
 from datetime import datetime
 from instructions import Instructions
+from scheduler import PresentationScheduler
+from input_capture import InputCapture, KEY_DOWN, POLL_INTERVAL_S
+from gc_quiet import GCQuiet
+from warm_up import WarmUp, render_offscreen
+
+# Timestamped key input for the trial windows (see key_logging)
+input_capture = InputCapture()
+# No garbage collection from fixation to the ISI (collected during the ISI instead)
+gc_quiet = GCQuiet()
+# Warm-up before each block, and first-trial vs steady-state onset latency
+warm_up = WarmUp()
+
+def warm_up_block(screen, block, condition, stimulus_images):
+    """
+    Warm-up before a block (while its last instruction page is up): scale the fixation and the block's stimuli
+    to the screen, render the feedback text, draw them offscreen and open the results file
+    """
+    fixation_image = M_FIXATION if condition in ["motor", "sensorimotor"] else CONTEXTUAL_FIXATION
+    images = [fixation_image]
+    for image in stimulus_images:
+        if all(image is not other for other in images):
+            images.append(image)
+
+    def scale():
+        clear_stimulus_cache()
+        for image in images:
+            get_cached_stimulus(image, screen)
+
+    def render():
+        surfaces = [get_cached_stimulus(image, screen) for image in images]
+        render_offscreen(screen, surfaces + [get_too_slow_text(), CORRECT_IMG, INCORRECT_IMG], GRAY_RGB)
+
+    warm_up.run(block, [
+        ("scale", scale),
+        ("fonts", get_too_slow_text),
+        ("render", render),
+        ("results_file", lambda: open_results_file("results.csv", GetParticipantId())),
+    ])
 
 # General key input / response function 
-def key_logging(time_allowed, screen, current_image=None, is_fixation=False, condition="motor"):
+def key_logging(time_allowed, screen, current_image=None, is_fixation=False, condition="motor", deadline_ns=None, onset_ns=None):
     """
     Enhanced key logging with fullscreen toggle support and screen redraw
     current_image: the current image being displayed (for redraw after toggle)
     is_fixation: whether we're currently showing fixation or stimulus
     condition: task condition to determine which fixation to use
+    deadline_ns: absolute end of the window (perf_counter_ns); defaults to now + time_allowed
+    onset_ns: onset of the screen the reaction time is measured from (perf_counter_ns); defaults to now
+    Key presses are timestamped when they are taken off the SDL queue, so the reaction time
+    (ms, sub-millisecond resolution) does not depend on when this loop gets to look at them.
+    Returns (key, reaction time in ms, perf_counter_ns of the response or None).
     """
-    start_time = pygame.time.get_ticks()
     key_response = None
     reaction_time = 0
-
-    while pygame.time.get_ticks() - start_time < time_allowed:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+    response_ns = None
+    if onset_ns is None:
+        onset_ns = time.perf_counter_ns()
+    if deadline_ns is None:
+        deadline_ns = onset_ns + int(time_allowed * 1_000_000)
+
+    with input_capture:
+        while time.perf_counter_ns() < deadline_ns:
+            input_capture.poll()
+            if input_capture.quit_requested:
                 # Handle window close button (X) - graceful exit
                 print("=== QUIT EVENT DETECTED - EXITING GRACEFULLY ===")
                 pygame.quit()
                 quit()
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
+
+            for record in input_capture.events():
+                if record.action != KEY_DOWN:
+                    continue
+                if record.key == pygame.K_ESCAPE:
                     # Handle ESC key for fullscreen toggle
                     from framework import toggle_fullscreen
                     screen = toggle_fullscreen(screen)  # Update screen reference
-                    
+
                     # Redraw the current screen after toggle
                     screen.fill(GRAY_RGB)  # Clear screen first
                     screen_rect = screen.get_rect()
-                    
+
                     if current_image is not None:
                         # Redraw the current image with new scaling
                         if is_fixation:
@@ -55,26 +107,27 @@ def key_logging(time_allowed, screen, current_image=None, is_fixation=False, con
                             stimulus_scaled = get_scaled_stimulus(current_image, screen)
                             stimulus_rect = stimulus_scaled.get_rect(center=screen_rect.center)
                             screen.blit(stimulus_scaled, stimulus_rect)
-                    
+
                     pygame.display.flip()
-                    
-                elif key_response is None and event.key in [pygame.K_d, pygame.K_k]:
+
+                elif record.key in [pygame.K_d, pygame.K_k]:
                     # Only accept D and K keys as valid responses
-                    key_response = event.key
-                    reaction_time = pygame.time.get_ticks() - start_time
+                    key_response = record.key
+                    reaction_time = round((record.ns - onset_ns) / 1_000_000, 3)
+                    response_ns = record.ns
                     # Break immediately after getting a valid response
                     break
                 # Ignore all other keys (no feedback, no action)
-        
-        # Break the outer loop if we got a response
-        if key_response is not None:
-            break
-        
-        # Small delay to prevent high CPU usage
-        pygame.time.delay(1)
 
-    pygame.event.clear()
-    return key_response, reaction_time
+            # Break the outer loop if we got a response
+            if key_response is not None:
+                break
+
+            # Short pause between polls of the SDL queue
+            time.sleep(POLL_INTERVAL_S)
+
+    input_capture.clear()
+    return key_response, reaction_time, response_ns
 
 # Run trials
 def run_trials(trials, response_time, isi_time, condition, read_trial, screen):
@@ -82,35 +135,52 @@ def run_trials(trials, response_time, isi_time, condition, read_trial, screen):
     correct_count = 0
     results = []
 
+    # Screens are flipped at absolute deadlines; each window ends early on a D/K response
+    scheduler = PresentationScheduler()
+    next_onset_ns = None  # fixation onset deadline of the next trial (end of the previous ISI)
+
     for trial in trials:
         print(f"=== STARTING TRIAL - Participant ID: {GetParticipantId()} ===")
         startTime = datetime.now().strftime("%y/%m/%d %H:%M:%S")
 
         fixation_time, stimulus_image, type, phase, key_correct = read_trial(trial)
+        gc_quiet.begin()
 
         # Fixation - centered on screen with appropriate scaling
         screen_rect = screen.get_rect()
         if (condition == "motor"
             or condition == "sensorimotor"):
-            fixation_scaled = get_scaled_stimulus(M_FIXATION, screen)
+            fixation_scaled = get_cached_stimulus(M_FIXATION, screen)
             fixation_rect = fixation_scaled.get_rect(center=screen_rect.center)
             screen.blit(fixation_scaled, fixation_rect)
-            pygame.display.flip()
-            fixation_key_response, fixation_reaction_time = key_logging(fixation_time, screen, M_FIXATION, True, condition)
+            fixation_image = M_FIXATION
         else:
-            contextual_fixation_scaled = get_scaled_stimulus(CONTEXTUAL_FIXATION, screen)
+            contextual_fixation_scaled = get_cached_stimulus(CONTEXTUAL_FIXATION, screen)
             contextual_fixation_rect = contextual_fixation_scaled.get_rect(center=screen_rect.center)
             screen.blit(contextual_fixation_scaled, contextual_fixation_rect)
-            pygame.display.flip()
-            fixation_key_response, fixation_reaction_time = key_logging(fixation_time, screen, CONTEXTUAL_FIXATION, True, condition)
+            fixation_image = CONTEXTUAL_FIXATION
+        # Scale the stimulus before the fixation window starts (scaled by the warm-up), so it can be flipped right at its deadline
+        stimulus_scaled = get_cached_stimulus(stimulus_image, screen)
+        scaled_for_size = screen.get_size()
+
+        fixation_onset_ns = scheduler.flip("fixation", next_onset_ns)
+        fixation_end_ns = fixation_onset_ns + scheduler.duration_ns(fixation_time)
+        fixation_key_response, fixation_reaction_time, fixation_response_ns = key_logging(
+            fixation_time, screen, fixation_image, True, condition, deadline_ns=fixation_end_ns, onset_ns=fixation_onset_ns)
 
         # Stimulus - centered on screen with appropriate scaling
         screen.fill(GRAY_RGB)  # Clear screen before showing stimulus
-        stimulus_scaled = get_scaled_stimulus(stimulus_image, screen)
+        if screen.get_size() != scaled_for_size:
+            stimulus_scaled = get_cached_stimulus(stimulus_image, screen)  # window mode changed during fixation
         stimulus_rect = stimulus_scaled.get_rect(center=screen_rect.center)
         screen.blit(stimulus_scaled, stimulus_rect)
-        pygame.display.flip()
-        stimulus_key_response, stimulus_reaction_time = key_logging(response_time, screen, stimulus_image, False, condition)
+        # A response during fixation ends it early: the stimulus then follows right away
+        stimulus_onset_ns = scheduler.flip("stimulus", fixation_end_ns if fixation_key_response is None else None)
+        if fixation_key_response is None:
+            warm_up.onset((stimulus_onset_ns - fixation_end_ns) / 1_000_000)
+        stimulus_end_ns = stimulus_onset_ns + scheduler.duration_ns(response_time)
+        stimulus_key_response, stimulus_reaction_time, stimulus_response_ns = key_logging(
+            response_time, screen, stimulus_image, False, condition, deadline_ns=stimulus_end_ns, onset_ns=stimulus_onset_ns)
 
         if phase.startswith("practice"):
             if type == "no_go":
@@ -121,10 +191,17 @@ def run_trials(trials, response_time, isi_time, condition, read_trial, screen):
                 timeout = (fixation_key_response is None and stimulus_key_response is None)
             show_feedback(screen, correct, timeout, stimulus_image)
 
-        # ISI
+        # ISI (follows the response window, or the feedback in practice blocks)
         screen.fill(GRAY_RGB)
-        pygame.display.flip()
-        isi_key_response, isi_reaction_time = key_logging(isi_time, screen, None, False, condition)
+        if stimulus_key_response is None and not phase.startswith("practice"):
+            isi_onset_ns = scheduler.flip("isi", stimulus_end_ns)
+        else:
+            isi_onset_ns = scheduler.flip("isi")
+        isi_end_ns = isi_onset_ns + scheduler.duration_ns(isi_time)
+        gc_quiet.release()  # collect at the start of the ISI
+        isi_key_response, isi_reaction_time, isi_response_ns = key_logging(
+            isi_time, screen, None, False, condition, deadline_ns=isi_end_ns, onset_ns=isi_onset_ns)
+        next_onset_ns = isi_end_ns if isi_key_response is None else None
 
         # Determine error type
         error_type = None
@@ -164,7 +241,13 @@ def run_trials(trials, response_time, isi_time, condition, read_trial, screen):
             "isi_key_response": isi_key_response,
             "isi_reaction_time_ms": isi_reaction_time,
             "correct": correct,
-            "error_type": error_type
+            "error_type": error_type,
+            "fixation_onset_ns": fixation_onset_ns,
+            "fixation_response_ns": fixation_response_ns,
+            "stimulus_onset_ns": stimulus_onset_ns,
+            "stimulus_response_ns": stimulus_response_ns,
+            "isi_onset_ns": isi_onset_ns,
+            "isi_response_ns": isi_response_ns
         }
         print("=== TRIAL COMPLETE - SAVING DATA ===")
         print("record part result, participateID=", GetParticipantId())
@@ -183,6 +266,11 @@ def run_trials(trials, response_time, isi_time, condition, read_trial, screen):
         if correct:
             correct_count += 1
 
+    # One database transaction for the rows of the block (--results-db)
+    results_writer.end_block()
+    print(f"Screen onsets (planned vs actual): {scheduler.report()}")
+    print(f"Garbage collection pauses: {gc_quiet.report()}")
+    print(f"Onset latency, first trial vs steady state: {warm_up.report()}")
     accuracy = correct_count / total_trials
     return results, accuracy
 
@@ -242,6 +330,18 @@ class Motor:
     def block2(self, screen):
         return run_trials(block2_trials, M_RESPONSE_TIME, M_ISI_TIME, "motor", self.read_motor_trial, screen)
 
+    # Warm-up on the page before a block
+    def warm_up_for(self, task_func):
+        trials = {
+            self.practice1_1: practice1_1_trials,
+            self.practice1_2: practice1_2_trials,
+            self.block1: block1_trials,
+            self.practice2_1: practice2_1_trials,
+            self.practice2_2: practice2_2_trials,
+            self.block2: block2_trials,
+        }[task_func]
+        warm_up_block(self.screen, task_func.__name__, "motor", [trial[1] for trial in trials])
+
     # Segments （把全局常量页码依旧用 meta_parameters 里的）
     def run_m_segment1(self, next_segment_func):
         instruction_flow = []
@@ -260,7 +360,8 @@ class Motor:
             else:
                 next_segment_func()
 
-        run_instruction_sequence(self.screen, instruction_flow, self.all_results, self.all_acc, after_segment1)
+        run_instruction_sequence(self.screen, instruction_flow, self.all_results, self.all_acc, after_segment1,
+                                 warm_up=self.warm_up_for)
 
     def run_m_segment2(self, next_segment_func, repeat_count=1):
         instruction_flow = [(self.M_INSTRUCTION_p1, None)]
@@ -279,7 +380,8 @@ class Motor:
             else:
                 next_segment_func()
 
-        run_instruction_sequence(self.screen, instruction_flow, self.all_results, self.all_acc, after_segment2)
+        run_instruction_sequence(self.screen, instruction_flow, self.all_results, self.all_acc, after_segment2,
+                                 warm_up=self.warm_up_for)
 
     def run_m_segment3(self, next_segment_func):
         instruction_flow = []
@@ -300,7 +402,8 @@ class Motor:
             else:
                 next_segment_func()
 
-        run_instruction_sequence(self.screen, instruction_flow, self.all_results, self.all_acc, after_segment3)
+        run_instruction_sequence(self.screen, instruction_flow, self.all_results, self.all_acc, after_segment3,
+                                 warm_up=self.warm_up_for)
 
     def run_m_segment4(self, next_segment_func, repeat_count=1):
         instruction_flow = [(self.M_INSTRUCTION_p2, None)]
@@ -319,7 +422,8 @@ class Motor:
             else:
                 next_segment_func()
 
-        run_instruction_sequence(self.screen, instruction_flow, self.all_results, self.all_acc, after_segment4)
+        run_instruction_sequence(self.screen, instruction_flow, self.all_results, self.all_acc, after_segment4,
+                                 warm_up=self.warm_up_for)
 
     def run_m_segment5(self, next_segment_func=None):
         instruction_flow = []
@@ -336,4 +440,5 @@ class Motor:
                 pygame.quit()
                 quit()
 
-        run_instruction_sequence(self.screen, instruction_flow, self.all_results, self.all_acc, after_segment5)
\ No newline at end of file
+        run_instruction_sequence(self.screen, instruction_flow, self.all_results, self.all_acc, after_segment5,
+                                 warm_up=self.warm_up_for)
\ No newline at end of file
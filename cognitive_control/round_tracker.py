@@ -0,0 +1,67 @@
+import json
+import os
+
+# Error types that make a session invalid when they occur outside the practice blocks
+NO_GO_ERRORS = ("no_go_error", "no_go_delay_error")
+
+
+class RoundTracker:
+    def __init__(self, block_round_limits, sidecar_path):
+        """
+        Round and validity of the results rows, kept in memory so each row is written once.
+        next_round() numbers the rounds of the blocks in block_round_limits as the rows are written, and
+        record_error() raises the session-wide no-go error flag that decides the "valid" column.
+        "valid" is only known at the end of the session: until then it is kept in a small sidecar file
+        next to the results (rewritten only when the flag changes), so a crashed session can still be
+        finalised later (see save_results.FinaliseResultsCsv).
+        :param block_round_limits: {block: number of trials per round}
+        :param sidecar_path: Path of the sidecar file
+        """
+        self.block_round_limits = block_round_limits
+        self.block_counters = {k: 0 for k in block_round_limits}
+        self.block_rounds = {k: 1 for k in block_round_limits}
+        self.has_no_go_error = False
+        self.sidecar_path = sidecar_path
+        self.write_sidecar()
+
+    def next_round(self, block):
+        """Round of the next row of block (None for a block without rounds)"""
+        if block not in self.block_round_limits:
+            return None
+        round_number = self.block_rounds[block]
+        self.block_counters[block] += 1
+        if self.block_counters[block] == self.block_round_limits[block]:
+            self.block_counters[block] = 0
+            self.block_rounds[block] += 1
+        return round_number
+
+    def record_error(self, block, error_type):
+        """Count a row's error towards the validity of the session"""
+        if not self.has_no_go_error and error_type in NO_GO_ERRORS and not block.startswith("practice"):
+            self.has_no_go_error = True
+            self.write_sidecar()
+
+    @property
+    def valid(self):
+        return not self.has_no_go_error
+
+    def write_sidecar(self):
+        """Write {"valid": ...} to the sidecar (replaced atomically, so it is never half-written)"""
+        tmp_path = self.sidecar_path + ".tmp"
+        with open(tmp_path, mode="w") as f:
+            json.dump({"valid": self.valid}, f)
+        os.replace(tmp_path, self.sidecar_path)
+
+    def remove_sidecar(self):
+        """The results file is finalised: the sidecar is no longer needed"""
+        if os.path.exists(self.sidecar_path):
+            os.remove(self.sidecar_path)
+
+
+def read_sidecar(sidecar_path):
+    """Validity recorded in a sidecar file (None if it cannot be read)"""
+    try:
+        with open(sidecar_path) as f:
+            return bool(json.load(f)["valid"])
+    except (OSError, ValueError, KeyError):
+        return None
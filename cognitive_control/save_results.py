@@ -2,6 +2,14 @@ import csv
 import os
 import pygame
 from meta_parameters import *
+from session_clock import SessionClock
+from realtime import realtime_summary
+from round_tracker import RoundTracker, read_sidecar
+from results_writer import ResultsWriter
+from session_store import open_store
+
+# Session timebase (wall-clock anchor + perf_counter_ns origin) for the onset/response columns
+session_clock = SessionClock()
 
 # def save_results_to_csv(filename, participant_id, all_results, global_start_time, global_end_time):
 #     # Create save directory
@@ -261,15 +269,15 @@ def InitResultCSV(filename, participant_id):
         os.makedirs(results_dir)
     print(f"Results directory ready: {results_dir}")
     # SaveResultsToCsv will handle unique filename generation
+    FinalisePendingResults()
 
 
 index = 0
 current_participant_file = None  # Track the current participant's file
 
-def SaveResultsToCsv(filename, participant_id, all_results, global_start_time, global_end_time):
-    print("start to save result\n", all_results)
-    # Create save directory
-    global index, current_participant_file
+def get_results_path(filename, participant_id):
+    """Path of the participant's results file (a versioned name is chosen on the first call)"""
+    global current_participant_file
 
     # Get the directory where this script is located to ensure results are saved in the right place
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -278,8 +286,6 @@ def SaveResultsToCsv(filename, participant_id, all_results, global_start_time, g
     if not os.path.exists(results_dir):
         os.makedirs(results_dir)
 
-    print(f"=== SAVING TO DIRECTORY: {results_dir} ===")
-
     # Use global file tracking to ensure all trials from same participant go to same file
     if current_participant_file is None or not current_participant_file.startswith(participant_id):
         # This is a new participant or session, determine the filename
@@ -303,77 +309,208 @@ def SaveResultsToCsv(filename, participant_id, all_results, global_start_time, g
         actual_filename = current_participant_file
         output_path = os.path.join(results_dir, actual_filename)
     
+    return output_path
+
+
+# Columns of the results file
+RESULTS_FIELDNAMES = [
+    "participant_id",
+    "trial_number",
+    "block",
+    "round",
+    "type",
+    "fixation_time",
+    "condition",
+    "version",
+    "difficulty",
+    "key_correct",
+    "hand",
+    "fixation_key_response",
+    "fixation_reaction_time_ms",
+    "stimulus_key_response",
+    "stimulus_reaction_time_ms",
+    "isi_key_response",
+    "isi_reaction_time_ms",
+    "correct",
+    "error_type",
+    "valid",
+    "start_time",
+    "end_time",
+    "session_start",
+    "fixation_onset_ns",
+    "fixation_response_ns",
+    "stimulus_onset_ns",
+    "stimulus_response_ns",
+    "isi_onset_ns",
+    "isi_response_ns",
+    "realtime"
+]
+
+# Rows are written on a background thread (no disk latency in the ISI),
+# and also to a SQLite database with the launch option --results-db [PATH]
+results_writer = ResultsWriter(store=open_store("CC", os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")))
+# Path of the results file (opened by the warm-up before the first block, then kept open by results_writer)
+results_path = None
+# Round / validity of the rows of results_path
+round_tracker = None
+SIDECAR_SUFFIX = ".valid.json"
+
+def get_block_round_limits():
+    """Number of trials per round of each practice block"""
+    return {
+        "practice1_1": PRACTICE1_1_NUM_BLUE + PRACTICE1_1_NUM_NOGO,
+        "practice1_2": PRACTICE1_2_NUM_BLUE + PRACTICE1_2_NUM_NOGO,
+        "practice2_1": PRACTICE2_1_NUM_RED + PRACTICE2_1_NUM_NOGO,
+        "practice2_2": PRACTICE2_2_NUM_RED + PRACTICE2_2_NUM_NOGO,
+        "practice3_1": PRACTICE3_1_NUM_RED + PRACTICE3_1_NUM_BLUE + PRACTICE3_1_NUM_NOGO,
+        "practice3_2": PRACTICE3_2_NUM_RED + PRACTICE3_2_NUM_BLUE + PRACTICE3_2_NUM_NOGO,
+        "practice4_1": PRACTICE4_1_NUM_ACTUAL + PRACTICE4_1_NUM_NOGO,
+        "practice4_2": PRACTICE4_2_NUM_ACTUAL + PRACTICE4_2_NUM_NOGO
+    }
+
+def open_results_file(filename, participant_id):
+    """Path of the participant's results file, opened once by the results writer (with its round tracker)"""
+    global results_path, round_tracker
+    output_path = get_results_path(filename, participant_id)
+    if results_path != output_path:
+        if results_path is not None:
+            FinaliseResultsCsv()
+        results_writer.open(output_path, RESULTS_FIELDNAMES)
+        results_path = output_path
+        round_tracker = RoundTracker(get_block_round_limits(), output_path + SIDECAR_SUFFIX)
+    return results_path
+
+
+def finalise_results_file(output_path, valid):
+    """
+    Single pass at the end of a session: fill in the "valid" column of every row
+    (written to a temporary file, then swapped in, so the results are never half-written)
+    """
+    with open(output_path, mode="r", newline="") as f:
+        reader = csv.DictReader(f)
+        fieldnames = list(reader.fieldnames or [])
+        rows = list(reader)
+    if not fieldnames:
+        return
+    # Files written before the "valid" column existed: insert it after "error_type"
+    if "valid" not in fieldnames:
+        fieldnames.insert(fieldnames.index("error_type") + 1, "valid")
+    for row in rows:
+        row["valid"] = str(valid)
+
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, mode="w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(tmp_path, output_path)
+    print(f"Results finalised: {output_path} ({len(rows)} rows, valid={valid})")
+
+
+def FinaliseResultsCsv():
+    """End of the session: write the queued rows, close the results file and settle its "valid" column"""
+    global results_path, round_tracker
+    if results_path is None:
+        return
+    output_path = results_path
+    results_writer.set_column(output_path, "valid", str(round_tracker.valid))
+    results_writer.close_file(output_path)
+    results_path = None
+    print(f"Results writer (queue depth, write latency): {results_writer.report()}")
+    try:
+        finalise_results_file(output_path, round_tracker.valid)
+        round_tracker.remove_sidecar()
+    except Exception as e:
+        # The sidecar stays: the file is finalised on the next launch
+        print(f"Could not finalise {output_path}: {e}")
+    round_tracker = None
+
+
+def FinalisePendingResults():
+    """Finalise the results files of sessions that ended without FinaliseResultsCsv (crash, quit)"""
+    results_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+    if not os.path.isdir(results_dir):
+        return
+    for name in os.listdir(results_dir):
+        if not name.endswith(SIDECAR_SUFFIX):
+            continue
+        sidecar_path = os.path.join(results_dir, name)
+        output_path = sidecar_path[:-len(SIDECAR_SUFFIX)]
+        valid = read_sidecar(sidecar_path)
+        if valid is None or not os.path.exists(output_path):
+            print(f"Skipping unreadable or orphaned sidecar: {sidecar_path}")
+            continue
+        try:
+            finalise_results_file(output_path, valid)
+            results_writer.set_column(output_path, "valid", str(valid))
+            os.remove(sidecar_path)
+        except Exception as e:
+            print(f"Could not finalise {output_path}: {e}")
+
+
+def SaveResultsToCsv(filename, participant_id, all_results, global_start_time, global_end_time):
+    print("start to save result\n", all_results)
+    global index
+
+    output_path = open_results_file(filename, participant_id)
+    actual_filename = os.path.basename(output_path)
+    print(f"=== SAVING TO DIRECTORY: {os.path.dirname(output_path)} ===")
+
     print("participate_id=", participant_id, " actual_filename=", actual_filename)
     print(f"=== FULL PATH: {output_path} ===")
 
     # Define field names
-    fieldnames = [
-        "participant_id",
-        "trial_number",
-        "block",
-        "round",
-        "type",
-        "fixation_time",
-        "condition",
-        "version",
-        "difficulty",
-        "key_correct",
-        "hand",
-        "fixation_key_response",
-        "fixation_reaction_time_ms",
-        "stimulus_key_response",
-        "stimulus_reaction_time_ms",
-        "isi_key_response",
-        "isi_reaction_time_ms",
-        "correct",
-        "error_type",
-        "start_time",
-        "end_time"
-    ]
-
-    with open(output_path, mode="a", newline="") as file:
-        writer = csv.DictWriter(file, fieldnames=fieldnames)
-        if os.path.getsize(output_path) == 0:
-            writer.writeheader()
-
-        hand = None
-        if key_to_str(all_results["key_correct"]) == "v":
-            hand = "left"
-        elif key_to_str(all_results["key_correct"]) == "m":
-            hand = "right"
-        elif key_to_str(all_results["key_correct"]) == "d":
-            hand = "left"  # Assuming D is left hand
-        elif key_to_str(all_results["key_correct"]) == "k":
-            hand = "right"  # Assuming K is right hand
-
-        writer.writerow({
-            "participant_id": participant_id,
-            "trial_number": index + 1,
-            "block": all_results["block"],
-            "round": 0,
-            "type": all_results["type"],
-            "fixation_time": all_results["fixation_time"],
-            "condition": all_results["condition"],
-            "version": VERSION,
-            "difficulty": all_results["difficulty"],
-            "key_correct": key_to_str(all_results["key_correct"]),
-            "hand": hand,
-            "fixation_key_response": key_to_str(all_results["fixation_key_response"]),
-            "fixation_reaction_time_ms": all_results["fixation_reaction_time_ms"],
-            "stimulus_key_response": key_to_str(all_results["stimulus_key_response"]),
-            "stimulus_reaction_time_ms": all_results["stimulus_reaction_time_ms"],
-            "isi_key_response": key_to_str(all_results["isi_key_response"]),
-            "isi_reaction_time_ms": all_results["isi_reaction_time_ms"],
-            "correct": str(1 if all_results["correct"] else 0),
-            "error_type": all_results["error_type"],
-            "start_time": global_start_time,
-            "end_time": global_end_time
-        })
+    fieldnames = RESULTS_FIELDNAMES
+
+    hand = None
+    if key_to_str(all_results["key_correct"]) == "v":
+        hand = "left"
+    elif key_to_str(all_results["key_correct"]) == "m":
+        hand = "right"
+    elif key_to_str(all_results["key_correct"]) == "d":
+        hand = "left"  # Assuming D is left hand
+    elif key_to_str(all_results["key_correct"]) == "k":
+        hand = "right"  # Assuming K is right hand
+
+    row = {
+        "participant_id": participant_id,
+        "trial_number": index + 1,
+        "block": all_results["block"],
+        "round": round_tracker.next_round(all_results["block"]),
+        "type": all_results["type"],
+        "fixation_time": all_results["fixation_time"],
+        "condition": all_results["condition"],
+        "version": VERSION,
+        "difficulty": all_results["difficulty"],
+        "key_correct": key_to_str(all_results["key_correct"]),
+        "hand": hand,
+        "fixation_key_response": key_to_str(all_results["fixation_key_response"]),
+        "fixation_reaction_time_ms": all_results["fixation_reaction_time_ms"],
+        "stimulus_key_response": key_to_str(all_results["stimulus_key_response"]),
+        "stimulus_reaction_time_ms": all_results["stimulus_reaction_time_ms"],
+        "isi_key_response": key_to_str(all_results["isi_key_response"]),
+        "isi_reaction_time_ms": all_results["isi_reaction_time_ms"],
+        "correct": str(1 if all_results["correct"] else 0),
+        "error_type": all_results["error_type"],
+        "valid": "",  # settled at the end of the session (FinaliseResultsCsv)
+        "start_time": global_start_time,
+        "end_time": global_end_time,
+        "session_start": session_clock.anchor,
+        "fixation_onset_ns": session_clock.session_ns(all_results["fixation_onset_ns"]),
+        "fixation_response_ns": session_clock.session_ns(all_results["fixation_response_ns"]),
+        "stimulus_onset_ns": session_clock.session_ns(all_results["stimulus_onset_ns"]),
+        "stimulus_response_ns": session_clock.session_ns(all_results["stimulus_response_ns"]),
+        "isi_onset_ns": session_clock.session_ns(all_results["isi_onset_ns"]),
+        "isi_response_ns": session_clock.session_ns(all_results["isi_response_ns"]),
+        "realtime": realtime_summary()
+    }
+    # Queued for the results writer thread (the header is written first if the file is empty)
+    results_writer.write(output_path, [[row[k] for k in fieldnames]], header=fieldnames)
+    round_tracker.record_error(all_results["block"], all_results["error_type"])
 
     index = index + 1
     
-    print(f"=== FILE SAVED SUCCESSFULLY TO: {output_path} ===")
-    print(f"=== FILE SIZE: {os.path.getsize(output_path)} bytes ===")
+    print(f"=== TRIAL QUEUED FOR: {output_path} ===")
 
 
     # # Calculate Round
@@ -4,7 +4,7 @@ from meta_parameters import *
 from generate_trials import *
 from feedback import *
 from framework import *
-from motor import key_logging, run_trials
+from motor import key_logging, run_trials, warm_up_block
 
 class Sensorimotor:
     def __init__(self, screen, all_results, all_acc, version):
@@ -85,6 +85,16 @@ class Sensorimotor:
     def block4(self, screen):
         return run_trials(self.block4_trials, SM_RESPONSE_TIME, SM_ISI_TIME, "sensorimotor", self.read_sensorimotor_trial, screen)
 
+    # Warm-up on the page before a block
+    def warm_up_for(self, task_func):
+        trials = {
+            self.practice3_1: self.practice3_1_trials,
+            self.practice3_2: self.practice3_2_trials,
+            self.block3: self.block3_trials,
+            self.block4: self.block4_trials,
+        }[task_func]
+        warm_up_block(self.screen, task_func.__name__, "sensorimotor", [trial[1] for trial in trials])
+
     # Segment 1 practice 3-1 + practice 3-2
     def run_sm_segment1(self, next_segment_func):
         instruction_flow = []
@@ -103,7 +113,8 @@ class Sensorimotor:
             else:
                 next_segment_func()
 
-        run_instruction_sequence(self.screen, instruction_flow, self.all_results, self.all_acc, after_sm_segment1)
+        run_instruction_sequence(self.screen, instruction_flow, self.all_results, self.all_acc, after_sm_segment1,
+                                 warm_up=self.warm_up_for)
 
     # Segment 2: repeat practice 3-1 + practice 3-2 (if not pass accuracy requirements)
     def run_sm_segment2(self, next_segment_func, repeat_count=1):
@@ -123,7 +134,8 @@ class Sensorimotor:
             else:
                 next_segment_func()
 
-        run_instruction_sequence(self.screen, instruction_flow, self.all_results, self.all_acc, after_sm_segment2)
+        run_instruction_sequence(self.screen, instruction_flow, self.all_results, self.all_acc, after_sm_segment2,
+                                 warm_up=self.warm_up_for)
 
     # Segment 3: block 3 + block 4
     def run_sm_segment3(self, next_segment_func=None):
@@ -143,4 +155,5 @@ class Sensorimotor:
                 pygame.quit()
                 quit()
 
-        run_instruction_sequence(self.screen, instruction_flow, self.all_results, self.all_acc, after_sm_segment3)
\ No newline at end of file
+        run_instruction_sequence(self.screen, instruction_flow, self.all_results, self.all_acc, after_sm_segment3,
+                                 warm_up=self.warm_up_for)
\ No newline at end of file
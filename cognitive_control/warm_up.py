@@ -0,0 +1,88 @@
+import statistics
+import time
+
+import pygame
+
+
+class WarmUp:
+    def __init__(self):
+        """
+        Warm-up pass, run while the last instruction page before a block is on screen: the one-time costs
+        (first font lookup, first sound played, first smoothscale of a size, first video open, first append
+        to the results file) are paid there instead of inside the first timed trial.
+        run() times each step, onset() records the onset latency of every trial, and report() compares
+        the first trial of the block with the steady state.
+        """
+        self.steps = {}     # step name -> duration (ms), or "failed (...)"
+        self.total_ms = 0
+        self.onsets = []    # onset latency (ms) of every trial since run()
+        self._files = {}    # results file path -> append handle
+
+    def run(self, block, steps):
+        """
+        Run the warm-up of a block
+        :param steps: [(name, function), ...]; a step that fails is reported, not raised
+        :return: self.steps
+        """
+        self.steps = {}
+        self.onsets = []
+        start_ns = time.perf_counter_ns()
+        for name, step in steps:
+            step_ns = time.perf_counter_ns()
+            try:
+                step()
+                self.steps[name] = round((time.perf_counter_ns() - step_ns) / 1_000_000, 3)
+            except Exception as e:
+                self.steps[name] = f"failed ({e})"
+        self.total_ms = round((time.perf_counter_ns() - start_ns) / 1_000_000, 3)
+        print(f"Warm-up for {block} ({self.total_ms} ms): {self.steps}")
+        return self.steps
+
+    def onset(self, latency_ms):
+        """Record the onset latency of a trial (how late its stimulus reached the screen / speaker)"""
+        self.onsets.append(latency_ms)
+
+    def report(self, reset=True):
+        """
+        First trial vs steady state, since run():
+        {"warm_up_ms", "trials", "first_onset_ms", "steady_onset_ms" (median of the other trials), "steady_max_ms"}
+        """
+        first = self.onsets[0] if self.onsets else None
+        steady = self.onsets[1:]
+        summary = {
+            "warm_up_ms": self.total_ms,
+            "trials": len(self.onsets),
+            "first_onset_ms": round(first, 3) if first is not None else None,
+            "steady_onset_ms": round(statistics.median(steady), 3) if steady else None,
+            "steady_max_ms": round(max(steady), 3) if steady else None,
+        }
+        if reset:
+            self.onsets = []
+        return summary
+
+    def results_file(self, path):
+        """Append handle on a results file, opened once (by the warm-up) and kept open; flush after each row"""
+        handle = self._files.get(path)
+        if handle is None or handle.closed:
+            handle = open(path, mode="a", newline="")
+            self._files[path] = handle
+        return handle
+
+    def close(self):
+        """Close the results file handles"""
+        for handle in self._files.values():
+            handle.close()
+        self._files = {}
+
+
+def render_offscreen(screen, surfaces, fill=(0, 0, 0)):
+    """
+    Draw surfaces once on an offscreen copy of the screen (first blit / pixel format conversion of each),
+    without touching the display
+    :return: the offscreen surface
+    """
+    canvas = pygame.Surface(screen.get_size()).convert(screen)
+    canvas.fill(fill)
+    for surface in surfaces:
+        canvas.blit(surface, surface.get_rect(center=canvas.get_rect().center))
+    return canvas
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Offline export step: convert the results CSVs of every task (*/results/*.csv) into typed
+columnar files, so analysis runs load them without re-parsing the text and re-inferring
+the dtypes of every column on each run.
+
+- Parquet (one .parquet per results file) if pyarrow is installed, else numpy .npz.
+- Columns are typed once here: bool ("True" / "False"), int, float, or text; empty cells
+  are missing values (null in Parquet; NaN, or "" for text, in .npz).
+- block, condition, signal_detection and error_type are stored as categoricals: a
+  dictionary column in Parquet, integer codes (-1: missing) plus a "<column>__categories"
+  array in .npz.
+- Incremental: a manifest in the output directory records the mtime and size of every
+  converted file, and unchanged files are skipped (--force converts everything again).
+- Files are converted in parallel on a process pool.
+
+Usage: python export_columnar.py [--out columnar] [--format auto|parquet|npz] [--workers N] [--force]
+"""
+import argparse
+import csv
+import glob
+import importlib.util
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+OUT_DIR = os.path.join(ROOT_DIR, "columnar")
+MANIFEST_NAME = "manifest.json"
+# Stale copy of the IED task, not run anymore
+SKIP_DIRS = ("I:E-D",)
+# Columns stored as categoricals (few distinct values repeated on every row)
+CATEGORICAL_COLUMNS = ("block", "condition", "signal_detection", "error_type")
+
+INT_RE = re.compile(r"^[+-]?\d+$")
+BOOL_VALUES = {"True": True, "False": False}
+
+
+def find_results(root_dir=ROOT_DIR):
+    """Results CSVs of every task folder: [(task folder, path), ...]"""
+    found = []
+    for path in sorted(glob.glob(os.path.join(root_dir, "*", "results", "*.csv"))):
+        task = os.path.basename(os.path.dirname(os.path.dirname(path)))
+        if task not in SKIP_DIRS:
+            found.append((task, path))
+    return found
+
+
+def column_type(values):
+    """"bool", "int", "float" or "str" for the non-empty values of a column (all empty: "str")"""
+    present = [v for v in values if v != ""]
+    if not present:
+        return "str"
+    if all(v in BOOL_VALUES for v in present):
+        return "bool"
+    if all(INT_RE.match(v) for v in present):
+        return "int"
+    try:
+        for v in present:
+            float(v)
+        return "float"
+    except ValueError:
+        return "str"
+
+
+def read_columns(path):
+    """Header and {column: [text values]} of a results CSV (short rows are padded with empty cells)"""
+    with open(path, newline="", encoding="utf-8", errors="replace") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        columns = {name: [] for name in header}
+        for row in reader:
+            if not row or row == header:
+                continue
+            for i, name in enumerate(header):
+                columns[name].append(row[i] if i < len(row) else "")
+    return header, columns
+
+
+def convert_values(values, kind):
+    """Text values -> Python values of kind (None for empty cells)"""
+    if kind == "bool":
+        return [BOOL_VALUES[v] if v != "" else None for v in values]
+    if kind == "int":
+        return [int(v) if v != "" else None for v in values]
+    if kind == "float":
+        return [float(v) if v != "" else None for v in values]
+    return [v if v != "" else None for v in values]
+
+
+def write_parquet(out_path, header, columns):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    arrays = []
+    for name in header:
+        kind = column_type(columns[name])
+        values = convert_values(columns[name], kind)
+        array = pa.array(values, type={"bool": pa.bool_(), "int": pa.int64(), "float": pa.float64(),
+                                       "str": pa.string()}[kind])
+        if name in CATEGORICAL_COLUMNS:
+            array = array.dictionary_encode()
+        arrays.append(array)
+    pq.write_table(pa.Table.from_arrays(arrays, names=list(header)), out_path)
+
+
+def write_npz(out_path, header, columns):
+    import numpy as np
+
+    arrays = {"__columns__": np.array(header, dtype=str)}
+    for name in header:
+        text = columns[name]
+        kind = column_type(text)
+        if name in CATEGORICAL_COLUMNS:
+            categories = sorted({v for v in text if v != ""})
+            index = {v: i for i, v in enumerate(categories)}
+            arrays[name] = np.array([index.get(v, -1) for v in text], dtype=np.int16 if len(categories) < 32767 else np.int32)
+            arrays[name + "__categories"] = np.array(categories, dtype=str)
+            continue
+        values = convert_values(text, kind)
+        if kind == "str":
+            arrays[name] = np.array([v if v is not None else "" for v in values], dtype=str)
+        elif None in values:
+            # Missing values: NaN in a float column (bool / int columns with gaps become float)
+            arrays[name] = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+        else:
+            arrays[name] = np.array(values, dtype={"bool": np.bool_, "int": np.int64, "float": np.float64}[kind])
+    np.savez_compressed(out_path, **arrays)
+
+
+def convert_file(path, out_path, fmt):
+    """Convert one results CSV (run in a worker process); returns the number of rows"""
+    header, columns = read_columns(path)
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    tmp_path = out_path + ".tmp"
+    if fmt == "parquet":
+        write_parquet(tmp_path, header, columns)
+    else:
+        write_npz(tmp_path, header, columns)
+        tmp_path += ".npz"   # numpy appends the extension
+    os.replace(tmp_path, out_path)
+    return len(columns[header[0]]) if header else 0
+
+
+def choose_format(requested="auto"):
+    if requested != "auto":
+        return requested
+    return "parquet" if importlib.util.find_spec("pyarrow") is not None else "npz"
+
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(out_dir, manifest):
+    """Write the manifest (to a temporary file first, so an interrupted export never leaves it broken)"""
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def export_columnar(root_dir=ROOT_DIR, out_dir=OUT_DIR, fmt="auto", workers=None, force=False):
+    """
+    Convert the results files that changed since the last export
+    :param fmt: "parquet", "npz" or "auto" (Parquet if pyarrow is installed)
+    :param workers: Worker processes (default: one per core)
+    :param force: Convert every file, changed or not
+    :return: (converted, skipped, failed) counts
+    """
+    fmt = choose_format(fmt)
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = load_manifest(out_dir)
+
+    jobs = {}
+    skipped = 0
+    for task, path in find_results(root_dir):
+        key = os.path.relpath(path, root_dir)
+        stat = os.stat(path)
+        out_path = os.path.join(out_dir, task, os.path.splitext(os.path.basename(path))[0] + "." + fmt)
+        entry = manifest.get(key)
+        unchanged = (entry is not None and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size
+                     and entry["output"] == os.path.relpath(out_path, out_dir) and os.path.exists(out_path))
+        if unchanged and not force:
+            skipped += 1
+            continue
+        jobs[key] = (path, out_path, {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size,
+                                      "output": os.path.relpath(out_path, out_dir)})
+
+    converted = failed = 0
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(convert_file, path, out_path, fmt): key for key, (path, out_path, _) in jobs.items()}
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    rows = future.result()
+                except Exception as e:
+                    failed += 1
+                    print(f"Could not convert {key}: {e}")
+                    continue
+                manifest[key] = dict(jobs[key][2], rows=rows)
+                converted += 1
+        save_manifest(out_dir, manifest)
+
+    print(f"Columnar export ({fmt}) to {out_dir}: {converted} converted, {skipped} unchanged, {failed} failed")
+    return converted, skipped, failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert every task's results CSVs into typed columnar files")
+    parser.add_argument("--out", default=OUT_DIR, help="Output directory (default: ./columnar)")
+    parser.add_argument("--format", default="auto", choices=["auto", "parquet", "npz"])
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per core)")
+    parser.add_argument("--force", action="store_true", help="Convert unchanged files too")
+    args = parser.parse_args()
+    export_columnar(out_dir=args.out, fmt=args.format, workers=args.workers, force=args.force)
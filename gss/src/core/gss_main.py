@@ -1,6 +1,8 @@
 # ./src/core/gss_practice.py
 
+from __future__ import annotations
 from typing import Tuple
+import time
 import pygame
 import random
 from pathlib import Path
@@ -10,82 +12,30 @@ from utils.logger import get_logger
 from core.pygame_setup import toggle_full_screen, show_instruction_page, interactive_instruction_page
 from core.show_feedback import show_feedback
 from core.saves import update_save
+from utils.warm_up import warm_up
+from core.stimulus_cache import blit_stimulus, blit_marker
 
 logger = get_logger("./src/core/gss_practice") # create logger
 
+_count_font: pygame.font.Font | None = None    # font of the correct count shown after each interval
+
+
+def get_count_font() -> pygame.font.Font:
+    """Return the font of the correct count, loaded once (first loaded by the warm-up)."""
+    global _count_font
+    if _count_font is None:
+        _count_font = pygame.font.Font(None, cfg.FONT_SIZE)
+    return _count_font
+
+
 def load_gss_main_stimulus(screen: pygame.Surface, img_path: Path):
-    # Load image
-    p = Path(img_path)
-    if not p.exists():
-        logger.error(f"show_feedback: file not found -> {img_path}")
-        return None
-
-    try:
-        img = pygame.image.load(str(p)).convert_alpha()
-    except Exception as e:
-        logger.error(f"show_feedback: failed to load image -> {img_path} | {e}")
-        return None
-
-    # Resize image (max_W = w / max_H = h)
-    w, h = screen.get_size()
-    orig_w, orig_h = img.get_size()
-    if orig_w <= 0 or orig_h <= 0:
-        logger.error(f"show_feedback: invalid image size -> {img_path} ({orig_w}x{orig_h})")
-        return None
-
-    scale = min(w / orig_w, h / orig_h)
-    new_size = (max(1, int(orig_w * scale)), max(1, int(orig_h * scale)))
-    if new_size != (orig_w, orig_h):
-        img = pygame.transform.smoothscale(img, new_size)
-
-    # Compute center
-    cx, cy = w / 2, h / 2
-    center = (int(cx), int(cy))
-
-    # Fill the screen with gray background (avoid black boarder)
-    screen.fill(cfg.GRAY_RGB)
-
-    # Place image at target location
-    img_rect = img.get_rect(center=center)
-    screen.blit(img, img_rect)
+    # Blit the pre-scaled stimulus (decoded once per screen size in core.stimulus_cache)
+    blit_stimulus(screen, img_path)
 
 
 def load_gss_main_goal_marker(screen: pygame.Surface, img_path: Path):
-    screen.fill(cfg.GRAY_RGB)
-
-    # Load image
-    p = Path(img_path)
-    if not p.exists():
-        logger.error(f"show_feedback: file not found -> {img_path}")
-        return None
-
-    try:
-        img = pygame.image.load(str(p)).convert_alpha()
-    except Exception as e:
-        logger.error(f"show_feedback: failed to load image -> {img_path} | {e}")
-        return None
-
-    # Resize image (max_W = w / max_H = h)
-    max_W, max_H = cfg.MARKER_W, cfg.MARKER_H
-    orig_w, orig_h = img.get_size()
-    if orig_w <= 0 or orig_h <= 0:
-        logger.error(f"show_feedback: invalid image size -> {img_path} ({orig_w}x{orig_h})")
-        return None
-
-    scale = min(max_W / orig_w, max_H / orig_h)
-    new_size = (max(1, int(orig_w * scale)), max(1, int(orig_h * scale)))
-    if new_size != (orig_w, orig_h):
-        img = pygame.transform.smoothscale(img, new_size)
-
-    # Compute center
-    w, h = screen.get_size()
-    new_W, new_H = new_size
-    cx, cy = w / 2, h / 2
-    center = (int(cx), int(cy))
-
-    # Place image at target location
-    img_rect = img.get_rect(center=center)
-    screen.blit(img, img_rect)
+    # Blit the pre-scaled marker (decoded once per screen size in core.stimulus_cache)
+    blit_marker(screen, img_path)
 
 
 def gss_main_trial(screen: pygame.Surface, mode = str):
@@ -109,9 +59,11 @@ def gss_main_trial(screen: pygame.Surface, mode = str):
     start_at = pygame.time.get_ticks()
     end_marker_at = pygame.time.get_ticks() + cfg.MARKER_DISPLAY_DURATION
     trial_start_at = pygame.time.get_ticks() + cfg.MARKER_DISPLAY_DURATION
+    trial_start_ns = time.perf_counter_ns() + cfg.MARKER_DISPLAY_DURATION * 1_000_000
     end_phase_at = end_marker_at + interval_duration
 
     feedback_until = 0
+    onset_ns = None     # first flip of the displayed stimulus (None: not on screen yet)
     
     trial_count = 0
     correct_count = 0
@@ -196,6 +148,7 @@ def gss_main_trial(screen: pygame.Surface, mode = str):
                         correct_count += 1
                     
                     responded_at = pygame.time.get_ticks()
+                    responded_ns = time.perf_counter_ns()
                     reaction_time = responded_at - trial_start_at
 
                     pygame.event.clear()
@@ -212,6 +165,7 @@ def gss_main_trial(screen: pygame.Surface, mode = str):
                         correct_count += 1
                     
                     responded_at = pygame.time.get_ticks()
+                    responded_ns = time.perf_counter_ns()
                     reaction_time = responded_at - trial_start_at
 
                     pygame.event.clear()
@@ -228,6 +182,7 @@ def gss_main_trial(screen: pygame.Surface, mode = str):
                         correct_count += 1
                     
                     responded_at = pygame.time.get_ticks()
+                    responded_ns = time.perf_counter_ns()
                     reaction_time = responded_at - trial_start_at
 
                     pygame.event.clear()
@@ -245,16 +200,20 @@ def gss_main_trial(screen: pygame.Surface, mode = str):
                         correct_count += 1
                     
                     responded_at = pygame.time.get_ticks()
+                    responded_ns = time.perf_counter_ns()
                     reaction_time = responded_at - trial_start_at
 
                     pygame.event.clear()
 
+        first_frame = False
         if responded:
-            update_save("gss practice", "gss practice", mode, correct, reaction_time, displayed_stimulus_path)    # phase, condition, difficulty, correct, reaction_time, stimulus_path
+            update_save("gss practice", "gss practice", mode, correct, reaction_time, displayed_stimulus_path, trial_start_ns, responded_ns)    # phase, condition, difficulty, correct, reaction_time, stimulus_path, onset_ns, response_ns
             
             displayed_stimulus = _update_displayed_stimulus(displayed_stimulus)
             displayed_stimulus_path = displayed_stimulus[0]
             trial_start_at = pygame.time.get_ticks()
+            trial_start_ns = time.perf_counter_ns()
+            onset_ns = None
             logger.debug(f"displaying stimulus {displayed_stimulus_path}")
             
             responded = False
@@ -262,8 +221,12 @@ def gss_main_trial(screen: pygame.Surface, mode = str):
         
         else:
             load_gss_main_stimulus(screen, displayed_stimulus_path)
+            first_frame = onset_ns is None
 
         pygame.display.flip()
+        if first_frame:
+            onset_ns = time.perf_counter_ns()    # first frame of this stimulus on screen
+            warm_up.onset((onset_ns - trial_start_ns) / 1_000_000)
         clock.tick(60)
     
     return correct_count
@@ -283,8 +246,7 @@ def run_gss_main(screen: pygame.Surface):
             show_instruction_page(screen, cfg.MAIN_INTERVAL)
             pygame.display.flip()
 
-            font = pygame.font.Font(None, cfg.FONT_SIZE)
-            text_surface = font.render(str(correct_count), True, cfg.BLACK_RGB)
+            text_surface = get_count_font().render(str(correct_count), True, cfg.BLACK_RGB)
             screen.blit(text_surface, cfg.MAIN_INTERVAL_TEXT_POS)
             pygame.display.flip()
         
@@ -304,8 +266,7 @@ def run_gss_main(screen: pygame.Surface):
             show_instruction_page(screen, cfg.MAIN_INTERVAL)
             pygame.display.flip()
 
-            font = pygame.font.Font(None, cfg.FONT_SIZE)
-            text_surface = font.render(str(correct_count), True, cfg.BLACK_RGB)
+            text_surface = get_count_font().render(str(correct_count), True, cfg.BLACK_RGB)
             screen.blit(text_surface, cfg.MAIN_INTERVAL_TEXT_POS)
             pygame.display.flip()
             
@@ -326,8 +287,7 @@ def run_gss_main(screen: pygame.Surface):
             show_instruction_page(screen, cfg.MAIN_INTERVAL)
             pygame.display.flip()
 
-            font = pygame.font.Font(None, cfg.FONT_SIZE)
-            text_surface = font.render(str(correct_count), True, cfg.BLACK_RGB)
+            text_surface = get_count_font().render(str(correct_count), True, cfg.BLACK_RGB)
             screen.blit(text_surface, cfg.MAIN_INTERVAL_TEXT_POS)
             pygame.display.flip()
             
@@ -1,6 +1,7 @@
 # ./src/core/mapping_practice.py
 
 from typing import Tuple
+import time
 import pygame
 import random
 from pathlib import Path
@@ -10,44 +11,14 @@ from utils.logger import get_logger
 from core.pygame_setup import toggle_full_screen, show_instruction_page
 from core.show_feedback import show_feedback
 from core.saves import update_save
+from utils.warm_up import warm_up
+from core.stimulus_cache import blit_stimulus
 
 logger = get_logger("./src/core/mapping_practice") # create logger
 
 def load_mapping_stimulus(screen: pygame.Surface, img_path: Path):
-    # Load image
-    p = Path(img_path)
-    if not p.exists():
-        logger.error(f"show_feedback: file not found -> {img_path}")
-        return None
-
-    try:
-        img = pygame.image.load(str(p)).convert_alpha()
-    except Exception as e:
-        logger.error(f"show_feedback: failed to load image -> {img_path} | {e}")
-        return None
-
-    # Resize image (max_W = w / max_H = h)
-    w, h = screen.get_size()
-    orig_w, orig_h = img.get_size()
-    if orig_w <= 0 or orig_h <= 0:
-        logger.error(f"show_feedback: invalid image size -> {img_path} ({orig_w}x{orig_h})")
-        return None
-
-    scale = min(w / orig_w, h / orig_h)
-    new_size = (max(1, int(orig_w * scale)), max(1, int(orig_h * scale)))
-    if new_size != (orig_w, orig_h):
-        img = pygame.transform.smoothscale(img, new_size)
-
-    # Compute center
-    cx, cy = w / 2, h / 2
-    center = (int(cx), int(cy))
-
-    # Fill the screen with gray background (avoid black boarder)
-    screen.fill(cfg.GRAY_RGB)
-
-    # Place image at target location
-    img_rect = img.get_rect(center=center)
-    screen.blit(img, img_rect)
+    # Blit the pre-scaled stimulus (decoded once per screen size in core.stimulus_cache)
+    blit_stimulus(screen, img_path)
 
 
 def mapping_trial(screen: pygame.Surface):
@@ -66,9 +37,11 @@ def mapping_trial(screen: pygame.Surface):
     logger.info(f"interval duration is set to {interval_duration}")
     start_at = pygame.time.get_ticks()
     trial_start_at = pygame.time.get_ticks()
+    trial_start_ns = time.perf_counter_ns()
     end_phase_at = start_at + interval_duration
 
     feedback_until = 0
+    onset_ns = None     # first flip of the displayed stimulus (None: not on screen yet)
 
     # Helper function: randomly select a different stimulus to prevent facilitation from immediate repetition
     def _update_displayed_stimulus(displayed_stimulus):
@@ -109,6 +82,7 @@ def mapping_trial(screen: pygame.Surface):
                     logger.debug(f"{correct} | displayed {displayed_stimulus} | answered blue")
 
                     responded_at = pygame.time.get_ticks()
+                    responded_ns = time.perf_counter_ns()
                     reaction_time = responded_at - trial_start_at
 
                     pygame.event.clear()
@@ -122,6 +96,7 @@ def mapping_trial(screen: pygame.Surface):
                     logger.debug(f"{correct} | displayed {displayed_stimulus} | answered green")
 
                     responded_at = pygame.time.get_ticks()
+                    responded_ns = time.perf_counter_ns()
                     reaction_time = responded_at - trial_start_at
 
                     pygame.event.clear()
@@ -135,6 +110,7 @@ def mapping_trial(screen: pygame.Surface):
                     logger.debug(f"{correct} | displayed {displayed_stimulus} | answered yellow")
 
                     responded_at = pygame.time.get_ticks()
+                    responded_ns = time.perf_counter_ns()
                     reaction_time = responded_at - trial_start_at
 
                     pygame.event.clear()
@@ -148,19 +124,23 @@ def mapping_trial(screen: pygame.Surface):
                     logger.debug(f"{correct} | displayed {displayed_stimulus} | answered red")
 
                     responded_at = pygame.time.get_ticks()
+                    responded_ns = time.perf_counter_ns()
                     reaction_time = responded_at - trial_start_at
 
                     pygame.event.clear()
 
+        first_frame = False
         if responded:
             if now <= feedback_until:
                 now = pygame.time.get_ticks()
                 show_feedback(screen, correct)
             else:
-                update_save("mapping practice", "mapping practice", "practice", correct, reaction_time, displayed_stimulus)    # phase, condition, difficulty, correct, reaction_time, stimulus_path
+                update_save("mapping practice", "mapping practice", "practice", correct, reaction_time, displayed_stimulus, trial_start_ns, responded_ns)    # phase, condition, difficulty, correct, reaction_time, stimulus_path, onset_ns, response_ns
 
                 displayed_stimulus = _update_displayed_stimulus(displayed_stimulus)
                 trial_start_at = pygame.time.get_ticks()
+                trial_start_ns = time.perf_counter_ns()
+                onset_ns = None
                 logger.debug(f"displaying stimulus {displayed_stimulus}")
 
                 responded = False
@@ -169,8 +149,12 @@ def mapping_trial(screen: pygame.Surface):
         
         else:
             load_mapping_stimulus(screen, displayed_stimulus)
+            first_frame = onset_ns is None
 
         pygame.display.flip()
+        if first_frame:
+            onset_ns = time.perf_counter_ns()    # first frame of this stimulus on screen
+            warm_up.onset((onset_ns - trial_start_ns) / 1_000_000)
         clock.tick(60)
 
 
@@ -6,6 +6,7 @@ from pathlib import Path
 
 import utils.config as cfg
 from utils.logger import get_logger
+from core.stimulus_cache import build_stimulus_cache, cached_size
 
 
 logger = get_logger("./src/core/pygame_setup") # create logger
@@ -27,6 +28,9 @@ def toggle_full_screen(screen: pygame.Surface) -> pygame.Surface:
     flags = pygame.FULLSCREEN if cfg._is_fullscreen else 0
     # Reset display mode (recommended way in Pygame to toggle fullscreen)
     screen = pygame.display.set_mode((cfg.SCREEN_WIDTH, cfg.SCREEN_HEIGHT), flags)
+    # Re-scale cached stimuli if the resolution changed
+    if screen.get_size() != cached_size():
+        build_stimulus_cache(screen)
     if cfg._is_fullscreen:
         logger.info(f"Entered fullscreen")
     else:
@@ -2,9 +2,15 @@
 from pathlib import Path
 import csv
 import datetime
+from typing import Optional
 
 from utils import config as cfg
 from utils.logger import get_logger
+from utils.session_clock import session_clock
+from utils.realtime import realtime_summary
+from utils.session_writer import SessionWriter
+from utils.results_writer import results_writer
+from utils.session_store import open_store
 
 
 logger = get_logger("./src/core/saves")    # create logger
@@ -22,6 +28,10 @@ COLUMNS = [
     "stimulus_path",        # file path to the stimulus
     "start_time",           # global start time
     "end_time",             # global end time
+    "session_start",        # wall-clock time of the session timebase origin (ISO 8601)
+    "onset_ns",             # stimulus onset in ns since the session origin
+    "response_ns",          # response in ns since the session origin
+    "realtime",             # real-time process mode applied at launch (see utils/realtime.py)
 ]
 
 
@@ -37,27 +47,49 @@ def create_save() -> None:
     logger.info(f"Results file created at {csv_path}")
 
 
-def update_save(phase: str, condition: str, difficulty: str, correct: bool, reaction_time: int, stimulus_path: Path) -> None:
-    """Append one trial result to the participant's CSV file."""
+# Session writer opened by open_save() (one participant per session)
+_writer: Optional[SessionWriter] = None
+
+
+def open_save() -> SessionWriter:
+    """Return the session writer on the participant's results CSV, opening it (and creating the file) once."""
+    global _writer
     csv_path = cfg.RESULTS_DIR / f"{cfg.PID}_GSS_results.csv"
+    if _writer is None or _writer.closed or _writer.requested_path != csv_path:
+        if _writer is not None:
+            _writer.close()
+        if results_writer.store is None:
+            # Launch option --results-db [PATH]: rows also go to a SQLite database
+            results_writer.store = open_store("GSS", cfg.RESULTS_DIR)
+        _writer = SessionWriter(csv_path, COLUMNS, "trial_number", cfg.RESULTS_DURABILITY)
+    return _writer
 
-    # Ensure file exists with header
-    if not csv_path.exists():
-        create_save()
 
-    # Count existing trials (exclude header)
-    with csv_path.open("r", newline="", encoding="utf-8") as rf:
-        reader = csv.reader(rf)
-        rows = list(reader)
-        has_header = bool(rows) and rows[0] == COLUMNS
-        data_rows = rows[1:] if has_header else rows
-        next_trial_number = len(data_rows) + 1
+def end_block_save() -> None:
+    """Apply the durability policy at the end of a block (flush, or fsync)."""
+    if _writer is not None:
+        _writer.end_block()
+
+
+def close_save() -> None:
+    """Close the session writer opened by open_save()."""
+    global _writer
+    if _writer is not None:
+        _writer.close()
+        _writer = None
+
 
+def update_save(phase: str, condition: str, difficulty: str, correct: bool, reaction_time: int, stimulus_path: Path,
+                onset_ns: Optional[int] = None, response_ns: Optional[int] = None) -> None:
+    """
+    Append one trial result to the participant's CSV file.
+    onset_ns / response_ns are time.perf_counter_ns() stamps, written on the session timebase.
+    """
     # Prepare one record
     record = {
         "participant_id": cfg.PID,
         "version": cfg.VERSION,
-        "trial_number": next_trial_number,
+        "trial_number": "",     # sequential across the session, filled in by the session writer
         "phase": phase,
         "condition": condition,
         "difficulty": difficulty,
@@ -66,14 +98,13 @@ def update_save(phase: str, condition: str, difficulty: str, correct: bool, reac
         "stimulus_path": stimulus_path,
         "start_time": cfg.START_TIME,
         "end_time": datetime.datetime.now().isoformat(),
+        "session_start": session_clock.anchor,
+        "onset_ns": session_clock.session_ns(onset_ns),
+        "response_ns": session_clock.session_ns(response_ns),
+        "realtime": realtime_summary(),
     }
 
     # Write record in fixed column order
-    write_header = not has_header
-    with csv_path.open("a", newline="", encoding="utf-8") as wf:
-        writer = csv.DictWriter(wf, fieldnames=COLUMNS)
-        if write_header:
-            writer.writeheader()
-        writer.writerow({k: record.get(k, "") for k in COLUMNS})
+    open_save().append(record)
     
     logger.info(f"Results file updated")
@@ -10,10 +10,37 @@ from core.pygame_setup import toggle_full_screen, show_instruction_page
 from core.mapping_practice import run_mapping
 from core.stroop_practice import run_stroop
 from core.gss_practice import run_gss_practice
-from core.gss_main import run_gss_main
+from core.gss_main import run_gss_main, get_count_font
+from core.saves import open_save, end_block_save
+from core.stimulus_cache import cached_surfaces
+from utils.warm_up import warm_up, render_offscreen
 
 logger = get_logger("./src/core/show_instructions")    # create logger
 
+
+def _phase_pages() -> dict:
+    """Return the instruction pages a phase starts after: page -> phase name."""
+    return {
+        cfg.MAPPING_INS: "mapping practice",
+        cfg.STROOP_INS: "stroop practice",
+        cfg.GSS_PRACTICE_INS: "gss practice",
+        cfg.GSS_MAIN_SEC1_INS: "gss main 1",
+        cfg.GSS_MAIN_SEC2_INS: "gss main 2",
+        cfg.GSS_MAIN_SEC3_INS: "gss main 3",
+    }
+
+
+def warm_up_phase(screen: pygame.Surface, phase: str) -> None:
+    """
+    Warm-up pass for a phase, run while the instruction page before it is on screen:
+    fonts loaded, cached stimuli blitted once offscreen, and the results file opened.
+    """
+    warm_up.run(phase, [
+        ("fonts", get_count_font),
+        ("render", lambda: render_offscreen(screen, cached_surfaces(screen), cfg.GRAY_RGB)),
+        ("results_file", open_save),
+    ])
+
 def show_instructions(screen: pygame.Surface) -> None:
     """
     Show instructions
@@ -25,6 +52,8 @@ def show_instructions(screen: pygame.Surface) -> None:
     img_path = cfg.INSTRUCTIONS[current_page]
     lock_until = pygame.time.get_ticks() + cfg.MIN_READING_TIME
     logger.info(f"Displaying instruction page 1")
+    phase_pages = _phase_pages()
+    warmed_up_page = None
 
     while running:
 
@@ -67,6 +96,10 @@ def show_instructions(screen: pygame.Surface) -> None:
                             # GSS main
                             elif current_page == cfg.GSS_MAIN_SEC1_INS or current_page == cfg.GSS_MAIN_SEC2_INS or current_page == cfg.GSS_MAIN_SEC3_INS:
                                 run_gss_main(screen)
+
+                            if current_page in phase_pages:
+                                end_block_save()    # flush (or fsync) the results per cfg.RESULTS_DURABILITY
+                                logger.info(f"Onset latency, first trial vs steady state | phase={phase_pages[current_page]}: {warm_up.report()}")
                         
                         else:
                             logger.info(f"No more insturction page")
@@ -79,4 +112,10 @@ def show_instructions(screen: pygame.Surface) -> None:
         show_instruction_page(screen, img_path)
         
         pygame.display.flip()
+
+        # SPACE on this page starts a phase: prepare it while the page is read
+        if current_page + 1 in phase_pages and warmed_up_page != current_page:
+            warmed_up_page = current_page
+            warm_up_phase(screen, phase_pages[current_page + 1])
+
         clock.tick(60)
\ No newline at end of file
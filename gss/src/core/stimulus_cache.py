@@ -0,0 +1,151 @@
+# ./src/core/stimulus_cache.py
+from __future__ import annotations
+from typing import Dict, List, Tuple
+import pygame
+from pathlib import Path
+
+import utils.config as cfg
+from utils.logger import get_logger
+
+
+logger = get_logger("./src/core/stimulus_cache") # create logger
+
+
+# ---------- Cache state ----------
+_stimuli: Dict[Path, pygame.Surface] = {}       # full-screen stimuli (mapping / stroop / gss), scaled to the screen size
+_markers: Dict[Path, pygame.Surface] = {}       # goal markers (accuracy / speed), scaled to MARKER_W x MARKER_H
+_feedback: Dict[Path, pygame.Surface] = {}      # feedback images (correct / incorrect), scaled to FB_W x FB_H
+_cached_size: Tuple[int, int] | None = None     # screen size the cache was built for
+
+
+def _load_scaled(img_path: Path, max_w: int, max_h: int) -> pygame.Surface | None:
+    """
+    Decode an image once and scale it to fit within (max_w, max_h), keeping the aspect ratio
+    """
+    p = Path(img_path)
+    if not p.exists():
+        logger.error(f"stimulus_cache: file not found -> {img_path}")
+        return None
+
+    try:
+        img = pygame.image.load(str(p)).convert_alpha()
+    except Exception as e:
+        logger.error(f"stimulus_cache: failed to load image -> {img_path} | {e}")
+        return None
+
+    orig_w, orig_h = img.get_size()
+    if orig_w <= 0 or orig_h <= 0:
+        logger.error(f"stimulus_cache: invalid image size -> {img_path} ({orig_w}x{orig_h})")
+        return None
+
+    scale = min(max_w / orig_w, max_h / orig_h)
+    new_size = (max(1, int(orig_w * scale)), max(1, int(orig_h * scale)))
+    if new_size != (orig_w, orig_h):
+        img = pygame.transform.smoothscale(img, new_size)
+
+    return img
+
+
+def build_stimulus_cache(screen: pygame.Surface) -> None:
+    """
+    Decode and scale every GSS stimulus / marker / feedback image once for the current screen size
+    - Stimuli: MAPPING_STIMULI, STROOP_STIMULI, GSS_PRACTICE_STIMULI (fit to screen)
+    - Markers: ACCURACY_MARKER, SPEED_MARKER (fit to MARKER_W x MARKER_H)
+    - Feedback: FB_CORRECT, FB_INCORRECT (fit to FB_W x FB_H)
+    """
+    global _cached_size
+
+    _stimuli.clear()
+    _markers.clear()
+    _feedback.clear()
+
+    w, h = screen.get_size()
+
+    stimulus_paths = list(cfg.MAPPING_STIMULI)
+    stimulus_paths += [stimulus[0] for stimulus in cfg.STROOP_STIMULI]
+    stimulus_paths += [stimulus[0] for stimulus in cfg.GSS_PRACTICE_STIMULI]
+
+    for img_path in stimulus_paths:
+        if img_path in _stimuli:
+            continue
+        img = _load_scaled(img_path, w, h)
+        if img is not None:
+            _stimuli[img_path] = img
+
+    for img_path in (cfg.ACCURACY_MARKER, cfg.SPEED_MARKER):
+        img = _load_scaled(img_path, cfg.MARKER_W, cfg.MARKER_H)
+        if img is not None:
+            _markers[img_path] = img
+
+    for img_path in (cfg.FB_CORRECT, cfg.FB_INCORRECT):
+        img = _load_scaled(img_path, cfg.FB_W, cfg.FB_H)
+        if img is not None:
+            _feedback[img_path] = img
+
+    _cached_size = (w, h)
+    logger.info(f"Stimulus cache built for {w} x {h}: {len(_stimuli)} stimuli, {len(_markers)} markers, {len(_feedback)} feedback images")
+
+
+def cached_size() -> Tuple[int, int] | None:
+    """Return the screen size the cache was last built for (None if not built yet)."""
+    return _cached_size
+
+
+def cached_surfaces(screen: pygame.Surface) -> List[pygame.Surface]:
+    """Return every cached stimulus / marker / feedback surface (building the cache first if needed)."""
+    _ensure_cache(screen)
+    return list(_stimuli.values()) + list(_markers.values()) + list(_feedback.values())
+
+
+def _ensure_cache(screen: pygame.Surface) -> None:
+    """Rebuild the cache if it has not been built yet or the screen size has changed."""
+    if _cached_size != screen.get_size():
+        build_stimulus_cache(screen)
+
+
+def _get(cache: Dict[Path, pygame.Surface], screen: pygame.Surface, img_path: Path, max_w: int, max_h: int) -> pygame.Surface | None:
+    """Look up a cached surface; paths that are not part of the preloaded sets are loaded and cached on first use."""
+    _ensure_cache(screen)
+    img = cache.get(img_path)
+    if img is None:
+        img = _load_scaled(img_path, max_w, max_h)
+        if img is not None:
+            cache[img_path] = img
+    return img
+
+
+def blit_stimulus(screen: pygame.Surface, img_path: Path) -> None:
+    """
+    Display a full-screen stimulus (for 1 frame only, need to be used within a while loop)
+    """
+    w, h = screen.get_size()
+    img = _get(_stimuli, screen, img_path, w, h)
+    if img is None:
+        return None
+
+    # Fill the screen with gray background (avoid black boarder)
+    screen.fill(cfg.GRAY_RGB)
+
+    # Place image at target location
+    img_rect = img.get_rect(center=(w // 2, h // 2))
+    screen.blit(img, img_rect)
+
+
+def blit_marker(screen: pygame.Surface, img_path: Path) -> None:
+    """
+    Display a goal marker at the center of a gray screen (for 1 frame only, need to be used within a while loop)
+    """
+    screen.fill(cfg.GRAY_RGB)
+
+    img = _get(_markers, screen, img_path, cfg.MARKER_W, cfg.MARKER_H)
+    if img is None:
+        return None
+
+    w, h = screen.get_size()
+    img_rect = img.get_rect(center=(w // 2, h // 2))
+    screen.blit(img, img_rect)
+
+
+def get_feedback(screen: pygame.Surface, img_path: Path) -> pygame.Surface | None:
+    """Return the pre-scaled feedback image (correct / incorrect)."""
+    return _get(_feedback, screen, img_path, cfg.FB_W, cfg.FB_H)
@@ -7,7 +7,8 @@ import datetime
 import utils.config as cfg
 from utils.logger import get_logger
 from core.pygame_setup import init_display, get_participant_id, _compute_version_from_pid
-from core.saves import create_save
+from core.saves import create_save, close_save
+from core.stimulus_cache import build_stimulus_cache
 from core.show_instructions import show_instructions
 from core.pygame_setup import show_instruction_page
 
@@ -30,6 +31,7 @@ def run() -> None:
     cfg.START_TIME = datetime.datetime.now().isoformat()
 
     screen = init_display()
+    build_stimulus_cache(screen)    # decode & scale all stimuli once (rebuilt on resolution change)
     cfg.PID = get_participant_id(screen)
     create_save()
 
@@ -45,5 +47,6 @@ def run() -> None:
     # run_gss_main(screen)
 
     show_instructions(screen)
+    close_save()
 
     pygame.quit()
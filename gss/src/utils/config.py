@@ -30,6 +30,10 @@ if MODE == "test":
 else:
     INTERVALS = [8000, 9000, 10000, 11000, 12000]
 
+# results file durability (see utils/session_writer.py):
+# "trial" = flush every trial / "fsync" = flush every trial, fsync at block end
+RESULTS_DURABILITY = "trial"
+
 # ---------- Pygame UI settings ----------
 
 # color
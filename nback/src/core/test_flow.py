@@ -1,7 +1,8 @@
 # ./src/core/test_flow.py
 
+import time
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 import pygame
 
@@ -15,11 +16,33 @@ from core.pull_stimuli import (
 from utils import feedback as fb
 from utils.feedback import show_feedback_timed
 from utils.enums import Answer, Status
-from utils.saves import update_save
+from utils.saves import open_save, update_save, end_block_save
+from utils.instruction_pager import InstructionPager
+from utils.scheduler import PresentationScheduler
+from utils.input_capture import InputCapture, KEY_DOWN, POLL_INTERVAL_S
+from utils.gc_quiet import GCQuiet
+from utils.warm_up import WarmUp, render_offscreen
 
 # ---------- Internal state ----------
 _is_fullscreen = True                           # acticate in full-screen mode
 logger = get_logger("./src/core/test_flow")     # create logger
+_instruction_pager: Optional[InstructionPager] = None   # shared by all show_instructions() calls
+_input = InputCapture()                         # timestamped key input during stimulus blocks
+_gc_quiet = GCQuiet()                           # no garbage collection from stimulus onset to response
+_warm_up = WarmUp()                             # one-time costs paid on the page before each block
+
+
+class PreparedBlock(NamedTuple):
+    """Everything a block needs before its first trial (see _prepare_block)."""
+    level: int                                  # n-back level
+    seq: List[Path]                             # stimulus paths
+    ans: List[Answer]                           # correct answer of each trial
+    background: pygame.Surface                  # mapping background, scaled to the screen
+    region: pygame.Rect                         # stimulus region (pixels)
+    stimuli: Dict[Path, Optional[pygame.Surface]]   # path -> stimulus scaled to the region (None: failed to load)
+
+
+_prepared: Dict[str, PreparedBlock] = {}        # block name -> block prepared by the warm-up
 
 
 def toggle_full_screen(screen: pygame.Surface) -> pygame.Surface:
@@ -56,6 +79,32 @@ def _instructions_dir() -> Path:
     return cfg.RESOURCES_DIR / "instructions"
 
 
+def _get_instruction_pager(screen: pygame.Surface) -> InstructionPager:
+    """
+    Return the pager over all instruction pages (index = page number).
+    It is shared by the 1/2/3-back sections, so the first pages of the next section are
+    already decoded while the last page of the current one is showing.
+    """
+    global _instruction_pager
+    if _instruction_pager is None:
+        dir_path = _instructions_dir()
+        sw, sh = screen.get_size()   # fullscreen and windowed mode share the same size
+
+        def _load_page(img_path: Path) -> Optional[pygame.Surface]:
+            """Load one page and scale it proportionally to fit the screen (runs on the pager thread)."""
+            if not img_path.exists():
+                return None
+            image = pygame.image.load(str(img_path))
+            iw, ih = image.get_size()
+            scale = min(sw / iw, sh / ih)
+            return pygame.transform.smoothscale(image, (max(1, int(iw * scale)), max(1, int(ih * scale))))
+
+        _instruction_pager = InstructionPager(
+            [dir_path / f"{idx}.jpg" for idx in range(cfg.INSTRUCTION_COUNT + 1)], _load_page
+        )
+    return _instruction_pager
+
+
 def _load_mapping_surface(screen: pygame.Surface) -> pygame.Surface:
     """Load ./resources/mapping/1.png and scale to full screen as background."""
     path = cfg.RESOURCES_DIR / "mapping" / "1.png"
@@ -85,6 +134,114 @@ def _blit_into_region(screen: pygame.Surface, img: pygame.Surface, region: pygam
     screen.blit(scaled, dst.topleft)
 
 
+def _block_level(block_name: str) -> int:
+    """Return the n-back level of a block (1 for unknown blocks)."""
+    block_to_level = {
+        # 1-back
+        "PRACTICE1": 1, "BLOCK1": 1, "BLOCK2": 1, "BLOCK3": 1,
+        # 2-back
+        "PRACTICE2": 2, "BLOCK4": 2, "BLOCK5": 2, "BLOCK6": 2,
+        # 3-back
+        "PRACTICE3": 3, "BLOCK7": 3, "BLOCK8": 3, "BLOCK9": 3,
+    }
+    level = block_to_level.get((block_name or "").upper())
+    if level is None:
+        logger.warning(f"Unknown block_name '{block_name}', defaulting to 1-back.")
+        level = 1
+    return level
+
+
+def _prepare_block(screen: pygame.Surface, block_name: str, trial_num: int) -> PreparedBlock:
+    """
+    Build the stimulus sequence of a block, and load and scale its background and stimuli
+    (each distinct stimulus once), so that no image is decoded or scaled during the trials.
+
+    Args:
+        screen: display surface
+        block_name: block identifier (PRACTICE1, BLOCK1, etc.)
+        trial_num: number of trials
+
+    Returns:
+        PreparedBlock: the prepared block
+
+    Raises:
+        Exception: the sequence could not be built or the background could not be loaded
+    """
+    level = _block_level(block_name)
+    builders = {
+        1: pull_stimuli_1back,
+        2: pull_stimuli_2back,
+        3: pull_stimuli_3back,
+    }
+    seq, ans = builders[level](trial_num)  # seq -> List[Path], ans -> List[Answer]
+
+    # Mapping background scaled to the screen
+    mapping_path = cfg.RESOURCES_DIR / "mapping" / "1.png"
+    bg = pygame.image.load(str(mapping_path)).convert()
+    sw, sh = screen.get_width(), screen.get_height()
+    bg_scaled = pygame.transform.smoothscale(bg, (sw, sh))
+
+    # Region where stimuli should be placed (normalized coords)
+    l_n, t_n, w_n, h_n = cfg.STIM_REGION
+    region = pygame.Rect(int(l_n * sw), int(t_n * sh), int(w_n * sw), int(h_n * sh))
+
+    # Each stimulus fitted into the region (keep aspect ratio)
+    stimuli: Dict[Path, Optional[pygame.Surface]] = {}
+    for path in seq:
+        if path in stimuli:
+            continue
+        try:
+            stim = pygame.image.load(str(path)).convert_alpha()
+            iw, ih = stim.get_width(), stim.get_height()
+            scale = min(region.width / max(iw, 1), region.height / max(ih, 1))
+            new_size = (max(1, int(iw * scale)), max(1, int(ih * scale)))
+            stimuli[path] = pygame.transform.smoothscale(stim, new_size)
+        except Exception as e:
+            logger.warning(f"Failed to load {path}: {e}")
+            stimuli[path] = None
+    return PreparedBlock(level, seq, ans, bg_scaled, region, stimuli)
+
+
+def _block_pages() -> Dict[int, Tuple[str, int]]:
+    """Return the instruction pages that start a block: page -> (block name, trial count)."""
+    pages = {}
+    for nm in ("PRACTICE1", "BLOCK1", "BLOCK2", "BLOCK3",
+               "PRACTICE2", "BLOCK4", "BLOCK5", "BLOCK6",
+               "PRACTICE3", "BLOCK7", "BLOCK8", "BLOCK9"):
+        count_name = f"{nm}_COUNT"
+        if hasattr(cfg, nm) and hasattr(cfg, count_name):
+            pages[getattr(cfg, nm)] = (nm, getattr(cfg, count_name))
+    return pages
+
+
+def _warm_up_block(screen: pygame.Surface, block_name: str, trial_num: int, pid: str) -> None:
+    """
+    Warm-up pass for a block, run while the instruction page that starts it is on screen:
+    stimuli loaded and scaled, feedback overlays rendered, first blits done offscreen,
+    and the results file opened.
+    """
+    def _stimuli() -> None:
+        _prepared[block_name] = _prepare_block(screen, block_name, trial_num)
+
+    def _render() -> None:
+        prepared = _prepared.get(block_name)
+        surfaces = fb.prepare_feedback()
+        if prepared is not None:
+            surfaces = [prepared.background] + [s for s in prepared.stimuli.values() if s is not None] + surfaces
+        render_offscreen(screen, surfaces, cfg.GRAY_RGB)
+
+    _warm_up.run(block_name, [
+        ("stimuli", _stimuli),
+        ("render", _render),
+        ("results_file", lambda: open_save(pid)),
+    ])
+
+
+def _remaining_ms(deadline_ns: int) -> int:
+    """Whole milliseconds left until a perf_counter_ns deadline (0 once it has passed)."""
+    return max(0, (deadline_ns - time.perf_counter_ns()) // 1_000_000)
+
+
 def _calculate_signal_detection(condition: str, key_response: str) -> str:
     """
     Calculate signal detection theory classification for trial analysis.
@@ -129,10 +286,15 @@ def show_instructions(screen: pygame.Surface, pid: str, start_time: str, start_p
         raise FileNotFoundError(f"Instructions folder not found: {dir_path}")
 
     clock = pygame.time.Clock()
+    # Pages are decoded in the background a few pages ahead of the one on screen
+    pager = _get_instruction_pager(screen)
+    pager.prefetch(start_page)
+    block_pages = _block_pages()
 
     for idx in range(start_page, end_page):
         img_path = dir_path / f"{idx}.jpg"
-        if not img_path.exists():
+        image = pager.get(idx) if idx < len(pager) else None
+        if image is None:
             # If image is missing, show placeholder text (prevent crash)
             screen.fill(cfg.GRAY_RGB)
             font = pygame.font.SysFont(None, cfg.FONT_SIZE)
@@ -143,15 +305,16 @@ def show_instructions(screen: pygame.Surface, pid: str, start_time: str, start_p
             # Allow immediate skip to next page
             wait_ms = 0
         else:
-            # Load and scale image
-            image = pygame.image.load(str(img_path)).convert()
-            image = _scale_and_center(image, screen)
             screen.fill(cfg.GRAY_RGB)
             _blit_centered(screen, image)
             pygame.display.flip()
             wait_ms = cfg.MIN_READING_TIME
             logger.info(f"Instruction page {idx} displayed")
 
+        # SPACE on this page starts a block: prepare it while the page is read
+        if idx in block_pages and block_pages[idx][0] not in _prepared:
+            _warm_up_block(screen, *block_pages[idx], pid)
+
         # Timing and wait for SPACE
         start = pygame.time.get_ticks()
         while True:
@@ -165,7 +328,7 @@ def show_instructions(screen: pygame.Surface, pid: str, start_time: str, start_p
                         # Allow toggling fullscreen anytime before turning page
                         screen = toggle_full_screen(screen)
                         # Redraw current page (toggling fullscreen clears the screen)
-                        if img_path.exists():
+                        if image is not None:
                             screen.fill(cfg.GRAY_RGB)
                             _blit_centered(screen, image)
                         else:
@@ -222,6 +385,8 @@ def show_instructions(screen: pygame.Surface, pid: str, start_time: str, start_p
             # If break triggered: exit waiting loop for this page
             break
 
+    logger.info(f"Instruction pages {start_page}-{end_page - 1}: {pager.stats()}")
+
 def play_stimuli(trial_num: int, screen: pygame.Surface, block_name: str, pid: str, start_time: str) -> None:
     """
     Present a sequence of stimuli for the given block, with extended response window.
@@ -246,8 +411,8 @@ def play_stimuli(trial_num: int, screen: pygame.Surface, block_name: str, pid: s
     4) Smart feedback timing: immediate feedback when responded, delayed 1000ms feedback for missed targets.
     """
     # --- Keyboard throttle (accept at most 1 key per 100 ms) ---
-    THROTTLE_MS = 100
-    last_accept_ms = -THROTTLE_MS  # timestamp (ms) of last accepted key
+    THROTTLE_NS = 100_000_000
+    last_accept_ns = -THROTTLE_NS  # timestamp (perf_counter_ns) of last accepted key
 
     # Practice blocks set
     name = (block_name or "").upper()
@@ -255,15 +420,18 @@ def play_stimuli(trial_num: int, screen: pygame.Surface, block_name: str, pid: s
     is_practice = name in PRACTICE_BLOCKS
 
     # --- Per-trial timing state (set/reset each trial) ---
-    _trial_stim_on_ms = 0        # timestamp when current stimulus appeared on screen
+    _trial_stim_on_ns = 0        # onset (perf_counter_ns) of the current stimulus
     _feedback_requested = False  # flag indicating feedback should be displayed
     _feedback_type = None        # type of feedback to show ("correct"/"incorrect")
     response_time_ms = None      # measured response time from stimulus onset to keypress
+    response_ns = None           # capture timestamp (perf_counter_ns) of the accepted keypress
 
 
     def _poll_events_throttled() -> None:
         """
-        Poll pygame events once with a 100 ms keyboard throttle.
+        Poll the input capture once with a 100 ms keyboard throttle.
+        Key presses are timed by their capture timestamp, so response_time_ms has
+        sub-millisecond resolution and does not depend on when this is called.
 
         - If multiple key presses occur within the 100 ms window,
           only the FIRST is handled; the rest are cleared.
@@ -271,34 +439,35 @@ def play_stimuli(trial_num: int, screen: pygame.Surface, block_name: str, pid: s
         - SPACE is handled only once per trial (gated by _is_space_pressed).
         - Records feedback requirements for later display during appropriate timing phases.
         """
-        nonlocal last_accept_ms, _is_space_pressed, _trial_stim_on_ms, response_time_ms, _feedback_requested, _feedback_type
-        for ev in pygame.event.get():
-            if ev.type == pygame.QUIT:
-                if logger:
-                    logger.info("QUIT received during stimuli; exiting playback.")
-                raise SystemExit
+        nonlocal last_accept_ns, _is_space_pressed, response_time_ms, response_ns, _feedback_requested, _feedback_type
+        _input.poll()
+        if _input.quit_requested:
+            if logger:
+                logger.info("QUIT received during stimuli; exiting playback.")
+            raise SystemExit
 
-            if ev.type == pygame.KEYDOWN:
-                now = pygame.time.get_ticks()
+        for rec in _input.events():
+            if rec.action == KEY_DOWN:
                 # Enforce 100 ms lock
-                if (now - last_accept_ms) < THROTTLE_MS:
+                if (rec.ns - last_accept_ns) < THROTTLE_NS:
                     # Too soon: drop further KEYDOWNs in this window
-                    pygame.event.clear(pygame.KEYDOWN)
+                    _input.clear()
                     return
 
                 # Accept this key
-                last_accept_ms = now
+                last_accept_ns = rec.ns
 
-                if ev.key == pygame.K_ESCAPE:
+                if rec.key == pygame.K_ESCAPE:
                     if logger:
                         logger.info("ESC pressed: toggling full screen.")
                     toggle_full_screen(screen)
 
-                elif ev.key == pygame.K_SPACE:
+                elif rec.key == pygame.K_SPACE:
                     # Process SPACE keypress only once per trial to prevent multiple responses
                     if not _is_space_pressed:
                         _is_space_pressed = True
-                        response_time_ms = now - _trial_stim_on_ms
+                        response_time_ms = round((rec.ns - _trial_stim_on_ns) / 1_000_000, 3)
+                        response_ns = rec.ns
                         
                         # Evaluate response correctness and prepare feedback for practice blocks
                         if cfg.ANSWER == Answer.SAME:
@@ -318,237 +487,218 @@ def play_stimuli(trial_num: int, screen: pygame.Surface, block_name: str, pid: s
                                 _feedback_type = "incorrect"
 
                 # Debug hotkeys for testing feedback display
-                elif ev.key == pygame.K_c:
+                elif rec.key == pygame.K_c:
                     fb.show_feedback(screen, "correct")
-                elif ev.key == pygame.K_i:
+                elif rec.key == pygame.K_i:
                     fb.show_feedback(screen, "incorrect")
 
                 # After handling the first accepted key in this window,
                 # clear any remaining KEYDOWNs to enforce "first only"
-                pygame.event.clear(pygame.KEYDOWN)
+                _input.clear()
                 return
 
-    # ---- Decide n-back level from block name ----
-    block_to_level = {
-        # 1-back
-        "PRACTICE1": 1, "BLOCK1": 1, "BLOCK2": 1, "BLOCK3": 1,
-        # 2-back
-        "PRACTICE2": 2, "BLOCK4": 2, "BLOCK5": 2, "BLOCK6": 2,
-        # 3-back
-        "PRACTICE3": 3, "BLOCK7": 3, "BLOCK8": 3, "BLOCK9": 3,
-    }
-    level = block_to_level.get(name)
-    if level is None:
-        if logger:
-            logger.warning(f"Unknown block_name '{block_name}', defaulting to 1-back.")
-        level = 1
-
-    builders = {
-        1: pull_stimuli_1back,
-        2: pull_stimuli_2back,
-        3: pull_stimuli_3back,
-    }
-    builder = builders[level]
+    # ---- Sequence, background and scaled stimuli (prepared by the warm-up, or now) ----
+    prepared = _prepared.pop(block_name, None)
+    if prepared is None or len(prepared.seq) != trial_num:
+        try:
+            prepared = _prepare_block(screen, block_name, trial_num)
+        except Exception as e:
+            if logger:
+                logger.exception(f"Failed to prepare stimuli for {block_name}: {e}")
+            return
+    level, seq, ans, bg_scaled, region = prepared.level, prepared.seq, prepared.ans, prepared.background, prepared.region
 
     if logger:
         logger.info(f"Play stimuli start | block={block_name} (n-back={level}), trials={trial_num}")
 
-    # ---- Build the stimulus sequence ----
-    try:
-        seq, ans = builder(trial_num)  # seq -> List[Path], ans -> List[Answer]
-    except Exception as e:
-        if logger:
-            logger.exception(f"Failed to build stimuli for {block_name}: {e}")
-        return
-
-    # ---- Load & scale mapping background to screen ----
-    try:
-        mapping_path = cfg.RESOURCES_DIR / "mapping" / "1.png"
-        bg = pygame.image.load(str(mapping_path)).convert()
-    except Exception as e:
-        if logger:
-            logger.exception(f"Cannot load mapping background: {e}")
-        return
-
-    sw, sh = screen.get_width(), screen.get_height()
-    bg_scaled = pygame.transform.smoothscale(bg, (sw, sh))
-
-    # Region where stimuli should be placed (normalized coords)
-    l_n, t_n, w_n, h_n = cfg.STIM_REGION
-    region = pygame.Rect(int(l_n * sw), int(t_n * sh), int(w_n * sw), int(h_n * sh))
-
     # ---- Present each stimulus ----
-    for i, path in enumerate(seq, start=1):
-        # Initialize trial state variables for response tracking and feedback control
-        _is_space_pressed = False
-        _feedback_requested = False
-        _feedback_type = None
-        response_time_ms = None
-        cfg.STATUS = Status.NO_RESPONSE
-
-        # Set up correct answer for the current trial
-        # (ans is 0-based; enumerate starts at 1)
-        try:
-            cfg.ANSWER = ans[i - 1]
-        except Exception:
-            cfg.ANSWER = None  # fallback if indexing fails
-        if logger:
-            logger.info(f"Trial {i}: stimulus = {str(path)}")
-            logger.info(f"Trial {i}: correct answer = {cfg.ANSWER}")
+    # Stimulus onsets are absolute deadlines: onset(i+1) = onset(i) + stimulus + ISI
+    scheduler = PresentationScheduler()
+    stimulus_ns = scheduler.duration_ns(cfg.STIMULUS_DURATION_MS)
+    trial_ns = stimulus_ns + scheduler.duration_ns(cfg.ISI_MS)
+    next_onset_ns: Optional[int] = None
+
+    # Only QUIT/KEYDOWN/KEYUP reach the SDL queue during the block
+    _input.clear()
+    with _input:
+        for i, path in enumerate(seq, start=1):
+            # Initialize trial state variables for response tracking and feedback control
+            _is_space_pressed = False
+            _feedback_requested = False
+            _feedback_type = None
+            response_time_ms = None
+            response_ns = None
+            cfg.STATUS = Status.NO_RESPONSE
+
+            # Set up correct answer for the current trial
+            # (ans is 0-based; enumerate starts at 1)
+            try:
+                cfg.ANSWER = ans[i - 1]
+            except Exception:
+                cfg.ANSWER = None  # fallback if indexing fails
+            if logger:
+                logger.info(f"Trial {i}: stimulus = {str(path)}")
+                logger.info(f"Trial {i}: correct answer = {cfg.ANSWER}")
 
-        # Draw background first
-        screen.blit(bg_scaled, (0, 0))
+            _gc_quiet.begin()
+            draw_start_ns = time.perf_counter_ns()
 
-        try:
-            stim = pygame.image.load(str(path)).convert_alpha()
-            # Fit the stimulus into the region (keep aspect ratio)
-            iw, ih = stim.get_width(), stim.get_height()
-            scale = min(region.width / max(iw, 1), region.height / max(ih, 1))
-            new_size = (max(1, int(iw * scale)), max(1, int(ih * scale)))
-            stim_scaled = pygame.transform.smoothscale(stim, new_size)
+            # Draw background first
+            screen.blit(bg_scaled, (0, 0))
 
-            # Center in region
-            dx = region.x + (region.width - stim_scaled.get_width()) // 2
-            dy = region.y + (region.height - stim_scaled.get_height()) // 2
-            screen.blit(stim_scaled, (dx, dy))
-        except Exception as e:
-            if logger:
-                logger.warning(f"Trial {i}: failed to load {path}: {e}")
-            pygame.draw.rect(screen, cfg.YELLOW_RGB, region, width=2)
+            stim_scaled = prepared.stimuli.get(path)
+            if stim_scaled is not None:
+                # Center in region
+                dx = region.x + (region.width - stim_scaled.get_width()) // 2
+                dy = region.y + (region.height - stim_scaled.get_height()) // 2
+                screen.blit(stim_scaled, (dx, dy))
+            else:
+                if logger:
+                    logger.warning(f"Trial {i}: no stimulus for {path}")
+                pygame.draw.rect(screen, cfg.YELLOW_RGB, region, width=2)
 
-        pygame.display.flip()
+            # Flip at the end of the previous trial's response window
+            # (the first trial has no deadline: its latency is counted from the start of drawing)
+            planned_ns = next_onset_ns if next_onset_ns is not None else draw_start_ns
+            stim_onset_ns = scheduler.flip("stimulus", next_onset_ns)
+            next_onset_ns = stim_onset_ns + trial_ns
+            _warm_up.onset((stim_onset_ns - planned_ns) / 1_000_000)
 
-        if logger:
-            try:
-                fname = path.name
-            except Exception:
-                fname = "N/A"
-            logger.debug(f"Trial {i}/{len(seq)} | show: {fname} for {cfg.STIMULUS_DURATION_MS} ms")
-
-        # --- Response window implementation with precise feedback timing control ---
-        # Total response window spans from stimulus onset to next stimulus presentation
-        trial_start = pygame.time.get_ticks()
-        _trial_stim_on_ms = trial_start  # Reference point for response time calculation
-        total_response_window = cfg.STIMULUS_DURATION_MS + cfg.ISI_MS  # Complete response duration
+            if logger:
+                try:
+                    fname = path.name
+                except Exception:
+                    fname = "N/A"
+                logger.debug(f"Trial {i}/{len(seq)} | show: {fname} for {cfg.STIMULUS_DURATION_MS} ms")
+
+            # --- Response window implementation with precise feedback timing control ---
+            # Total response window spans from stimulus onset to the next stimulus' scheduled onset
+            # (the same perf_counter deadline the scheduler flips at)
+            _trial_stim_on_ns = stim_onset_ns  # Reference point for response time calculation
+            window_end_ns = next_onset_ns
         
-        # Phase 1: Stimulus display period - maintain exact 500ms timing regardless of responses
-        while (pygame.time.get_ticks() - trial_start) < cfg.STIMULUS_DURATION_MS:
-            _poll_events_throttled()
-            # Response detection occurs but feedback is deferred to maintain stimulus timing
-            pygame.time.delay(5)
-
-        # Phase 2: ISI period with feedback display and continued response monitoring
-        screen.fill(cfg.GRAY_RGB)
-        pygame.display.flip()
-        isi_background = screen.copy()
+            # Phase 1: Stimulus display period - maintain exact 500ms timing regardless of responses
+            # (responses are polled while waiting, but feedback is deferred to maintain stimulus timing)
+            # Phase 2: ISI period with feedback display and continued response monitoring
+            screen.fill(cfg.GRAY_RGB)
+            scheduler.flip("isi", stim_onset_ns + stimulus_ns, poll=_poll_events_throttled)
+            isi_background = screen.copy()
+            if _is_space_pressed:
+                _gc_quiet.release()  # response already captured: collect at the start of the ISI
         
-        # Display feedback immediately if response occurred during stimulus or ISI phases
-        if _feedback_requested and is_practice:
-            elapsed_time = pygame.time.get_ticks() - trial_start
-            remaining_window = total_response_window - elapsed_time
-            feedback_duration = min(cfg.FEEDBACK_DURATION, remaining_window)
+            # Display feedback immediately if response occurred during stimulus or ISI phases
+            if _feedback_requested and is_practice:
+                remaining_window = _remaining_ms(window_end_ns)
+                feedback_duration = min(cfg.FEEDBACK_DURATION, remaining_window)
             
-            show_feedback_timed(screen, _feedback_type, feedback_duration, isi_background)
-            _feedback_requested = False  # Prevent duplicate feedback display
+                show_feedback_timed(screen, _feedback_type, feedback_duration, isi_background)
+                _feedback_requested = False  # Prevent duplicate feedback display
         
-        # Continue response collection during remaining ISI period
-        while (pygame.time.get_ticks() - trial_start) < total_response_window:
-            _poll_events_throttled()
+            # Continue response collection during remaining ISI period
+            while time.perf_counter_ns() < window_end_ns:
+                _poll_events_throttled()
             
-            # Handle feedback for responses that occur during ISI period
-            if _feedback_requested and is_practice:
-                elapsed_time = pygame.time.get_ticks() - trial_start
-                remaining_window = total_response_window - elapsed_time
-                feedback_duration = min(cfg.FEEDBACK_DURATION, remaining_window)
+                # Handle feedback for responses that occur during ISI period
+                if _feedback_requested and is_practice:
+                    remaining_window = _remaining_ms(window_end_ns)
+                    feedback_duration = min(cfg.FEEDBACK_DURATION, remaining_window)
                 
-                show_feedback_timed(screen, _feedback_type, feedback_duration, isi_background)
-                _feedback_requested = False
-                break
+                    show_feedback_timed(screen, _feedback_type, feedback_duration, isi_background)
+                    _feedback_requested = False
+                    break
             
-            pygame.time.delay(5)
+                time.sleep(POLL_INTERVAL_S)
 
-        # --- Trial data analysis and recording ---
-        # Extract stimulus filename for data tracking
-        try:
-            stimuli_filename = path.name
-        except Exception:
-            stimuli_filename = "unknown_stimulus"
+            # Response window closed: collect now if the ISI did not
+            _gc_quiet.release()
+
+            # --- Trial data analysis and recording ---
+            # Extract stimulus filename for data tracking
+            try:
+                stimuli_filename = path.name
+            except Exception:
+                stimuli_filename = "unknown_stimulus"
         
-        # Determine condition based on n-back rule evaluation
-        if cfg.ANSWER == Answer.SAME:
-            condition = "match"
-            key_correct = "space"
-        elif cfg.ANSWER == Answer.DIFFERENT or cfg.ANSWER == Answer.NOGO:
-            condition = "nonmatch"  
-            key_correct = "none"
-        else:
-            # Handle cases where answer classification is undefined
-            condition = "null"
-            key_correct = "none"
+            # Determine condition based on n-back rule evaluation
+            if cfg.ANSWER == Answer.SAME:
+                condition = "match"
+                key_correct = "space"
+            elif cfg.ANSWER == Answer.DIFFERENT or cfg.ANSWER == Answer.NOGO:
+                condition = "nonmatch"  
+                key_correct = "none"
+            else:
+                # Handle cases where answer classification is undefined
+                condition = "null"
+                key_correct = "none"
             
-        # Record actual participant response
-        key_response = "space" if _is_space_pressed else "none"
+            # Record actual participant response
+            key_response = "space" if _is_space_pressed else "none"
         
-        # Evaluate response correctness based on expected vs actual behavior
-        if condition == "null":
-            # Trials that cannot be evaluated due to insufficient n-back history
-            correct_response = "null"
-        elif (condition == "match" and key_response == "space") or (condition == "nonmatch" and key_response == "none"):
-            correct_response = "correct"
-        else:
-            correct_response = "incorrect"
+            # Evaluate response correctness based on expected vs actual behavior
+            if condition == "null":
+                # Trials that cannot be evaluated due to insufficient n-back history
+                correct_response = "null"
+            elif (condition == "match" and key_response == "space") or (condition == "nonmatch" and key_response == "none"):
+                correct_response = "correct"
+            else:
+                correct_response = "incorrect"
         
-        # Calculate theoretical trial duration from stimulus onset to ISI completion
-        trial_duration = cfg.STIMULUS_DURATION_MS + cfg.ISI_MS  # Fixed duration: 500ms + 2500ms = 3000ms
-
-        # Calculate signal detection classification for d-prime analysis
-        signal_detection = _calculate_signal_detection(condition, key_response)
-
-        # Record comprehensive trial data for behavioral analysis
-        update_save(
-            participant_id=pid,
-            block=block_name,
-            stimuli_path=stimuli_filename,
-            condition=condition,
-            key_correct=key_correct,
-            key_response=key_response,
-            correct=correct_response,
-            response_time_ms=response_time_ms,
-            trial_duration_ms=trial_duration,
-            start_time=start_time,
-            trial_position=i,
-            n_back_level=level,
-            signal_detection=signal_detection,
-        )
-
-        # Provide delayed feedback for missed targets during practice blocks
-        if not _is_space_pressed and condition == "match" and is_practice:
-            elapsed_time = pygame.time.get_ticks() - trial_start
-            delay_until_feedback = max(0, total_response_window - cfg.FEEDBACK_DURATION - elapsed_time)
+            # Calculate theoretical trial duration from stimulus onset to ISI completion
+            trial_duration = cfg.STIMULUS_DURATION_MS + cfg.ISI_MS  # Fixed duration: 500ms + 2500ms = 3000ms
+
+            # Calculate signal detection classification for d-prime analysis
+            signal_detection = _calculate_signal_detection(condition, key_response)
+
+            # Record comprehensive trial data for behavioral analysis
+            update_save(
+                participant_id=pid,
+                block=block_name,
+                stimuli_path=stimuli_filename,
+                condition=condition,
+                key_correct=key_correct,
+                key_response=key_response,
+                correct=correct_response,
+                response_time_ms=response_time_ms,
+                trial_duration_ms=trial_duration,
+                start_time=start_time,
+                trial_position=i,
+                n_back_level=level,
+                signal_detection=signal_detection,
+                onset_ns=stim_onset_ns,
+                response_ns=response_ns,
+            )
+
+            # Provide delayed feedback for missed targets during practice blocks
+            if not _is_space_pressed and condition == "match" and is_practice:
+                delay_until_feedback = max(0, _remaining_ms(window_end_ns) - cfg.FEEDBACK_DURATION)
             
-            # Schedule feedback appearance in final portion of response window
-            if delay_until_feedback > 0:
-                pygame.time.delay(delay_until_feedback)
+                # Schedule feedback appearance in final portion of response window
+                if delay_until_feedback > 0:
+                    pygame.time.delay(delay_until_feedback)
             
-            # Display feedback for remaining available time
-            final_elapsed = pygame.time.get_ticks() - trial_start
-            remaining_window = max(0, total_response_window - final_elapsed)
-            feedback_duration = min(cfg.FEEDBACK_DURATION, remaining_window)
+                # Display feedback for remaining available time
+                remaining_window = _remaining_ms(window_end_ns)
+                feedback_duration = min(cfg.FEEDBACK_DURATION, remaining_window)
             
-            if feedback_duration > 0:
-                show_feedback_timed(screen, "incorrect", feedback_duration, isi_background)
+                if feedback_duration > 0:
+                    show_feedback_timed(screen, "incorrect", feedback_duration, isi_background)
+
+            # Provide feedback for correct non-responses during practice blocks  
+            elif not _is_space_pressed and condition == "nonmatch" and is_practice:
+                remaining_window = _remaining_ms(window_end_ns)
+                feedback_duration = min(cfg.FEEDBACK_DURATION, remaining_window)
+                if feedback_duration > 0:
+                    show_feedback_timed(screen, "correct", feedback_duration, isi_background)
 
-        # Provide feedback for correct non-responses during practice blocks  
-        elif not _is_space_pressed and condition == "nonmatch" and is_practice:
-            elapsed_time = pygame.time.get_ticks() - trial_start
-            remaining_window = total_response_window - elapsed_time
-            feedback_duration = min(cfg.FEEDBACK_DURATION, remaining_window)
-            if feedback_duration > 0:
-                show_feedback_timed(screen, "correct", feedback_duration, isi_background)
+            # Reset trial state for next stimulus presentation
+            cfg.STATUS = Status.NO_RESPONSE
 
-        # Reset trial state for next stimulus presentation
-        cfg.STATUS = Status.NO_RESPONSE
+    # Block done: flush (or fsync) the results per cfg.RESULTS_DURABILITY
+    end_block_save()
 
     # Log completion of all stimuli presentation for this block
     if logger:
+        logger.info(f"Screen onsets (planned vs actual) | block={block_name}: {scheduler.report()}")
+        logger.info(f"Garbage collection pauses | block={block_name}: {_gc_quiet.report()}")
+        logger.info(f"Onset latency, first trial vs steady state | block={block_name}: {_warm_up.report()}")
         logger.info(f"Play stimuli end | block={block_name}")
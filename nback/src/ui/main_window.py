@@ -117,4 +117,5 @@ def run() -> None:
     show_instructions(screen, pid, start_time, cfg.START_PAGE_2BACK, cfg.START_PAGE_3BACK)
     # 3-back
     show_instructions(screen, pid, start_time, cfg.START_PAGE_3BACK, cfg.INSTRUCTION_COUNT + 1)
+    saves.close_save()
     pygame.quit()
@@ -24,6 +24,10 @@ MODE = "actual"
 FEEDBACK_ICON_RATIO = 0.12      # feedback icon size (ratio)
 FEEDBACK_ICON_MAX_PX = 160      # feedback icon size (pixel)
 
+# results file durability (see utils/session_writer.py):
+# "trial" = flush every trial / "fsync" = flush every trial, fsync at block end
+RESULTS_DURABILITY = "trial"
+
 # test mode (for testing only)
 if MODE == "test":
     MIN_READING_TIME = 100      # minimum reading time per page (ms)
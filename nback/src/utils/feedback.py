@@ -6,6 +6,8 @@ Feedback overlay renderer for n-back.
 
 Public API:
     show_feedback(screen, status)
+    show_feedback_timed(screen, status, max_duration_ms, background_surface)
+    prepare_feedback() -> list[pygame.Surface]
 
 - status:
     "correct"   -> show feedback_correct.png at the designated position
@@ -26,6 +28,7 @@ from utils import config as cfg
 # ----------------------- Module-level cache -----------------------
 
 _ICON_CACHE: dict[str, pygame.Surface] = {}
+_FEEDBACK_CACHE: dict[str, pygame.Surface] = {}   # status -> scaled icon / rendered text
 _FEEDBACK_DIR = cfg.RESOURCES_DIR / "feedback"
 _OK_NAME = "feedback_correct.png"
 _BAD_NAME = "feedback_incorrect.png"
@@ -96,8 +99,38 @@ def _draw_timeout_text(screen: pygame.Surface) -> None:
     screen.blit(text_surf, pos)
 
 
+def _feedback_surface(status: str) -> pygame.Surface:
+    """
+    Return the overlay for a status ("correct", "incorrect", "timeout"):
+    the scaled icon or the rendered "Too Slow" text, built once per status.
+    """
+    s = status.lower().strip()
+    if s in _FEEDBACK_CACHE:
+        return _FEEDBACK_CACHE[s]
+    if s == "correct":
+        surf = _scale_to_feedback_size(_load_icon(_OK_NAME))
+    elif s == "incorrect":
+        surf = _scale_to_feedback_size(_load_icon(_BAD_NAME))
+    elif s == "timeout":
+        surf = pygame.font.Font(None, cfg.FONT_SIZE).render("Too Slow", True, cfg.YELLOW_RGB)
+    else:
+        raise ValueError(f"Unknown feedback status: {status!r}")
+    _FEEDBACK_CACHE[s] = surf
+    return surf
+
+
 # ----------------------- Public API -----------------------
 
+def prepare_feedback() -> list[pygame.Surface]:
+    """
+    Load, scale and render every feedback overlay ahead of a block (see utils/warm_up.py).
+
+    Returns:
+        list[pygame.Surface]: the overlays for "correct", "incorrect" and "timeout"
+    """
+    return [_feedback_surface(status) for status in ("correct", "incorrect", "timeout")]
+
+
 def show_feedback_timed(screen: pygame.Surface, status: str, max_duration_ms: int, background_surface: pygame.Surface = None) -> None:
     """
     Display feedback overlay for a controlled duration with optional background preservation.
@@ -114,19 +147,8 @@ def show_feedback_timed(screen: pygame.Surface, status: str, max_duration_ms: in
         - Returns immediately after duration expires, allowing precise timing control.
         - If background_surface is provided, redraws it periodically to maintain consistency.
     """
-    # Prepare feedback icon or text surface
-    feedback_surface = None
-    if status.lower().strip() == "correct":
-        icon = _scale_to_feedback_size(_load_icon(_OK_NAME))
-        feedback_surface = icon
-    elif status.lower().strip() == "incorrect":
-        icon = _scale_to_feedback_size(_load_icon(_BAD_NAME))
-        feedback_surface = icon
-    elif status.lower().strip() == "timeout":
-        font = pygame.font.Font(None, cfg.FONT_SIZE)
-        feedback_surface = font.render("Too Slow", True, cfg.YELLOW_RGB)
-    else:
-        raise ValueError(f"Unknown feedback status: {status!r}")
+    # Prepare feedback icon or text surface (built once per status)
+    feedback_surface = _feedback_surface(status)
 
     feedback_pos = _feedback_anchor(feedback_surface.get_size())
     start_time = pygame.time.get_ticks()
@@ -186,4 +208,4 @@ def show_feedback(screen: pygame.Surface, status: str, duration_ms: int = None)
     feedback_duration = duration_ms if duration_ms is not None else cfg.FEEDBACK_DURATION
     pygame.time.delay(feedback_duration)
 
-__all__ = ["show_feedback", "show_feedback_timed"]
+__all__ = ["show_feedback", "show_feedback_timed", "prepare_feedback"]
@@ -0,0 +1,79 @@
+# ./src/utils/gc_quiet.py
+"""
+Garbage-collection-quiet presentation spans.
+
+Public API:
+    GCQuiet()
+    gc_quiet.begin() / gc_quiet.release() / with gc_quiet: ...
+    gc_quiet.report() / gc_quiet.close()
+
+- begin() disables Python's cyclic garbage collector for a presentation-critical span
+  (stimulus onset to response); release() re-enables it and collects right away, in a
+  gap where a pause of a few ms is harmless.
+- Every collection is timed through gc.callbacks and attributed to a span or a gap,
+  so report() shows whether any pause still landed inside a span.
+"""
+
+import gc
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class GCQuiet:
+    def __init__(self) -> None:
+        self.quiet = False
+        self.pauses: List[Tuple[int, float, bool]] = []   # (generation, pause ms, inside a span)
+        self._was_enabled = True
+        self._start_ns: Optional[int] = None
+        gc.callbacks.append(self._on_gc)
+
+    def _on_gc(self, phase: str, info: Dict[str, int]) -> None:
+        if phase == "start":
+            self._start_ns = time.perf_counter_ns()
+        elif self._start_ns is not None:
+            self.pauses.append((info["generation"], (time.perf_counter_ns() - self._start_ns) / 1_000_000, self.quiet))
+            self._start_ns = None
+
+    def begin(self) -> None:
+        """Start a presentation-critical span: no automatic collection until release()."""
+        if not self.quiet:
+            self._was_enabled = gc.isenabled()
+            gc.disable()
+            self.quiet = True
+
+    def release(self) -> None:
+        """End the span (if one is open) and collect now."""
+        if self.quiet:
+            self.quiet = False
+            if self._was_enabled:
+                gc.enable()
+            gc.collect()
+
+    def __enter__(self) -> "GCQuiet":
+        self.begin()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        self.release()
+        return False
+
+    def report(self, reset: bool = True) -> Dict[str, float]:
+        """Collections inside / outside the spans: counts, total and longest pause (ms)."""
+        in_window = [pause_ms for _, pause_ms, quiet in self.pauses if quiet]
+        in_gap = [pause_ms for _, pause_ms, quiet in self.pauses if not quiet]
+        summary = {
+            "in_window": len(in_window),
+            "in_window_max_ms": round(max(in_window, default=0), 3),
+            "in_gap": len(in_gap),
+            "in_gap_total_ms": round(sum(in_gap), 3),
+            "in_gap_max_ms": round(max(in_gap, default=0), 3),
+        }
+        if reset:
+            self.pauses = []
+        return summary
+
+    def close(self) -> None:
+        """Stop timing collections."""
+        self.release()
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
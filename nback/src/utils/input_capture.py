@@ -0,0 +1,77 @@
+# ./src/utils/input_capture.py
+"""
+Timestamped keyboard input capture.
+
+Public API:
+    InputCapture(event_types)
+    with capture: ... capture.poll() / capture.events() / capture.clear()
+
+- Every KEYDOWN/KEYUP is timestamped with time.perf_counter_ns() as it is taken off the
+  SDL queue, instead of with pygame.time.get_ticks() (1 ms resolution) whenever the
+  presentation loop happens to look at it.
+- SDL only lets the window's thread pump events, so poll() is called from the response
+  waits every POLL_INTERVAL_S rather than from a separate thread.
+- As a context manager, the SDL queue is restricted to event_types for the duration of
+  a block (no mouse motion, window or text events to sift through).
+"""
+
+import time
+from typing import Iterable, List, NamedTuple
+
+import pygame
+
+KEY_DOWN = "down"
+KEY_UP = "up"
+POLL_INTERVAL_S = 0.0005    # pause between two polls of the SDL queue (0.5 ms)
+
+
+class KeyRecord(NamedTuple):
+    key: int        # pygame key code
+    action: str     # KEY_DOWN / KEY_UP
+    ns: int         # time.perf_counter_ns() when the event was taken off the SDL queue
+
+
+class InputCapture:
+    def __init__(self, event_types: Iterable[int] = (pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP)) -> None:
+        """
+        Args:
+            event_types: event types let through to the SDL queue while capturing
+        """
+        self.event_types = list(event_types)
+        self.records: List[KeyRecord] = []
+        self.quit_requested = False
+
+    def __enter__(self) -> "InputCapture":
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(self.event_types)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        pygame.event.set_allowed(None)
+        return False
+
+    def poll(self) -> int:
+        """Move all queued key events into records, timestamped now; return the number of new records."""
+        events = pygame.event.get()
+        now_ns = time.perf_counter_ns()
+        count = 0
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                self.records.append(KeyRecord(event.key, KEY_DOWN, now_ns))
+                count += 1
+            elif event.type == pygame.KEYUP:
+                self.records.append(KeyRecord(event.key, KEY_UP, now_ns))
+                count += 1
+            elif event.type == pygame.QUIT:
+                self.quit_requested = True
+        return count
+
+    def events(self) -> List[KeyRecord]:
+        """Return and forget the records captured so far."""
+        records, self.records = self.records, []
+        return records
+
+    def clear(self) -> None:
+        """Drop pending key events and captured records (a pending QUIT stays queued for the next poll())."""
+        pygame.event.clear([pygame.KEYDOWN, pygame.KEYUP])
+        self.records = []
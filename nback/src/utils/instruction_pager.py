@@ -0,0 +1,133 @@
+# ./src/utils/instruction_pager.py
+"""
+Prefetching instruction pager.
+
+Public API:
+    InstructionPager(paths, load_page, lookahead, cache_size)
+    pager.prefetch(index) / pager.get(index) / pager.stats() / pager.close()
+
+- While page N is on screen (and locked for cfg.MIN_READING_TIME), pages N+1..N+lookahead
+  are decoded and scaled on a background thread, so turning a page does not wait for disk I/O.
+- Only a small LRU of ready surfaces is kept, instead of every instruction page.
+- The background thread only loads and scales; anything that needs the display
+  (convert(), blitting) stays on the main thread.
+"""
+
+import queue
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional
+
+import pygame
+
+from utils.logger import get_logger
+
+PAGER_LOOKAHEAD = 3     # pages decoded ahead of the page on screen
+PAGER_CACHE_SIZE = 6    # decoded pages kept in memory
+
+logger = get_logger("./src/utils/instruction_pager")
+
+
+class InstructionPager:
+    def __init__(
+        self,
+        paths: Iterable,
+        load_page: Callable[[object], Optional[pygame.Surface]],
+        lookahead: int = PAGER_LOOKAHEAD,
+        cache_size: int = PAGER_CACHE_SIZE,
+    ) -> None:
+        """
+        Args:
+            paths: image path of every instruction page, in page order
+            load_page: decode and scale one page (returns None if the page is unavailable)
+            lookahead: number of pages decoded ahead of the current one
+            cache_size: maximum number of decoded pages kept
+        """
+        self.paths = list(paths)
+        self.load_page = load_page
+        self.lookahead = lookahead
+        self.cache_size = max(cache_size, lookahead + 1)
+        self.pages: "OrderedDict[int, Optional[pygame.Surface]]" = OrderedDict()
+        self.hits = 0       # page already decoded when turned to
+        self.waits = 0      # page was still being decoded in the background
+        self.misses = 0     # page had to be decoded on the spot
+        self._current: Optional[int] = None
+
+        self._pending: set = set()
+        self._ready = threading.Condition()
+        self._requests: "queue.Queue[Optional[int]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._decode, daemon=True)
+        self._thread.start()
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def _load(self, index: int) -> Optional[pygame.Surface]:
+        try:
+            return self.load_page(self.paths[index])
+        except Exception as e:
+            logger.error(f"Error loading instruction page {self.paths[index]}: {e}")
+            return None
+
+    def _insert(self, index: int, page: Optional[pygame.Surface]) -> None:
+        """Store a decoded page, dropping the least recently shown pages beyond cache_size."""
+        self.pages[index] = page
+        self.pages.move_to_end(index)
+        while len(self.pages) > self.cache_size:
+            self.pages.popitem(last=False)
+
+    def _decode(self) -> None:
+        """Background thread: decode the queued pages in order."""
+        while True:
+            index = self._requests.get()
+            if index is None:
+                break
+            page = self._load(index)
+            with self._ready:
+                self._pending.discard(index)
+                self._insert(index, page)
+                self._ready.notify_all()
+
+    def prefetch(self, index: int) -> None:
+        """Queue pages index..index+lookahead-1 that are neither decoded nor queued yet."""
+        with self._ready:
+            for i in range(max(index, 0), min(index + self.lookahead, len(self.paths))):
+                if i not in self.pages and i not in self._pending:
+                    self._pending.add(i)
+                    self._requests.put(i)
+
+    def get(self, index: int) -> Optional[pygame.Surface]:
+        """
+        Return the surface of page index (None if unavailable), then start decoding the following pages.
+        Waits for the background thread if the page is still being decoded.
+        """
+        turned = index != self._current
+        self._current = index
+        with self._ready:
+            if index in self._pending:
+                self.waits += 1
+                self._ready.wait_for(lambda: index not in self._pending)
+            elif index in self.pages and turned:
+                self.hits += 1
+            cached = index in self.pages
+            page = self.pages[index] if cached else None
+            if cached:
+                self.pages.move_to_end(index)
+
+        if not cached:
+            self.misses += 1
+            page = self._load(index)
+            with self._ready:
+                self._insert(index, page)
+
+        self.prefetch(index + 1)
+        return page
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for logging: hits / waits / misses / pages in memory."""
+        with self._ready:
+            return {"hits": self.hits, "waits": self.waits, "misses": self.misses, "pages": len(self.pages)}
+
+    def close(self) -> None:
+        """Stop the background thread (queued pages are still decoded first)."""
+        self._requests.put(None)
@@ -3,7 +3,9 @@
 Save and update participant results in CSV format.
 
 - create_save(): initialize a CSV file with headers.
+- open_save(): open the session writer rows are appended through (kept open for the session).
 - update_save(): append a new trial record with auto-increment trial_number.
+- end_block_save() / close_save(): apply the durability policy at block end / close the writer.
 """
 
 from pathlib import Path
@@ -11,6 +13,11 @@ import csv
 import datetime
 from typing import Optional
 from utils import config as cfg
+from utils.session_writer import SessionWriter
+from utils.results_writer import results_writer
+from utils.session_store import open_store
+from utils.session_clock import session_clock
+from utils.realtime import realtime_summary
 
 # Column definitions for n-back task data output
 # Each row represents one trial with comprehensive behavioral and timing data
@@ -29,6 +36,10 @@ COLUMNS = [
     "trialDuration",      # fixed trial duration: stimulus (500ms) + ISI (2500ms) = 3000ms
     "start_time",         # session start timestamp
     "end_time",           # trial completion timestamp
+    "session_start",      # wall-clock time of the session timebase origin (ISO 8601)
+    "onset_ns",           # stimulus onset in ns since the session origin
+    "response_ns",        # response in ns since the session origin (empty if no response)
+    "realtime",           # real-time process mode applied at launch (see utils/realtime.py)
 ]
 
 
@@ -47,6 +58,46 @@ def create_save(participant_id: str) -> None:
             writer.writerow(COLUMNS)
 
 
+# Session writer opened by open_save() (one participant per session)
+_writer: Optional[SessionWriter] = None
+
+
+def open_save(participant_id: str) -> SessionWriter:
+    """
+    Return the session writer on a participant's results CSV, opening it (and creating the file) once.
+
+    Args:
+        participant_id: unique participant identifier
+
+    Returns:
+        SessionWriter: writer rows are appended through (flushed per cfg.RESULTS_DURABILITY)
+    """
+    global _writer
+    csv_path = cfg.RESULTS_DIR / f"{participant_id}_NB_results.csv"
+    if _writer is None or _writer.closed or _writer.requested_path != csv_path:
+        if _writer is not None:
+            _writer.close()
+        if results_writer.store is None:
+            # Launch option --results-db [PATH]: rows also go to a SQLite database
+            results_writer.store = open_store("NB", cfg.RESULTS_DIR)
+        _writer = SessionWriter(csv_path, COLUMNS, "trial_number", cfg.RESULTS_DURABILITY)
+    return _writer
+
+
+def end_block_save() -> None:
+    """Apply the durability policy at the end of a block (flush, or fsync)."""
+    if _writer is not None:
+        _writer.end_block()
+
+
+def close_save() -> None:
+    """Close the session writer opened by open_save()."""
+    global _writer
+    if _writer is not None:
+        _writer.close()
+        _writer = None
+
+
 def update_save(
     participant_id: str,
     block: str,
@@ -56,11 +107,13 @@ def update_save(
     key_response: str,
     correct: str,
     signal_detection: str,
-    response_time_ms: Optional[int],
+    response_time_ms: Optional[float],
     trial_duration_ms: int,
     start_time: str,
     trial_position: int,
     n_back_level: int,
+    onset_ns: Optional[int] = None,
+    response_ns: Optional[int] = None,
 ) -> None:
     """
     Record trial data with comprehensive n-back task variables for analysis.
@@ -79,21 +132,9 @@ def update_save(
         start_time: session initiation timestamp
         trial_position: position within block (1-based indexing)
         n_back_level: current n-back difficulty level (1, 2, or 3)
+        onset_ns: stimulus onset (time.perf_counter_ns), written on the session timebase
+        response_ns: response time stamp (time.perf_counter_ns), None if no response
     """
-    csv_path = cfg.RESULTS_DIR / f"{participant_id}_NB_results.csv"
-
-    # Initialize file with headers if not present
-    if not csv_path.exists():
-        create_save(participant_id)
-
-    # Calculate sequential trial number across entire session
-    with csv_path.open("r", newline="", encoding="utf-8") as rf:
-        reader = csv.reader(rf)
-        rows = list(reader)
-        has_header = bool(rows) and rows[0] == COLUMNS
-        data_rows = rows[1:] if has_header else rows
-        next_trial_number = len(data_rows) + 1
-
     # Determine trial type based on block name and n-back evaluation criteria
     block_upper = block.upper()
     if "PRACTICE" in block_upper:
@@ -107,7 +148,7 @@ def update_save(
     # Construct complete trial record with all behavioral and temporal variables
     record = {
         "participant_id": participant_id,
-        "trial_number": next_trial_number,
+        "trial_number": "",   # sequential across the session, filled in by the session writer
         "block": block,
         "type": trial_type,
         "stimuli_path": stimuli_path,
@@ -120,12 +161,11 @@ def update_save(
         "trialDuration": trial_duration_ms,
         "start_time": start_time,
         "end_time": datetime.datetime.now().isoformat(),
+        "session_start": session_clock.anchor,
+        "onset_ns": session_clock.session_ns(onset_ns),
+        "response_ns": session_clock.session_ns(response_ns),
+        "realtime": realtime_summary(),
     }
 
     # Append trial data maintaining consistent column structure
-    write_header = not has_header
-    with csv_path.open("a", newline="", encoding="utf-8") as wf:
-        writer = csv.DictWriter(wf, fieldnames=COLUMNS)
-        if write_header:
-            writer.writeheader()
-        writer.writerow({k: record.get(k, "") for k in COLUMNS})
+    open_save(participant_id).append(record)
@@ -0,0 +1,103 @@
+# ./src/utils/scheduler.py
+"""
+Deadline-based presentation scheduler.
+
+Public API:
+    PresentationScheduler(refresh_rate=None)
+    scheduler.duration_ns(ms) / scheduler.wait_until(deadline_ns, poll) / scheduler.flip(label, deadline_ns, poll)
+    scheduler.report()
+
+- Screens are flipped at absolute onset deadlines (time.perf_counter_ns) instead of
+  delaying after each flip, so render/flip costs do not accumulate within a block.
+- When the display reports its refresh rate, durations are rounded to whole refresh frames.
+- The planned and actual onset of every flip is recorded; report() summarises them per screen.
+"""
+
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pygame
+
+SPIN_NS = 2_000_000     # busy-wait the last 2 ms before a deadline (sleep is too coarse)
+
+
+def get_refresh_rate() -> int:
+    """Refresh rate of the display in Hz, or 0 if pygame cannot report it."""
+    try:
+        return pygame.display.get_current_refresh_rate() or 0
+    except (AttributeError, pygame.error):
+        return 0
+
+
+class PresentationScheduler:
+    def __init__(self, refresh_rate: Optional[int] = None) -> None:
+        """
+        Args:
+            refresh_rate: refresh rate in Hz (None: ask the display, 0: do not round to frames)
+        """
+        self.refresh_rate = get_refresh_rate() if refresh_rate is None else refresh_rate
+        self.frame_ns = int(1_000_000_000 / self.refresh_rate) if self.refresh_rate else 0
+        self.flips: List[Tuple[str, int, int]] = []   # (label, planned onset ns, actual onset ns)
+
+    def duration_ns(self, duration_ms: float) -> int:
+        """Duration in ns, as a whole number of refresh frames (at least one) when the refresh rate is known."""
+        duration_ns = int(duration_ms * 1_000_000)
+        if self.frame_ns:
+            return max(1, round(duration_ns / self.frame_ns)) * self.frame_ns
+        return duration_ns
+
+    def wait_until(self, deadline_ns: int, poll: Optional[Callable[[], Optional[bool]]] = None) -> bool:
+        """
+        Wait until deadline_ns, calling poll() (event handling) about once per millisecond.
+
+        Returns:
+            True if poll() returned True and ended the wait early, False once the deadline is reached
+        """
+        while True:
+            remaining_ns = deadline_ns - time.perf_counter_ns()
+            if remaining_ns <= 0:
+                return False
+            if poll is not None and poll():
+                return True
+            if remaining_ns > SPIN_NS:
+                time.sleep(min(remaining_ns - SPIN_NS, 1_000_000) / 1_000_000_000)
+
+    def flip(self, label: str, deadline_ns: Optional[int] = None,
+             poll: Optional[Callable[[], Optional[bool]]] = None) -> int:
+        """
+        Show the prepared screen at deadline_ns (right away if None) and record its onset.
+
+        Args:
+            label: screen name used in the report (e.g. "stimulus", "isi")
+            deadline_ns: planned onset (perf_counter_ns)
+            poll: called while waiting for the deadline
+
+        Returns:
+            Onset of the screen (perf_counter_ns right after the flip)
+        """
+        if deadline_ns is not None:
+            self.wait_until(deadline_ns, poll)
+        pygame.display.flip()
+        onset_ns = time.perf_counter_ns()
+        self.flips.append((label, onset_ns if deadline_ns is None else deadline_ns, onset_ns))
+        return onset_ns
+
+    def report(self, reset: bool = True) -> Dict[str, Dict[str, float]]:
+        """
+        Planned versus actual onset per screen label:
+        {label: {"screens", "mean_late_ms", "max_late_ms"}} (only flips issued with a deadline count as planned).
+        """
+        late: Dict[str, List[float]] = {}
+        for label, planned_ns, onset_ns in self.flips:
+            late.setdefault(label, []).append((onset_ns - planned_ns) / 1_000_000)
+        summary = {
+            label: {
+                "screens": len(values),
+                "mean_late_ms": round(sum(values) / len(values), 3),
+                "max_late_ms": round(max(values), 3),
+            }
+            for label, values in late.items()
+        }
+        if reset:
+            self.flips = []
+        return summary
@@ -0,0 +1,43 @@
+# ./src/utils/session_clock.py
+"""
+Session timebase shared by all timestamps of a run.
+
+Public API:
+    session_clock (module-level SessionClock, created at launch)
+    session_clock.anchor / session_clock.now_ns() / session_clock.session_ns(perf_ns) / session_clock.wall_time(session_ns)
+
+- A wall-clock anchor is sampled together with a time.perf_counter_ns() origin once, at launch.
+- Session times are monotonic ns since that origin; flip onsets and key timestamps
+  (perf_counter_ns) convert to it with session_ns().
+- The anchor maps session times back to wall-clock time, so the results of different
+  tasks (and external recordings) can be aligned at sub-millisecond precision.
+"""
+
+import time
+from datetime import datetime
+from typing import Optional
+
+
+class SessionClock:
+    def __init__(self) -> None:
+        before_ns = time.perf_counter_ns()
+        self.anchor_time = time.time()
+        after_ns = time.perf_counter_ns()
+        # Origin: midpoint of the two perf_counter samples around the wall-clock read
+        self.origin_ns = (before_ns + after_ns) // 2
+        self.anchor = datetime.fromtimestamp(self.anchor_time).astimezone().isoformat(timespec="microseconds")
+
+    def now_ns(self) -> int:
+        """Monotonic ns since the session origin."""
+        return time.perf_counter_ns() - self.origin_ns
+
+    def session_ns(self, perf_ns: Optional[int]) -> Optional[int]:
+        """Convert a time.perf_counter_ns() value to ns since the session origin (None stays None)."""
+        return None if perf_ns is None else perf_ns - self.origin_ns
+
+    def wall_time(self, session_ns: int) -> float:
+        """Wall-clock time (seconds since the epoch) of a session time."""
+        return self.anchor_time + session_ns / 1_000_000_000
+
+
+session_clock = SessionClock()
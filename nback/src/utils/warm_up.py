@@ -0,0 +1,108 @@
+# ./src/utils/warm_up.py
+"""
+Warm-up pass before the first timed trial of a block.
+
+Public API:
+    WarmUp()
+    warm_up.run(block, steps) / warm_up.onset(latency_ms) / warm_up.report()
+    render_offscreen(screen, surfaces, fill) -> pygame.Surface
+
+- Runs while the last instruction page before a block is on screen, so the one-time
+  costs (first font load, first smoothscale of a size, first image decode, first
+  append to the results file) are paid there instead of inside the first trial.
+- Each step is timed and logged; a failing step is logged, not raised.
+- onset() records the onset latency of every trial of the block, and report()
+  compares the first trial with the steady state (median of the other trials).
+"""
+
+import statistics
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import pygame
+
+from utils.logger import get_logger
+
+
+logger = get_logger("./src/utils/warm_up")    # create logger
+
+
+class WarmUp:
+    def __init__(self) -> None:
+        self.steps: Dict[str, Union[float, str]] = {}   # step name -> duration (ms), or "failed (...)"
+        self.total_ms = 0.0
+        self.onsets: List[float] = []                   # onset latency (ms) of every trial since run()
+
+    def run(self, block: str, steps: Sequence[Tuple[str, Callable[[], object]]]) -> Dict[str, Union[float, str]]:
+        """
+        Run the warm-up of a block.
+
+        Args:
+            block (str): Block name (for the log)
+            steps (Sequence[Tuple[str, Callable]]): (name, function) pairs, run in order
+
+        Returns:
+            Dict[str, Union[float, str]]: Duration of each step in ms, or "failed (...)"
+        """
+        self.steps = {}
+        self.onsets = []
+        start_ns = time.perf_counter_ns()
+        for name, step in steps:
+            step_ns = time.perf_counter_ns()
+            try:
+                step()
+                self.steps[name] = round((time.perf_counter_ns() - step_ns) / 1_000_000, 3)
+            except Exception as e:
+                self.steps[name] = f"failed ({e})"
+                logger.warning(f"Warm-up step {name} failed for {block}: {e}")
+        self.total_ms = round((time.perf_counter_ns() - start_ns) / 1_000_000, 3)
+        logger.info(f"Warm-up | block={block} ({self.total_ms} ms): {self.steps}")
+        return self.steps
+
+    def onset(self, latency_ms: float) -> None:
+        """Record the onset latency of a trial (how late its stimulus reached the screen)."""
+        self.onsets.append(latency_ms)
+
+    def report(self, reset: bool = True) -> Dict[str, Optional[float]]:
+        """
+        First trial vs steady state, since run().
+
+        Args:
+            reset (bool): Clear the recorded onsets
+
+        Returns:
+            Dict[str, Optional[float]]: warm_up_ms, trials, first_onset_ms,
+                steady_onset_ms (median of the other trials), steady_max_ms
+        """
+        first = self.onsets[0] if self.onsets else None
+        steady = self.onsets[1:]
+        summary = {
+            "warm_up_ms": self.total_ms,
+            "trials": len(self.onsets),
+            "first_onset_ms": round(first, 3) if first is not None else None,
+            "steady_onset_ms": round(statistics.median(steady), 3) if steady else None,
+            "steady_max_ms": round(max(steady), 3) if steady else None,
+        }
+        if reset:
+            self.onsets = []
+        return summary
+
+
+def render_offscreen(screen: pygame.Surface, surfaces: Sequence[pygame.Surface],
+                     fill: Tuple[int, int, int] = (0, 0, 0)) -> pygame.Surface:
+    """
+    Draw surfaces once on an offscreen copy of the screen, without touching the display.
+
+    Args:
+        screen (pygame.Surface): Display surface (size and pixel format of the copy)
+        surfaces (Sequence[pygame.Surface]): Surfaces to blit, each centered
+        fill (Tuple[int, int, int]): Background colour
+
+    Returns:
+        pygame.Surface: The offscreen surface
+    """
+    canvas = pygame.Surface(screen.get_size()).convert(screen)
+    canvas.fill(fill)
+    for surface in surfaces:
+        canvas.blit(surface, surface.get_rect(center=canvas.get_rect().center))
+    return canvas
@@ -0,0 +1,127 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import pygame
+from meta_parameters import *
+
+# Longest wait for a calibration beep to reach the output (ms)
+CALIBRATION_TIMEOUT = 1000
+# Silence between two calibration beeps (ms)
+CALIBRATION_GAP = 150
+
+# Result of the latency calibration (see calibrate_latency)
+output_latency = {}
+
+
+def configure_mixer():
+    """
+    Request the mixer settings from meta_parameters; call before pygame.init(), which opens the mixer
+    (a small buffer keeps the delay between Sound.play() and the sound leaving the mixer low)
+    """
+    if AUDIO_LOW_LATENCY:
+        pygame.mixer.pre_init(AUDIO_FREQUENCY, AUDIO_SIZE, AUDIO_CHANNELS, AUDIO_BUFFER)
+
+
+def init_mixer():
+    """Open the mixer (if pygame.init() did not) and print the settings actually obtained"""
+    if not pygame.mixer.get_init():
+        if AUDIO_LOW_LATENCY:
+            pygame.mixer.init(AUDIO_FREQUENCY, AUDIO_SIZE, AUDIO_CHANNELS, AUDIO_BUFFER)
+        else:
+            pygame.mixer.init()
+    frequency, size, channels = pygame.mixer.get_init()
+    print(f"Mixer: {frequency} Hz, {size} bit, {channels} channel(s), buffer {AUDIO_BUFFER if AUDIO_LOW_LATENCY else 'default'}")
+    return frequency, size, channels
+
+
+def _time_beeps(stimulus_path, beeps, output_path):
+    """
+    Runs in a separate process with the SDL disk audio driver, which writes the mixer output to output_path
+    at playback rate: the delay between Sound.play() and the first non-silent bytes in the file is the time
+    the sound spends in the mixer and its buffer (the sound card's own latency is not included).
+    """
+    sound = pygame.mixer.Sound(stimulus_path)
+    time.sleep(0.2)  # let the device start writing silence
+    latencies_ms = []
+
+    with open(output_path, "rb") as f:
+        for _ in range(beeps):
+            f.seek(0, os.SEEK_END)  # only look at what is written after play()
+            play_ns = time.perf_counter_ns()
+            sound.play()
+            while (time.perf_counter_ns() - play_ns) / 1_000_000 < CALIBRATION_TIMEOUT:
+                if f.read().strip(b"\0"):
+                    latencies_ms.append((time.perf_counter_ns() - play_ns) / 1_000_000)
+                    break
+                time.sleep(0.0002)
+            sound.stop()
+            time.sleep(sound.get_length() + CALIBRATION_GAP / 1000)
+    return latencies_ms
+
+
+def calibrate_latency(stimulus_path, beeps=AUDIO_CALIBRATION_BEEPS):
+    """
+    Measure the scheduling-to-playback delay of the mixer settings in a child process
+    (SDL disk audio driver, so it also runs on a headless machine without touching the real output).
+    The result is kept in output_latency and written with every results row (see latency_columns).
+    :return: {"driver", "buffer", "beeps", "latency_ms_median", "latency_ms_min", "latency_ms_max"} or {} on failure
+    """
+    global output_latency
+    output_latency = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        env = dict(os.environ,
+                   SDL_AUDIODRIVER="disk",
+                   SDL_DISKAUDIOFILE=os.path.join(tmp_dir, "calibration.raw"),
+                   SDL_VIDEODRIVER="dummy")
+        try:
+            completed = subprocess.run([sys.executable, os.path.abspath(__file__), stimulus_path, str(beeps)],
+                                       env=env, capture_output=True, text=True,
+                                       timeout=beeps * (CALIBRATION_TIMEOUT + CALIBRATION_GAP + 500) / 1000 + 10)
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+        except (subprocess.SubprocessError, ValueError, IndexError) as e:
+            print(f"Audio latency calibration failed: {e}")
+            return output_latency
+
+    latencies_ms = sorted(result["latencies_ms"])
+    if not latencies_ms:
+        print("Audio latency calibration failed: no beep reached the output")
+        return output_latency
+    output_latency = {
+        "driver": "disk",
+        "buffer": AUDIO_BUFFER if AUDIO_LOW_LATENCY else "default",
+        "beeps": len(latencies_ms),
+        "latency_ms_median": round(latencies_ms[len(latencies_ms) // 2], 3),
+        "latency_ms_min": round(latencies_ms[0], 3),
+        "latency_ms_max": round(latencies_ms[-1], 3),
+    }
+    print(f"Audio output latency: {output_latency}")
+    return output_latency
+
+
+def prime_mixer(sound):
+    """Play a sound once at volume 0 (first play of the session, before a block), then restore its volume"""
+    volume = sound.get_volume()
+    sound.set_volume(0)
+    channel = sound.play()
+    while channel is not None and channel.get_busy():
+        pygame.time.wait(1)
+    sound.set_volume(volume)
+
+
+# Columns added to every results row (see latency_columns)
+LATENCY_COLUMNS = ["audio_buffer", "audio_latency_ms"]
+
+
+def latency_columns():
+    """Values of LATENCY_COLUMNS: mixer buffer and measured median latency ("" if not calibrated)"""
+    return [AUDIO_BUFFER if AUDIO_LOW_LATENCY else "default", output_latency.get("latency_ms_median", "")]
+
+
+if __name__ == "__main__":
+    # Calibration child process: python audio.py <stimulus path> <beeps> (environment set by calibrate_latency)
+    init_mixer()
+    print(json.dumps({"latencies_ms": _time_beeps(sys.argv[1], int(sys.argv[2]), os.environ["SDL_DISKAUDIOFILE"])}))
@@ -1,5 +1,9 @@
 import pygame
 from meta_parameters import *
+from idle_screen import IdleScreen
+
+# Participant ID and instruction screens, and the self-paced phase, sleep until there is input (CPU usage per screen type)
+idle_screen = IdleScreen()
 
 # Key to string (conversion for readability)
 def key_to_str(key):
@@ -51,7 +55,7 @@ def toggle_fullscreen(screen_param):
     return main.screen
 
 # Show instruction
-def show_next_page(screen, instruction_path, func=None, times=None):
+def show_next_page(screen, instruction_path, func=None, times=None, warm_up=None):
     # Display the instruction
     image = pygame.image.load(instruction_path)
     screen.fill((128, 128, 128))  # Fill with gray background
@@ -62,12 +66,19 @@ def show_next_page(screen, instruction_path, func=None, times=None):
     img_rect = image.get_rect(center=(screen_width // 2, screen_height // 2))
     screen.blit(image, img_rect)
     pygame.display.flip()
+
+    # Last page before a block: warm up while it is being read
+    if warm_up is not None:
+        warm_up()
     pygame.event.clear()
 
     page_start_time = pygame.time.get_ticks()
 
     while pygame.time.get_ticks() - page_start_time < READ_TIME:
-        for event in pygame.event.get():
+        # Sleep until the next key press, or until the reading time of the page is over
+        with idle_screen.measure("instructions"):
+            events = idle_screen.wait(page_start_time + READ_TIME - pygame.time.get_ticks())
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 raise SystemExit
@@ -77,7 +88,10 @@ def show_next_page(screen, instruction_path, func=None, times=None):
 
     waiting = True
     while waiting:
-        for event in pygame.event.get():
+        # The page only changes on input: sleep until the next key press
+        with idle_screen.measure("instructions"):
+            events = idle_screen.wait()
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 raise SystemExit
@@ -97,15 +111,22 @@ def get_participant_id(screen):
     screen_width = screen.get_width()
     screen_height = screen.get_height()
 
+    changed = True
     while active:
-        screen.fill(GRAY_RGB)
-        prompt = font.render("Enter Participant ID (press enter when completed):", True, BLACK_RGB)
-        text_surface = font.render(input_text, True, BLACK_RGB)
-        screen.blit(prompt, (screen_width // 2 - prompt.get_width() // 2, screen_height // 2 - 100))
-        screen.blit(text_surface, (screen_width // 2 - text_surface.get_width() // 2, screen_height // 2))
-        pygame.display.flip()
+        # Redraw only after input, and sleep until the next event
+        with idle_screen.measure("participant_id"):
+            if idle_screen.redraw(changed):
+                screen.fill(GRAY_RGB)
+                prompt = font.render("Enter Participant ID (press enter when completed):", True, BLACK_RGB)
+                text_surface = font.render(input_text, True, BLACK_RGB)
+                screen.blit(prompt, (screen_width // 2 - prompt.get_width() // 2, screen_height // 2 - 100))
+                screen.blit(text_surface, (screen_width // 2 - text_surface.get_width() // 2, screen_height // 2))
+                pygame.display.flip()
+                changed = False
+            events = idle_screen.wait()
 
-        for event in pygame.event.get():
+        for event in events:
+            changed = True
             if event.type == pygame.QUIT:
                 pygame.quit()
                 quit()
@@ -9,6 +9,11 @@ from instructions import *
 from run_trial import *
 from framework import *
 from meta_parameters import *
+from metronome import preload_sounds
+from tones import get_stimulus
+from audio import configure_mixer, init_mixer, calibrate_latency, prime_mixer
+from realtime import apply_launch_options
+from warm_up import render_offscreen
 
 # Global variables for screen
 screen = None
@@ -23,6 +28,12 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 COUNTDOWN = 10
 TEST_COUNDTOWN = 2
 
+# Block run after each of these pages (the warm-up runs while the page is up)
+BLOCK_PAGES = {PRACTICE_1: "practice1", BLOCK_1: "block1", BLOCK_2: "block2"}
+
+# Countdown font, looked up once (see get_countdown_font)
+countdown_font = None
+
 def generate_unique_filename(participant_id):
     """
     Generate unique filename with automatic versioning.
@@ -45,9 +56,15 @@ def generate_unique_filename(participant_id):
     print(f"Generated unique filename: {os.path.basename(csv_file)}")
     return csv_file
 
+def get_countdown_font():
+    global countdown_font
+    if countdown_font is None:
+        pygame.font.init()
+        countdown_font = pygame.font.SysFont(None, 60)  # Font and size, adjustable
+    return countdown_font
+
 def show_gray_screen(screen, countdown=TEST_COUNDTOWN):
-    pygame.font.init()
-    font = pygame.font.SysFont(None, 60)  # Font and size, adjustable
+    font = get_countdown_font()
     clock = pygame.time.Clock()
 
     for i in range(countdown, 0, -1):
@@ -66,6 +83,25 @@ def show_gray_screen(screen, countdown=TEST_COUNDTOWN):
         pygame.time.delay(1000)
         clock.tick(60)
 
+def warm_up_block(block, csv_file):
+    """
+    Warm-up before a block (while its last instruction page is up): play the metronome tone once at volume 0,
+    load the countdown font, draw the gray and countdown screens offscreen and open the results file
+    """
+    def fonts():
+        get_countdown_font().render("The next trial will start in: 2 seconds", True, BLACK_RGB)
+
+    def render():
+        text_surface = get_countdown_font().render("The next trial will start in: 1 second", True, BLACK_RGB)
+        render_offscreen(screen, [text_surface], GRAY_RGB)
+
+    warm_up.run(block, [
+        ("mixer", lambda: prime_mixer(get_stimulus()[0])),
+        ("fonts", fonts),
+        ("render", render),
+        ("results_file", lambda: results_writer.open(csv_file, RESULTS_HEADER)),
+    ])
+
 def process_func(i, csv_file, trail_count, participant_id):
     if i == PRACTICE_1:
         for j in range(2):
@@ -85,6 +121,10 @@ def process_func(i, csv_file, trail_count, participant_id):
             trail_count += 1
             if j < 2:
                 show_gray_screen(screen)
+    if i in BLOCK_PAGES:
+        # One database transaction for the rows of the block (--results-db)
+        results_writer.end_block()
+        print(f"Tone onset latency, first trial vs steady state, for {BLOCK_PAGES[i]}: {warm_up.report()}")
     return trail_count
 
 def process_additional_block(block_name, csv_file, trail_count, participant_id):
@@ -94,12 +134,26 @@ def process_additional_block(block_name, csv_file, trail_count, participant_id):
         trail_count += 1
         if j < 2:
             show_gray_screen(screen)
+    results_writer.end_block()
+    print(f"Tone onset latency, first trial vs steady state, for {block_name}: {warm_up.report()}")
     return trail_count
 
 if __name__ == '__main__':
-    # Initialize pygame
+    # Real-time process mode (launch option --realtime [--cpu N]); before pygame.init() so its threads inherit it
+    apply_launch_options()
+
+    # Initialize pygame (mixer buffer, frequency and channels from meta_parameters)
+    configure_mixer()
     pygame.init()
-    pygame.mixer.init()
+    init_mixer()
+    if AUDIO_CALIBRATION:
+        # Scheduling-to-playback latency of these mixer settings, stored with every results row
+        calibrate_latency(STIMULUS_PATH_1000)
+    # Build (or decode) the metronome tone once, before any trial
+    if TONE_SYNTHESIS:
+        get_stimulus()
+    else:
+        preload_sounds([STIMULUS_PATH_900, STIMULUS_PATH_1000])
 
     pygame.time.delay(10)
 
@@ -126,8 +180,7 @@ if __name__ == '__main__':
     # Create CSV file with headers
     with open(CSV_FILENAME, mode='w', newline='') as file:
         writer = csv.writer(file)
-        writer.writerow(["participant_id", "group", "block", "trial", "tap_num", "type", "pace_ms", "condition", "difficulty", "stimuli_path", "synchronized_sound_tick_ms", "key_response_tick_ms",
-                         "interval_ms", "trial_type", "key_response", "key_correct", "start_time", "end_time"])
+        writer.writerow(RESULTS_HEADER)
 
 
     global_start = pygame.time.get_ticks()
@@ -137,7 +190,9 @@ if __name__ == '__main__':
     # Show instructions and run trials up to Block 2
     for i in range(1, TOTAL_INSTRUCTIONS_PAGE + 1):
         instruction_path = os.path.join(SCRIPT_DIR, "instructions", "{}.jpg".format(i))
-        show_next_page(screen, instruction_path)
+        block = BLOCK_PAGES.get(i)
+        show_next_page(screen, instruction_path,
+                       warm_up=(lambda: warm_up_block(block, CSV_FILENAME)) if block else None)
         trail_count = process_func(i, CSV_FILENAME, trail_count, participant_id)
         
         # After Block 2 is completed, continue with additional blocks
@@ -147,20 +202,25 @@ if __name__ == '__main__':
     # Block 3: Repeat Block 2 pattern (pages 10, 11, 12)
     for page in [10, 11, 12]:
         instruction_path = os.path.join(SCRIPT_DIR, "instructions", "{}.jpg".format(page))
-        show_next_page(screen, instruction_path)
+        show_next_page(screen, instruction_path,
+                       warm_up=(lambda: warm_up_block("block3", CSV_FILENAME)) if page == 12 else None)
         if page == 12:  # Execute trials on page 12
             trail_count = process_additional_block("block3", CSV_FILENAME, trail_count, participant_id)
     
     # Block 4: Repeat Block 2 pattern again (pages 10, 11, 12)
     for page in [10, 11, 12]:
         instruction_path = os.path.join(SCRIPT_DIR, "instructions", "{}.jpg".format(page))
-        show_next_page(screen, instruction_path)
+        show_next_page(screen, instruction_path,
+                       warm_up=(lambda: warm_up_block("block4", CSV_FILENAME)) if page == 12 else None)
         if page == 12:  # Execute trials on page 12
             trail_count = process_additional_block("block4", CSV_FILENAME, trail_count, participant_id)
     
     # Show final screen (image 13.jpg)
     final_instruction_path = os.path.join(SCRIPT_DIR, "instructions", "13.jpg")
     show_next_page(screen, final_instruction_path)
+    results_writer.close()
+    print(f"Results writer (queue depth, write latency): {results_writer.report()}")
+    print(f"CPU usage of the waiting screens: {idle_screen.report()}")
 
     for result in results:
         print()
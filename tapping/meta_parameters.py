@@ -35,3 +35,19 @@ TOTAL_PAGE = 13 # ~ pages in total
 PRACTICE_1 = 6 # practice 1 begins after page ~ [2 trial / left hand]
 BLOCK_1 = 9 # block 1 begins after page ~ [3 trial / left hand]
 BLOCK_2 = 12 # block 2 begins after page ~ [3 trial / left hand]
+
+# Metronome tone (synthesized in memory, see tones.py)
+TONE_SYNTHESIS = True # False: play the tone file STIMULUS_PATH_1000 instead
+TONE_FREQUENCY = 1000 # Pitch (Hz)
+TONE_DURATION = 50 # Length of the tone (ms)
+TONE_AMPLITUDE = 0.25 # Peak amplitude (0 - 1)
+TONE_RAMP = 5 # Fade in / fade out at each end of the tone (ms), avoids clicks
+
+# Audio settings
+AUDIO_LOW_LATENCY = True # Open the mixer with the settings below (False: pygame's default mixer settings)
+AUDIO_FREQUENCY = 44100 # Sample rate (Hz)
+AUDIO_SIZE = -16 # Sample format (signed 16 bit)
+AUDIO_CHANNELS = 2 # Number of output channels
+AUDIO_BUFFER = 256 # Mixer buffer (samples); smaller = lower output latency, raise it if the sound crackles
+AUDIO_CALIBRATION = True # Measure the scheduling-to-playback latency at startup (written to the results file)
+AUDIO_CALIBRATION_BEEPS = 10 # Number of beeps timed by the calibration
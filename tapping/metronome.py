@@ -0,0 +1,90 @@
+import time
+
+import pygame
+
+# The last 2 ms before a beep are busy-waited (sleep is too coarse for that)
+SPIN_NS = 2_000_000
+
+# Preloaded metronome sounds (stimulus path -> pygame.mixer.Sound)
+_sounds = {}
+
+
+def preload_sounds(paths):
+    """Decode the tone files once (the mixer must be initialised), so no beep waits for file I/O"""
+    for path in paths:
+        get_sound(path)
+
+
+def get_sound(path):
+    """Sound of a stimulus file, decoded on first use and kept for the session"""
+    sound = _sounds.get(path)
+    if sound is None:
+        sound = pygame.mixer.Sound(path)
+        _sounds[path] = sound
+    return sound
+
+
+class Metronome:
+    def __init__(self, sound, interval_ms):
+        """
+        Plays sound at absolute deadlines start + k * interval on time.perf_counter_ns(),
+        so the time spent handling a beep (or a late listening loop) never shifts the following beeps.
+        The requested and actual play time of every beep is kept in log.
+        :param sound: pygame.mixer.Sound to play
+        :param interval_ms: Interval between two beeps (ms)
+        """
+        self.sound = sound
+        self.interval_ns = int(interval_ms * 1_000_000)
+        self.start_ns = None
+        self.count = 0
+        self.log = []   # (beep index, requested ns, actual ns) of every beep
+
+    def start(self, delay_ms=0):
+        """Schedule the first beep delay_ms from now"""
+        self.start_ns = time.perf_counter_ns() + int(delay_ms * 1_000_000)
+        self.count = 0
+        self.log = []
+
+    def next_deadline_ns(self):
+        """Requested play time of the next beep"""
+        return self.start_ns + self.count * self.interval_ns
+
+    def wait(self, poll=None):
+        """
+        Wait for the next beep's deadline; poll() (e.g. key handling) is called about once per millisecond
+        until the last SPIN_NS, which are busy-waited.
+        """
+        deadline_ns = self.next_deadline_ns()
+        while True:
+            remaining_ns = deadline_ns - time.perf_counter_ns()
+            if remaining_ns <= 0:
+                return
+            if remaining_ns > SPIN_NS:
+                if poll is not None:
+                    poll()
+                time.sleep(min(remaining_ns - SPIN_NS, 1_000_000) / 1_000_000_000)
+
+    def beep(self, poll=None):
+        """
+        Wait for the next deadline, play the sound and log it
+        :return: (requested ns, actual ns) of this beep (time.perf_counter_ns())
+        """
+        self.wait(poll)
+        requested_ns = self.next_deadline_ns()
+        self.sound.play()
+        actual_ns = time.perf_counter_ns()
+        self.log.append((self.count, requested_ns, actual_ns))
+        self.count += 1
+        return requested_ns, actual_ns
+
+    def report(self):
+        """Lateness of the beeps (actual - requested): {"beeps", "mean_late_ms", "max_late_ms", "last_late_ms"}"""
+        if not self.log:
+            return {"beeps": 0}
+        late_ms = [(actual_ns - requested_ns) / 1_000_000 for _, requested_ns, actual_ns in self.log]
+        return {
+            "beeps": len(late_ms),
+            "mean_late_ms": round(sum(late_ms) / len(late_ms), 3),
+            "max_late_ms": round(max(late_ms), 3),
+            "last_late_ms": round(late_ms[-1], 3),   # drift would show up here
+        }
@@ -1,4 +1,3 @@
-import csv
 import os.path
 from datetime import datetime
 
@@ -7,34 +6,76 @@ import time
 from meta_parameters import *
 from stimuli import *
 from framework import *
+from session_clock import SessionClock, SESSION_COLUMNS
+from metronome import Metronome, SPIN_NS
+from tones import get_stimulus
+from audio import latency_columns, LATENCY_COLUMNS
+from realtime import realtime_columns, REALTIME_COLUMNS
+from gc_quiet import GCQuiet
+from warm_up import WarmUp
+from idle_screen import IDLE_TIMEOUT_MS
+from results_writer import ResultsWriter
+from session_store import open_store
 
+# Session timebase (wall-clock anchor + perf_counter_ns origin) for the onset/response columns
+session_clock = SessionClock()
+
+# No garbage collection while the metronome runs (collected once the synchronized sequence is over)
+gc_quiet = GCQuiet()
+
+# Warm-up before each block (see main.warm_up_block), and first-tone vs steady-state onset latency
+warm_up = WarmUp()
+
+# Results rows are written on a background thread (no disk latency between trials),
+# and also to a SQLite database with the launch option --results-db [PATH]
+results_writer = ResultsWriter(store=open_store("TAP", os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")))
+
+# Columns of the results file (one row per tap)
+RESULTS_HEADER = ["participant_id", "group", "block", "trial", "tap_num", "type", "pace_ms", "condition", "difficulty", "stimuli_path", "synchronized_sound_tick_ms", "key_response_tick_ms",
+                  "interval_ms", "trial_type", "key_response", "key_correct", "start_time", "end_time"] + SESSION_COLUMNS + LATENCY_COLUMNS + REALTIME_COLUMNS
+
+def tick_clock():
+    """Same instant on pygame's tick clock and on perf_counter_ns, to report perf_counter_ns times in ticks"""
+    return pygame.time.get_ticks(), time.perf_counter_ns()
+
+def ns_to_tick_ms(ns, start_tick, origin):
+    """perf_counter_ns time -> ms since start_tick (0.001 ms resolution), through the tick_clock() origin"""
+    origin_tick, origin_ns = origin
+    return round(origin_tick - start_tick + (ns - origin_ns) / 1_000_000, 3)
 
 # Run synchronized sequence
-def run_synchronized(screen, start_tick, target_key, max_key_press, stimulus_path):
+def run_synchronized(screen, start_tick, target_key, max_key_press, stimulus, origin=None):
+    origin = origin or tick_clock()
     pygame.event.clear()
-    time.sleep(1) # Delay for 1 second before playing the first sound (for participants to prepare)
 
     sound_ticks = []
+    sound_onsets_ns = []  # perf_counter_ns of each sound
     key_responses = []
     valid_key_pressed_num = 0
-    sound_index = 0
+
+    # Sounds are played at start + k * SYNCHRONIZED_INTERVAL (no drift from the listening loop),
+    # the first one after 1 second (for participants to prepare)
+    metronome = Metronome(stimulus, SYNCHRONIZED_INTERVAL)
+    gc_quiet.begin()
+    metronome.start(delay_ms=1000)
 
     while valid_key_pressed_num < max_key_press:
-        sound_index += 1
-        
-        # Play sound
-        stimulus = pygame.mixer.Sound(stimulus_path)
-        stimulus.play()
-        current_sound_tick = pygame.time.get_ticks()
-        sound_ticks.append(current_sound_tick - start_tick)
-        print(f"\nSound {sound_index} played at {current_sound_tick - start_tick} ms")
+        # Play sound at its deadline
+        requested_ns, onset_ns = metronome.beep()
+        sound_index = metronome.count
+        sound_onsets_ns.append(onset_ns)
+        warm_up.onset((onset_ns - requested_ns) / 1_000_000)
+        current_sound_tick = ns_to_tick_ms(onset_ns, start_tick, origin)
+        sound_ticks.append(current_sound_tick)
+        print(f"\nSound {sound_index} played at {current_sound_tick} ms ({(onset_ns - requested_ns) / 1_000_000:.3f} ms after its deadline)")
 
         responded = False
-        current_response = [None, None]
+        current_response = [None, None, None]
         key_was_pressed = False  # Track if key was pressed using key state
         
-        # Listen to keyboard input for exactly 600ms with improved event handling
-        while pygame.time.get_ticks() - current_sound_tick < SYNCHRONIZED_INTERVAL:
+        # Listen to keyboard input until shortly before the next sound's deadline
+        window_end_ns = metronome.next_deadline_ns() - SPIN_NS
+        while time.perf_counter_ns() < window_end_ns:
             # Process all pending events in queue
             events = pygame.event.get()
             for event in events:
@@ -45,9 +86,11 @@ def run_synchronized(screen, start_tick, target_key, max_key_press, stimulus_pat
                     if event.key == pygame.K_ESCAPE:
                         toggle_fullscreen(screen)
                     elif event.key == target_key and responded == False:
-                        response_tick = pygame.time.get_ticks() - start_tick
+                        # Same clock and origin as the sound onsets, so their difference is the asynchrony
+                        response_ns = time.perf_counter_ns()
+                        response_tick = ns_to_tick_ms(response_ns, start_tick, origin)
                         key_pressed = key_to_str(event.key)
-                        current_response = [key_pressed, response_tick]
+                        current_response = [key_pressed, response_tick, response_ns]
                         responded = True
                         valid_key_pressed_num += 1
                         print(f"  -> {key_pressed} pressed at {response_tick} ms ({valid_key_pressed_num}/{max_key_press})")
@@ -56,9 +99,10 @@ def run_synchronized(screen, start_tick, target_key, max_key_press, stimulus_pat
             if not responded:
                 keys = pygame.key.get_pressed()
                 if keys[target_key] and not key_was_pressed:
-                    response_tick = pygame.time.get_ticks() - start_tick
+                    response_ns = time.perf_counter_ns()
+                    response_tick = ns_to_tick_ms(response_ns, start_tick, origin)
                     key_pressed = key_to_str(target_key)
-                    current_response = [key_pressed, response_tick]
+                    current_response = [key_pressed, response_tick, response_ns]
                     responded = True
                     valid_key_pressed_num += 1
                     key_was_pressed = True
@@ -74,27 +118,37 @@ def run_synchronized(screen, start_tick, target_key, max_key_press, stimulus_pat
         if not responded:
             print(f"  -> No response detected for sound {sound_index}")
 
+    gc_quiet.release()
+    print(f"Metronome (requested vs actual play time): {metronome.report()}")
+    print(f"Garbage collection pauses: {gc_quiet.report()}")
     pygame.time.delay(10) # Prevent CPU overuse
 
-    return sound_ticks, key_responses
+    return sound_ticks, key_responses, sound_onsets_ns
 
 # Run self-paced sequence
-def run_self_paced(screen, start_tick, target_key, max_key_press):
+def run_self_paced(screen, start_tick, target_key, max_key_press, origin=None):
+    origin = origin or tick_clock()
     last_tick = start_tick
     key_responses = []
     self_paced_start_tick = pygame.time.get_ticks()  # Record start of self-paced phase
 
     while len(key_responses) < max_key_press:
         # Check timeout only in ACTUAL mode
+        timeout_ms = IDLE_TIMEOUT_MS
         if MODE == "ACTUAL":
             elapsed_time = pygame.time.get_ticks() - self_paced_start_tick
             if elapsed_time >= SELF_PACED_TIMEOUT:
                 print(f"Self-paced phase timed out after {elapsed_time}ms (limit: {SELF_PACED_TIMEOUT}ms)")
                 print(f"Completed {len(key_responses)}/{max_key_press} taps before timeout")
                 break
-        
-        for event in pygame.event.get():
-            response_tick = pygame.time.get_ticks() - start_tick
+            timeout_ms = min(timeout_ms, SELF_PACED_TIMEOUT - elapsed_time)
+
+        # Sleep until the next key press (taps are still timed when their event is handled)
+        with idle_screen.measure("self_paced"):
+            events = idle_screen.wait(timeout_ms)
+        for event in events:
+            response_ns = time.perf_counter_ns()
+            response_tick = ns_to_tick_ms(response_ns, start_tick, origin)
             if event.type == pygame.QUIT:
                 pygame.quit()
                 raise SystemExit
@@ -104,7 +158,7 @@ def run_self_paced(screen, start_tick, target_key, max_key_press):
                 elif event.key == target_key and response_tick - last_tick > TREMOR_INTERVAL:
                     last_tick = response_tick
                     key_pressed = key_to_str(event.key)
-                    key_responses.append([key_pressed, response_tick])
+                    key_responses.append([key_pressed, response_tick, response_ns])
                     print(f"{key_pressed} pressed at {response_tick} ms ({len(key_responses)}/{max_key_press})")
 
     pygame.time.delay(10) # Prevent CPU overuse
@@ -112,10 +166,12 @@ def run_self_paced(screen, start_tick, target_key, max_key_press):
     return key_responses
 
 # Run trial (synchronized + self-paced)
-def run_trial(screen, start_tick, target_key, max_synchronized_key_press, max_self_paced_key_press, stimulus_path):
-    synchronized_sound_ticks, synchronized_key_responses = run_synchronized(screen, start_tick, target_key, max_synchronized_key_press, stimulus_path)
-    self_paced_key_responses = run_self_paced(screen, start_tick, target_key, max_self_paced_key_press)
-    return synchronized_sound_ticks, synchronized_key_responses, self_paced_key_responses
+def run_trial(screen, start_tick, target_key, max_synchronized_key_press, max_self_paced_key_press, stimulus):
+    # Sound onsets and key presses are all perf_counter_ns times, reported in ticks since start_tick through one origin
+    origin = tick_clock()
+    synchronized_sound_ticks, synchronized_key_responses, synchronized_sound_onsets_ns = run_synchronized(screen, start_tick, target_key, max_synchronized_key_press, stimulus, origin)
+    self_paced_key_responses = run_self_paced(screen, start_tick, target_key, max_self_paced_key_press, origin)
+    return synchronized_sound_ticks, synchronized_key_responses, self_paced_key_responses, synchronized_sound_onsets_ns
 
 '''
 === Result Format ===
@@ -126,19 +182,24 @@ def run_trial(screen, start_tick, target_key, max_synchronized_key_press, max_se
 - type: synchronized / self-paced
 - pace_ms: = SYNCHRONIZED_INTERVAL (in milliseconds)
 - synchronized_sound_ticks_ms:
-    - [For (type == synchronized)] time tick when the stimulus beep-sound is played (counting from the global start time tick, in milliseconds)
+    - [For (type == synchronized)] time tick when the stimulus beep-sound is played (counting from the global start time tick, in milliseconds, 0.001 ms resolution)
     - [For (type == self_paced)] "v" / "m" = key_correct
 - key_response:
     - [For (type == synchronized)] key pressed during given trial (could be None)
     - [For (type == self_paced)] "v"
 - response_tick_ms:
-    - [For (type == synchronized && synchronized_key_response is not None)] time tick when key is pressed (counting from the global start time tick, in milliseconds)
+    - [For (type == synchronized && synchronized_key_response is not None)] time tick when key is pressed (counting from the global start time tick, in milliseconds, 0.001 ms resolution, same clock as synchronized_sound_ticks_ms)
     - [For (type == synchronized && synchronized_key_response is None)] = synchronized_sound_ticks
-    - [For (type == self_paced)] time tick when key is pressed (counting from the global start time tick, in milliseconds)
+    - [For (type == self_paced)] time tick when key is pressed (counting from the global start time tick, in milliseconds, 0.001 ms resolution)
 - interval_ms: time difference between two key presses (in milliseconds)
 - trial_type: "Successful" (if all interval_ms of self-paced tappings in given trials is in [MIN_SELF_PACED_INTERVAL, MAX_SELF_PACED_INTERVAL]) / "Unsuccessful" (otherwise)
 - key_correct: "v" / "m"
 - group: i.e. YC / CD [first two text of participant_id]
+- session_start / onset_ns / response_ns: session timebase shared with the other tasks (see session_clock.py)
+    - session_start: wall-clock time of the session origin (ISO 8601)
+    - onset_ns: [For (type == synchronized)] when the sound was played, in ns since the session origin; empty for self_paced
+    - response_ns: when the key was pressed, in ns since the session origin (empty if no key was pressed)
+- audio_buffer / audio_latency_ms: mixer buffer (samples) and the scheduling-to-playback latency measured at startup (see audio.py)
 '''
 
 def single_trail(screen, block, start_tick, target_key, results, participant_id, trial = None, csv_file = None):
@@ -148,16 +209,18 @@ def single_trail(screen, block, start_tick, target_key, results, participant_id,
     # block = "practice1" # block
     pace_ms = SYNCHRONIZED_INTERVAL # pace_ms
     key_correct = key_to_str(target_key)
+    stimulus, stimulus_name = get_stimulus() # metronome sound (cached) and its stimuli_path entry
 
     # Run trial
     (synchronized_sound_ticks, 
      synchronized_key_responses, 
-     self_paced_key_responses) = run_trial(screen,
+     self_paced_key_responses,
+     synchronized_sound_onsets_ns) = run_trial(screen,
                                            start_tick, 
                                            target_key,
                                            NUM_SYNCHRONIZED, 
                                            NUM_SELF_PACE, 
-                                           STIMULUS_PATH_1000)
+                                           stimulus)
     
     # Write trial results
     assert len(synchronized_sound_ticks) == len(synchronized_key_responses)
@@ -169,6 +232,9 @@ def single_trail(screen, block, start_tick, target_key, results, participant_id,
     # synchrnoized_sound_tick_ms
     synchronized_sound_ticks += [None for i in range(len(self_paced_key_responses))]
     
+    # onset_ns (perf_counter_ns of the sound, converted when the row is written)
+    sound_onsets_ns = synchronized_sound_onsets_ns + [None for i in range(len(self_paced_key_responses))]
+
     # key_response
     key_responses = ([response[0] for response in synchronized_key_responses] + 
                         [response[0] for response in self_paced_key_responses])
@@ -180,6 +246,10 @@ def single_trail(screen, block, start_tick, target_key, results, participant_id,
     assert len(synchronized_sound_ticks) == len(response_ticks)
     assert len(key_responses) == len(response_ticks)
 
+    # response_ns (perf_counter_ns of the key press)
+    responses_ns = ([response[2] for response in synchronized_key_responses] + 
+                    [response[2] for response in self_paced_key_responses])
+
     # interval_ms
     intervals = [None]
     for i in range(1, len(response_ticks)):
@@ -210,14 +280,16 @@ def single_trail(screen, block, start_tick, target_key, results, participant_id,
 
     end_time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
 
+    trial_rows = []
     for i in range(len(response_ticks)):
         # Extract the actual key pressed (or empty string if none)
         actual_key_pressed = key_responses[i] if key_responses[i] is not None else ""
         
-        single_trail_result = [participant_id, participant_id[0:2], block, trial, len(results) + 1, type[i], pace_ms, type[i], pace_ms, os.path.abspath(STIMULUS_PATH_1000),
-                               synchronized_sound_ticks[i], response_ticks[i], intervals[i], trial_type, actual_key_pressed, key_correct, start_time, end_time]
+        single_trail_result = [participant_id, participant_id[0:2], block, trial, len(results) + 1, type[i], pace_ms, type[i], pace_ms, stimulus_name,
+                               synchronized_sound_ticks[i], response_ticks[i], intervals[i], trial_type, actual_key_pressed, key_correct, start_time, end_time] + \
+                              session_clock.columns(sound_onsets_ns[i], responses_ns[i]) + latency_columns() + realtime_columns()
         results.append(single_trail_result)
-        if csv_file is not None:
-            with open(csv_file, mode='a', newline='') as file:
-                writer = csv.writer(file)
-                writer.writerow(single_trail_result)
\ No newline at end of file
+        trial_rows.append(single_trail_result)
+    if csv_file is not None:
+        # All tap rows of the trial, queued at once for the results writer thread
+        results_writer.write(csv_file, trial_rows, RESULTS_HEADER)
\ No newline at end of file
@@ -15,7 +15,7 @@ pygame.mixer.init()
 test_run_synchronized = False
 if test_run_synchronized:
     global_start = pygame.time.get_ticks()
-    run_synchronize_sound_ticks, run_synchronize_key_responses = run_synchronized(global_start, pygame.K_v, NUM_SYNCHRONIZED, STIMULUS_PATH_900)
+    run_synchronize_sound_ticks, run_synchronize_key_responses, run_synchronize_sound_onsets_ns = run_synchronized(global_start, pygame.K_v, NUM_SYNCHRONIZED, STIMULUS_PATH_900)
     assert len(run_synchronize_sound_ticks) == len(run_synchronize_key_responses)
     print()
     print("Synchronized - Sound ticks:", run_synchronize_sound_ticks)
@@ -38,7 +38,8 @@ if test_run_trial:
     global_start = pygame.time.get_ticks()
     (run_synchronize_sound_ticks, 
      run_synchronize_key_responses, 
-     run_self_pace_key_responses) = run_trial(global_start, 
+     run_self_pace_key_responses,
+     run_synchronize_sound_onsets_ns) = run_trial(global_start, 
                                               pygame.K_v, 
                                               NUM_SYNCHRONIZED, 
                                               NUM_SELF_PACE, 
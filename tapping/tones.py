@@ -0,0 +1,74 @@
+import os
+
+import numpy as np
+import pygame
+from meta_parameters import *
+from stimuli import *
+from metronome import get_sound
+
+# Synthesized tones ((frequency, duration, amplitude) -> pygame.mixer.Sound)
+_tones = {}
+
+# numpy sample type of each mixer sample format (pygame.mixer.get_init()[1])
+_SAMPLE_TYPES = {8: np.uint8, -8: np.int8, 16: np.uint16, -16: np.int16, 32: np.float32}
+
+
+def _to_samples(wave, size):
+    """Convert a wave in [-1, 1] to the mixer's sample format"""
+    sample_type = _SAMPLE_TYPES.get(size, np.int16)
+    if sample_type == np.float32:
+        return wave.astype(np.float32)
+    info = np.iinfo(sample_type)
+    if info.min < 0:
+        return np.round(wave * info.max).astype(sample_type)
+    # Unsigned formats: silence is the midpoint
+    midpoint = (int(info.max) + 1) // 2
+    return np.round(wave * (midpoint - 1) + midpoint).astype(sample_type)
+
+
+def get_tone(frequency, duration_ms, amplitude, ramp_ms=TONE_RAMP):
+    """
+    Sine tone as a pygame Sound, built in memory at the mixer's sample rate and format
+    (the mixer must be initialised); cached per (frequency, duration, amplitude)
+    :param frequency: Pitch (Hz)
+    :param duration_ms: Length of the tone (ms)
+    :param amplitude: Peak amplitude (0 - 1)
+    :param ramp_ms: Linear fade in / fade out (ms), so the tone starts and ends without a click
+    """
+    key = (frequency, duration_ms, amplitude)
+    tone = _tones.get(key)
+    if tone is None:
+        sample_rate, size, channels = pygame.mixer.get_init()
+        sample_count = int(round(sample_rate * duration_ms / 1000))
+        t = np.arange(sample_count) / sample_rate
+        wave = amplitude * np.sin(2 * np.pi * frequency * t)
+
+        # Envelope: fade in / fade out over ramp_ms at each end
+        ramp_count = min(int(round(sample_rate * ramp_ms / 1000)), sample_count // 2)
+        if ramp_count > 0:
+            ramp = np.linspace(0, 1, ramp_count, endpoint=False)
+            wave[:ramp_count] *= ramp
+            wave[-ramp_count:] *= ramp[::-1]
+
+        samples = _to_samples(wave, size)
+        if channels > 1:
+            samples = np.repeat(samples[:, np.newaxis], channels, axis=1)
+        tone = pygame.sndarray.make_sound(np.ascontiguousarray(samples))
+        _tones[key] = tone
+    return tone
+
+
+def tone_name(frequency, duration_ms, amplitude):
+    """Name recorded as the stimulus of a synthesized tone (same pattern as the tone files)"""
+    return f"tapping_task_tone_{frequency}Hz_{duration_ms}ms_{amplitude}amp (synthesized)"
+
+
+def get_stimulus():
+    """
+    Metronome sound and the name written to the results file's stimuli_path column:
+    the tone described by TONE_FREQUENCY / TONE_DURATION / TONE_AMPLITUDE, or STIMULUS_PATH_1000 if TONE_SYNTHESIS is off
+    """
+    if TONE_SYNTHESIS:
+        return (get_tone(TONE_FREQUENCY, TONE_DURATION, TONE_AMPLITUDE),
+                tone_name(TONE_FREQUENCY, TONE_DURATION, TONE_AMPLITUDE))
+    return get_sound(STIMULUS_PATH_1000), os.path.abspath(STIMULUS_PATH_1000)
@@ -0,0 +1,72 @@
+import gc
+import time
+
+
+class GCQuiet:
+    def __init__(self):
+        """
+        Keep Python's cyclic garbage collector out of presentation-critical spans.
+        begin() disables automatic collection (e.g. from fixation to response), release() re-enables it
+        and collects right away, in a gap where a pause does not matter (ISI, feedback, saving).
+        Also usable as a context manager (begin on enter, release on exit).
+        Every collection is timed through gc.callbacks, so pauses inside and outside the spans can be reported.
+        """
+        self.quiet = False
+        self.pauses = []   # (generation, pause ms, True if it happened inside a span) of every collection
+        self._was_enabled = True
+        self._start_ns = None
+        gc.callbacks.append(self._on_gc)
+
+    def _on_gc(self, phase, info):
+        if phase == "start":
+            self._start_ns = time.perf_counter_ns()
+        elif self._start_ns is not None:
+            self.pauses.append((info["generation"], (time.perf_counter_ns() - self._start_ns) / 1_000_000, self.quiet))
+            self._start_ns = None
+
+    def begin(self):
+        """Start a presentation-critical span: no automatic collection until release()"""
+        if not self.quiet:
+            self._was_enabled = gc.isenabled()
+            gc.disable()
+            self.quiet = True
+
+    def release(self):
+        """End the span and collect now (call it where a pause of a few ms is harmless)"""
+        if self.quiet:
+            self.quiet = False
+            if self._was_enabled:
+                gc.enable()
+            gc.collect()
+
+    def __enter__(self):
+        self.begin()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+        return False
+
+    def report(self, reset=True):
+        """
+        Collections inside / outside the spans:
+        {"in_window", "in_window_max_ms", "in_gap", "in_gap_total_ms", "in_gap_max_ms"}
+        """
+        in_window = [pause_ms for _, pause_ms, quiet in self.pauses if quiet]
+        in_gap = [pause_ms for _, pause_ms, quiet in self.pauses if not quiet]
+        summary = {
+            "in_window": len(in_window),
+            "in_window_max_ms": round(max(in_window, default=0), 3),
+            "in_gap": len(in_gap),
+            "in_gap_total_ms": round(sum(in_gap), 3),
+            "in_gap_max_ms": round(max(in_gap, default=0), 3),
+        }
+        if reset:
+            self.pauses = []
+        return summary
+
+    def close(self):
+        """Stop timing collections"""
+        self.release()
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
@@ -0,0 +1,79 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class ImageCache:
+    def __init__(self, budget_bytes):
+        """
+        Memory-bounded cache of stimulus images, decoded and scaled to their display size
+        and converted to the display pixel format (so blitting needs no conversion).
+        The least recently used images are evicted once the budget is exceeded.
+        :param budget_bytes: Maximum number of bytes of pixel data kept in the cache
+        """
+        self.budget_bytes = budget_bytes
+        self.surfaces = OrderedDict()   # (path, size) -> Surface
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _surface_bytes(surface):
+        return surface.get_pitch() * surface.get_height()
+
+    def _load(self, path, size):
+        """Decode, scale and convert one image"""
+        image = pygame.image.load(path)
+        image = pygame.transform.scale(image, size)
+        if image.get_flags() & pygame.SRCALPHA:
+            return image.convert_alpha()
+        return image.convert()
+
+    def _insert(self, key, surface):
+        self.surfaces[key] = surface
+        self.bytes += self._surface_bytes(surface)
+        # Evict least recently used images (never the one just inserted)
+        while self.bytes > self.budget_bytes and len(self.surfaces) > 1:
+            _, evicted = self.surfaces.popitem(last=False)
+            self.bytes -= self._surface_bytes(evicted)
+            self.evictions += 1
+
+    def get(self, path, size):
+        """
+        Return the display-ready image for path at size (width, height).
+        Raises the loading error if the image cannot be decoded.
+        """
+        key = (path, size)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self._load(path, size)
+        self._insert(key, surface)
+        return surface
+
+    def preload(self, paths, size):
+        """Decode all images of a block before it starts (images that fail to load are reported and skipped)"""
+        for path in paths:
+            key = (path, size)
+            if key in self.surfaces:
+                self.surfaces.move_to_end(key)
+                continue
+            try:
+                self._insert(key, self._load(path, size))
+            except Exception as e:
+                print(f"Error preloading image {path}: {e}")
+
+    def stats(self):
+        """Counters for logging: hits / misses / evictions / images / bytes"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "images": len(self.surfaces),
+            "bytes": self.bytes,
+        }
@@ -0,0 +1,81 @@
+import time
+
+import pygame
+
+# The last 2 ms before a deadline are busy-waited (sleep is too coarse for that)
+SPIN_NS = 2_000_000
+
+
+def get_refresh_rate():
+    """Refresh rate of the display in Hz, or 0 if pygame cannot report it"""
+    try:
+        return pygame.display.get_current_refresh_rate() or 0
+    except (AttributeError, pygame.error):
+        return 0
+
+
+class PresentationScheduler:
+    def __init__(self, refresh_rate=None):
+        """
+        Present screens at absolute onset deadlines (perf_counter_ns) instead of delaying after each flip,
+        so render and flip costs do not add up across the screens of a trial.
+        When the display reports its refresh rate, durations are rounded to whole refresh frames.
+        The planned and actual onset of every flip is recorded (see report()).
+        :param refresh_rate: Refresh rate in Hz (None: ask the display, 0: do not round to frames)
+        """
+        self.refresh_rate = get_refresh_rate() if refresh_rate is None else refresh_rate
+        self.frame_ns = int(1_000_000_000 / self.refresh_rate) if self.refresh_rate else 0
+        self.flips = []   # (label, planned onset ns, actual onset ns) of every flip
+
+    def duration_ns(self, duration_ms):
+        """Duration in ns, as a whole number of refresh frames (at least one) when the refresh rate is known"""
+        duration_ns = int(duration_ms * 1_000_000)
+        if self.frame_ns:
+            return max(1, round(duration_ns / self.frame_ns)) * self.frame_ns
+        return duration_ns
+
+    def wait_until(self, deadline_ns, poll=None):
+        """
+        Wait until deadline_ns. poll() (e.g. event handling) is called about once per millisecond;
+        if it returns True the wait ends early.
+        :return: True if poll() ended the wait, False once the deadline is reached
+        """
+        while True:
+            remaining_ns = deadline_ns - time.perf_counter_ns()
+            if remaining_ns <= 0:
+                return False
+            if poll is not None and poll():
+                return True
+            if remaining_ns > SPIN_NS:
+                time.sleep(min(remaining_ns - SPIN_NS, 1_000_000) / 1_000_000_000)
+
+    def flip(self, label, deadline_ns=None, poll=None):
+        """
+        Show the prepared screen at deadline_ns (right away if None) and record its onset.
+        :param label: Screen name used in the report (e.g. "fixation", "stimulus")
+        :return: Onset of the screen (perf_counter_ns right after the flip)
+        """
+        if deadline_ns is not None:
+            self.wait_until(deadline_ns, poll)
+        pygame.display.flip()
+        onset_ns = time.perf_counter_ns()
+        self.flips.append((label, onset_ns if deadline_ns is None else deadline_ns, onset_ns))
+        return onset_ns
+
+    def report(self, reset=True):
+        """
+        Planned versus actual onset per screen label:
+        {label: {"screens", "mean_late_ms", "max_late_ms"}} (only flips issued with a deadline count as planned).
+        """
+        summary = {}
+        for label, planned_ns, onset_ns in self.flips:
+            entry = summary.setdefault(label, {"screens": 0, "late_ms": []})
+            entry["screens"] += 1
+            entry["late_ms"].append((onset_ns - planned_ns) / 1_000_000)
+        for entry in summary.values():
+            late_ms = entry.pop("late_ms")
+            entry["mean_late_ms"] = round(sum(late_ms) / len(late_ms), 3)
+            entry["max_late_ms"] = round(max(late_ms), 3)
+        if reset:
+            self.flips = []
+        return summary
@@ -0,0 +1,120 @@
+import ctypes
+import ctypes.util
+import os
+import sys
+
+# Launch options: python main.py --realtime [--cpu N]
+REALTIME_FLAG = "--realtime"
+CPU_FLAG = "--cpu"
+
+# Round-robin real-time priority (1-99), and the nice value tried when real-time scheduling is not permitted
+REALTIME_PRIORITY = 10
+NICE_VALUE = -10
+# How late (ns) the kernel may wake a sleeping thread (Linux default: 50 us)
+TIMER_SLACK_NS = 1
+PR_SET_TIMERSLACK = 29
+
+# What enable_realtime() managed to apply (written with every results row, see realtime_columns)
+realtime_status = {"mode": "off"}
+
+
+def parse_options(argv=None):
+    """
+    Read the launch options
+    :return: (realtime requested, core to pin to or None)
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    cpu = None
+    for i, arg in enumerate(argv):
+        if arg == CPU_FLAG and i + 1 < len(argv):
+            cpu = argv[i + 1]
+        elif arg.startswith(CPU_FLAG + "="):
+            cpu = arg.split("=", 1)[1]
+    try:
+        cpu = int(cpu) if cpu is not None else None
+    except ValueError:
+        print(f"Ignoring {CPU_FLAG} {cpu}: not a core number")
+        cpu = None
+    return REALTIME_FLAG in argv, cpu
+
+
+def _set_priority():
+    if hasattr(os, "sched_setscheduler") and hasattr(os, "SCHED_RR"):
+        try:
+            os.sched_setscheduler(0, os.SCHED_RR, os.sched_param(REALTIME_PRIORITY))
+            return f"SCHED_RR {REALTIME_PRIORITY}"
+        except (PermissionError, OSError):
+            pass  # not permitted: try a lower nice value instead
+    try:
+        return f"nice {os.nice(NICE_VALUE - os.nice(0))}"
+    except (PermissionError, OSError, AttributeError):
+        return "unchanged (not permitted)"
+
+
+def _set_affinity(cpu):
+    if not hasattr(os, "sched_setaffinity"):
+        return "unchanged (unavailable)"
+    if cpu is None:
+        # Not pinned by default: the audio, results-writer and decoder threads inherit the affinity and
+        # would share one core with a main thread that busy-polls for responses
+        return "unchanged (no --cpu)"
+    if cpu not in os.sched_getaffinity(0):
+        return f"unchanged (core {cpu} not available)"
+    try:
+        os.sched_setaffinity(0, {cpu})
+        return f"core {cpu}"
+    except OSError as e:
+        return f"unchanged ({e.strerror})"
+
+
+def _set_timer_slack():
+    if not sys.platform.startswith("linux"):
+        return "unchanged (unavailable)"
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if libc.prctl(PR_SET_TIMERSLACK, TIMER_SLACK_NS, 0, 0, 0) != 0:
+            return f"unchanged ({os.strerror(ctypes.get_errno())})"
+        return f"{TIMER_SLACK_NS} ns"
+    except (OSError, AttributeError, TypeError):
+        return "unchanged (unavailable)"
+
+
+def enable_realtime(cpu=None):
+    """
+    Raise the priority of this process, lower its timer slack and, with cpu, pin it to that core, as far as permitted
+    (each step falls back to leaving the setting unchanged). Call before pygame.init() and before any
+    thread is started, so that all threads inherit the settings.
+    :param cpu: Core to pin every thread to (None: not pinned)
+    :return: realtime_status
+    """
+    global realtime_status
+    realtime_status = {
+        "mode": "realtime",
+        "priority": _set_priority(),
+        "affinity": _set_affinity(cpu),
+        "timer_slack": _set_timer_slack(),
+    }
+    print(f"Real-time mode: {realtime_status}")
+    return realtime_status
+
+
+def apply_launch_options(argv=None):
+    """Enable real-time mode if the task was started with --realtime [--cpu N]"""
+    realtime, cpu = parse_options(argv)
+    if realtime:
+        enable_realtime(cpu)
+    return realtime_status
+
+
+# Columns added to every results row (see realtime_columns)
+REALTIME_COLUMNS = ["realtime"]
+
+
+def realtime_summary():
+    """What real-time mode applied, as one line: "off", or e.g. priority=nice -10; affinity=core 3; timer_slack=1 ns"""
+    return "; ".join(f"{key}={value}" for key, value in realtime_status.items() if key != "mode") or "off"
+
+
+def realtime_columns():
+    """Values of REALTIME_COLUMNS"""
+    return [realtime_summary()]
@@ -0,0 +1,42 @@
+import time
+from datetime import datetime
+
+# Columns added to every results row (see SessionClock.columns)
+SESSION_COLUMNS = ["session_start", "onset_ns", "response_ns"]
+
+
+class SessionClock:
+    def __init__(self):
+        """
+        One timebase for all timestamps of a session.
+        At launch, a wall-clock anchor is sampled together with a time.perf_counter_ns() origin.
+        Session times are monotonic ns since that origin, and the anchor maps them back to wall-clock
+        time, so results files (and external recordings) can be aligned at sub-millisecond precision.
+        """
+        before_ns = time.perf_counter_ns()
+        self.anchor_time = time.time()
+        after_ns = time.perf_counter_ns()
+        # Origin: midpoint of the two perf_counter samples around the wall-clock read
+        self.origin_ns = (before_ns + after_ns) // 2
+        self.anchor = datetime.fromtimestamp(self.anchor_time).astimezone().isoformat(timespec="microseconds")
+
+    def now_ns(self):
+        """Monotonic ns since the session origin"""
+        return time.perf_counter_ns() - self.origin_ns
+
+    def session_ns(self, perf_ns):
+        """Convert a time.perf_counter_ns() value (e.g. a flip onset) to ns since the session origin (None stays None)"""
+        return None if perf_ns is None else perf_ns - self.origin_ns
+
+    def wall_time(self, session_ns):
+        """Wall-clock time (seconds since the epoch) of a session time"""
+        return self.anchor_time + session_ns / 1_000_000_000
+
+    def columns(self, onset_perf_ns, response_perf_ns=None):
+        """
+        Values of SESSION_COLUMNS for one trial
+        :param onset_perf_ns: perf_counter_ns onset of the screen the reaction time is measured from
+        :param response_perf_ns: perf_counter_ns of the response (None: no response)
+        """
+        response_ns = self.session_ns(response_perf_ns)
+        return [self.anchor, self.session_ns(onset_perf_ns), "" if response_ns is None else response_ns]
@@ -8,6 +8,17 @@ import pygame.event
 
 from Instruction import Instruction
 from FeedbackIcon import FeedbackIcon
+from ImageCache import ImageCache
+from InstructionPager import InstructionPager
+from TextCache import render_text, get_overlay
+from PresentationScheduler import PresentationScheduler
+from SessionClock import SessionClock, SESSION_COLUMNS
+from GCQuiet import GCQuiet
+from RealtimeMode import apply_launch_options, REALTIME_COLUMNS, realtime_columns
+from WarmUp import WarmUp, render_offscreen
+from IdleScreen import IdleScreen, IDLE_TIMEOUT_MS
+from ResultsWriter import ResultsWriter
+from SessionStore import open_store
 
 
 # Meta-parameters
@@ -33,17 +44,25 @@ FIXATION_TIME = 250             # Fixation cross duration (0.25 seconds)
 ISI_TIME = 500                  # Inter-stimulus interval (blank screen between trials) (0.5 seconds)
 FEEDBACK_DURATION = 1000        # Additional time to show feedback with stimulus (1 second)
 
+# Stimulus image cache (display-ready images, least recently used evicted above the budget)
+IMAGE_CACHE_BUDGET_MB = 512
+
 # Instruction and task settings
 TOTAL_INSTRUCTION_PAGES = 20
 DEMO_PAGE = 12
 TEST1_PAGE = 15
 TEST2_PAGE = 19
+# Block started by SPACE on the page before it (the warm-up runs while that page is up)
+BLOCK_PAGES = {DEMO_PAGE: "demo", TEST1_PAGE: "test1", TEST2_PAGE: "test2"}
 
 global_start_time = None
+# Session timebase (wall-clock anchor + perf_counter_ns origin) for the onset/response columns
+session_clock = SessionClock()
 global_end_time = None
 break_start_time = None
 break_end_time = None
 break_duration_ms = 0
+results_filename = None  # Chosen once per session (see initialize_results_file)
 
 # Phase data
 phase_data = {
@@ -59,6 +78,9 @@ trial_counters = {
     "test2": 0
 }
 
+# Real-time process mode (launch option --realtime [--cpu N]); before pygame.init() so its threads inherit it
+apply_launch_options()
+
 # Initialize pygame
 pygame.init()
 
@@ -94,18 +116,49 @@ SCREEN_HEIGHT = screen_info.current_h
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN)
 pygame.display.set_caption("Mental Rotation Test")
 
+# Presents the trial screens at absolute onset deadlines
+scheduler = PresentationScheduler()
+# No garbage collection from fixation to the ISI (collected during the ISI instead)
+gc_quiet = GCQuiet()
+# Warm-up before each block, and first-trial vs steady-state onset latency
+warm_up = WarmUp()
+
+# Results rows are written on a background thread (no disk latency in the trial loop),
+# and also to a SQLite database with the launch option --results-db [PATH]
+results_writer = ResultsWriter(store=open_store("3D", os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")))
+
+# Participant ID, instruction and result screens sleep until there is input (CPU usage per screen type)
+idle_screen = IdleScreen()
+
 # Fonts
 font_large = pygame.font.SysFont(None, 72)
 font_medium = pygame.font.SysFont(None, 48)
 
+# Stimulus images (preloaded per block, see run_trials)
+image_cache = ImageCache(IMAGE_CACHE_BUDGET_MB * 1024 * 1024)
+
 def get_participant_id(screen):
     global global_start_time
     global_start_time = time.time()
     input_text = ""
     active = True
 
+    changed = True
     while active:
-        for event in pygame.event.get():
+        # Redraw only after input, and sleep until the next event
+        with idle_screen.measure("participant_id"):
+            if idle_screen.redraw(changed):
+                screen.fill(GRAY_RGB)
+                prompt = font_medium.render("Enter Participant ID (press enter when completed):", True, BLACK_RGB)
+                text_surface = font_medium.render(input_text, True, BLACK_RGB)
+                screen.blit(prompt, (SCREEN_WIDTH // 2 - prompt.get_width() // 2, SCREEN_HEIGHT // 2 - 100))
+                screen.blit(text_surface, (SCREEN_WIDTH // 2 - text_surface.get_width() // 2, SCREEN_HEIGHT // 2))
+                pygame.display.flip()
+                changed = False
+            events = idle_screen.wait()
+
+        for event in events:
+            changed = True
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
@@ -121,32 +174,30 @@ def get_participant_id(screen):
                 else:
                     input_text += event.unicode
 
-        screen.fill(GRAY_RGB)
-        prompt = font_medium.render("Enter Participant ID (press enter when completed):", True, BLACK_RGB)
-        text_surface = font_medium.render(input_text, True, BLACK_RGB)
-        screen.blit(prompt, (SCREEN_WIDTH // 2 - prompt.get_width() // 2, SCREEN_HEIGHT // 2 - 100))
-        screen.blit(text_surface, (SCREEN_WIDTH // 2 - text_surface.get_width() // 2, SCREEN_HEIGHT // 2))
-        pygame.display.flip()
-
     pygame.event.clear()
     return input_text
 
 def load_instructions():
-    instruction_objects = []
-    for i in range(1, TOTAL_INSTRUCTION_PAGES + 1):
-        img_path = os.path.join(INSTRUCTION_DIR, f"{i}.jpg")
-        instruction_objects.append(Instruction(img_path))
+    # Pages are decoded and scaled in the background a few pages ahead of the one on screen
+    instruction_pages = InstructionPager(
+        [os.path.join(INSTRUCTION_DIR, f"{i}.jpg") for i in range(1, TOTAL_INSTRUCTION_PAGES + 1)],
+        lambda img_path: Instruction(img_path).image)
+    instruction_pages.prefetch(0)
 
     instruction_index = 0
     instruction_locked = True
     unlock_timer = pygame.time.get_ticks()
     READ_TIME = ACTUAL_READ_TIME if MODE == "actual" else TEST_READ_TIME
+    warmed_up_page = None
 
+    events = []
+    changed = True
     waiting = True
     while waiting:
         current_time = pygame.time.get_ticks()
 
-        for event in pygame.event.get():
+        changed = changed or bool(events)
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
@@ -179,32 +230,61 @@ def load_instructions():
         if current_time - unlock_timer >= READ_TIME:
             instruction_locked = False
 
-        screen.fill(GRAY_RGB)
-        if instruction_index < TOTAL_INSTRUCTION_PAGES:
-            img = instruction_objects[instruction_index].image
-            if img:
-                img_rect = img.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-                screen.blit(img, img_rect)
-                pygame.display.flip()
-            else:
-                break
-
-def run_trials(phase):
+        # Redraw only when the page changed (page turn, block, fullscreen toggle)
+        with idle_screen.measure("instructions"):
+            if idle_screen.redraw(changed):
+                changed = False
+                screen.fill(GRAY_RGB)
+                if instruction_index < TOTAL_INSTRUCTION_PAGES:
+                    img = instruction_pages.get(instruction_index)
+                    if img:
+                        img_rect = img.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+                        screen.blit(img, img_rect)
+                        pygame.display.flip()
+                    else:
+                        break
+
+        if not waiting:
+            break
+
+        # Last page before a block: warm up while it is being read
+        next_phase = BLOCK_PAGES.get(instruction_index + 1)
+        if next_phase and warmed_up_page != instruction_index:
+            warm_up_block(next_phase)
+            warmed_up_page = instruction_index
+
+        # Sleep until the next key press, or until the reading time of the page is over
+        with idle_screen.measure("instructions"):
+            events = idle_screen.wait(unlock_timer + READ_TIME - pygame.time.get_ticks() if instruction_locked else IDLE_TIMEOUT_MS)
+
+    instruction_pages.close()
+    print(f"Instruction pages: {instruction_pages.stats()}")
+    print(f"CPU usage of the waiting screens: {idle_screen.report()}")
+
+
+def get_response_overlay():
+    """Response labels: D on the left, K on the right, each with its answer below"""
+    if VERSION == 1:
+        text_D_label, text_K_label = "Same", "Different"
+    else:
+        text_D_label, text_K_label = "Different", "Same"
+    return get_overlay((SCREEN_WIDTH, SCREEN_HEIGHT), (
+        ("D", 48, BLACK_RGB, (SCREEN_WIDTH // 3.5, SCREEN_HEIGHT - 250)),
+        (text_D_label, 48, BLACK_RGB, (SCREEN_WIDTH // 3.5, SCREEN_HEIGHT - 210)),
+        ("K", 48, BLACK_RGB, (2.5 * SCREEN_WIDTH // 3.5, SCREEN_HEIGHT - 250)),
+        (text_K_label, 48, BLACK_RGB, (2.5 * SCREEN_WIDTH // 3.5, SCREEN_HEIGHT - 210)),
+    ), background=GRAY_RGB)
+
+def read_trial_conditions(phase):
+    """Trial conditions of a block, in a random order (None if the condition file cannot be read)"""
     if MODE == "actual":
-        max_respond_time = ACTUAL_MAX_RESPOND_TIME
+        suffix = f"_{VERSION}"
+    elif phase == "demo":
         suffix = f"_{VERSION}"
     else:
-        max_respond_time = TEST_MAX_RESPOND_TIME
-        if phase == "demo":
-            suffix = f"_{VERSION}"
-        elif phase == "test1" or phase == "test2":
-            suffix = f"_short_{VERSION}"
+        suffix = f"_short_{VERSION}"
 
     condition_path = os.path.join(CONDITION_DIR, f"{phase}{suffix}.csv")
-    feedback_icons = FeedbackIcon()
-
-    # Initialize the results file for this phase
-    initialize_results_file(phase)
 
     trial_conditions = []
     try:
@@ -234,16 +314,78 @@ def run_trials(phase):
         return None
 
     random.shuffle(trial_conditions)
+    return trial_conditions
+
+# Blocks prepared by the warm-up: phase -> trial conditions
+prepared_blocks = {}
+
+def warm_up_block(phase):
+    """
+    Warm-up before a block (while its last instruction page is up): read the conditions and decode the block's
+    images, load the fonts, draw the fixation cross, response labels and images offscreen, and open the results file
+    """
+    stimulus_size = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+
+    def images():
+        trial_conditions = read_trial_conditions(phase)
+        prepared_blocks[phase] = trial_conditions
+        if trial_conditions:
+            image_cache.preload([cond["stimuli_path"] for cond in trial_conditions], stimulus_size)
+
+    def fonts():
+        get_response_overlay()
+        render_text("Too Slow!", 48, YELLOW_RGB)
+
+    def render():
+        surfaces = [get_response_overlay(), render_text("Too Slow!", 48, YELLOW_RGB)]
+        for cond in prepared_blocks.get(phase) or []:
+            surfaces.append(image_cache.get(cond["stimuli_path"], stimulus_size))
+        canvas = render_offscreen(screen, surfaces, GRAY_RGB)
+        pygame.draw.line(canvas, BLACK_RGB, (SCREEN_WIDTH // 2 - 40, SCREEN_HEIGHT // 2),
+                         (SCREEN_WIDTH // 2 + 40, SCREEN_HEIGHT // 2), 6)
+        pygame.draw.line(canvas, BLACK_RGB, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 40),
+                         (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 40), 6)
+
+    def results_file():
+        initialize_results_file(phase)
+        results_writer.open(os.path.join(RESULT_DIR, results_filename), RESULTS_HEADER)
+
+    warm_up.run(phase, [("images", images), ("fonts", fonts), ("render", render), ("results_file", results_file)])
+
+def run_trials(phase):
+    if MODE == "actual":
+        max_respond_time = ACTUAL_MAX_RESPOND_TIME
+    else:
+        max_respond_time = TEST_MAX_RESPOND_TIME
+
+    feedback_icons = FeedbackIcon()
+
+    # Initialize the results file for this phase
+    initialize_results_file(phase)
+
+    # Conditions from the warm-up (read now if the block was not warmed up)
+    trial_conditions = prepared_blocks.pop(phase, None)
+    if trial_conditions is None:
+        trial_conditions = read_trial_conditions(phase)
+        if trial_conditions is None:
+            return None
+
     record = []
+    next_onset_ns = None  # Fixation onset deadline of the next trial (end of the previous ISI)
+
+    # Decode the whole block at display size / format before the first trial (already done by the warm-up)
+    image_cache.preload([cond["stimuli_path"] for cond in trial_conditions], (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+    print(f"Image cache after preloading {phase}: {image_cache.stats()}")
 
     for idx, cond in enumerate(trial_conditions):
         try:
-            img = pygame.image.load(cond["stimuli_path"])
-            img = pygame.transform.scale(img, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+            img = image_cache.get(cond["stimuli_path"], (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
         except Exception as e:
             print(f"Error loading image {cond['stimuli_path']}: {e}")
             continue
 
+        gc_quiet.begin()
+
         # 1. Show fixation cross for 250ms (using same style as cognitive_control)
         screen.fill(GRAY_RGB)  # Black background instead of gray
         
@@ -257,47 +399,28 @@ def run_trials(phase):
              (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 40),
              (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 40), 6)
         
-        pygame.display.flip()
-        pygame.time.delay(FIXATION_TIME)
+        fixation_onset_ns = scheduler.flip("fixation", next_onset_ns)
 
         # 2. Show stimulus until response (max 7500ms)
-        screen.fill(GRAY_RGB)
+        # Response labels on the gray background (pre-rendered once per screen size), then the stimulus
+        screen.blit(get_response_overlay(), (0, 0))
         img_rect = img.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
         screen.blit(img, img_rect)
-
-        label_font = pygame.font.SysFont(None, 48)
-        if VERSION == 1:
-            # Left side - D key
-            text_D = label_font.render("D", True, BLACK_RGB)
-            text_D_label = label_font.render("Same", True, BLACK_RGB)
-            # Right side - K key
-            text_K = label_font.render("K", True, BLACK_RGB)
-            text_K_label = label_font.render("Different", True, BLACK_RGB)
-        else:
-            # Left side - D key
-            text_D = label_font.render("D", True, BLACK_RGB)
-            text_D_label = label_font.render("Different", True, BLACK_RGB)
-            # Right side - K key
-            text_K = label_font.render("K", True, BLACK_RGB)
-            text_K_label = label_font.render("Same", True, BLACK_RGB)
-        
-        # Position letters and labels
-        # Left side (D) - moved down and slightly more separated
-        screen.blit(text_D, (SCREEN_WIDTH // 3.5 - text_D.get_width() // 2, SCREEN_HEIGHT - 250))
-        screen.blit(text_D_label, (SCREEN_WIDTH // 3.5 - text_D_label.get_width() // 2, SCREEN_HEIGHT - 210))
-        # Right side (K) - moved down and slightly more separated
-        screen.blit(text_K, (2.5 * SCREEN_WIDTH // 3.5 - text_K.get_width() // 2, SCREEN_HEIGHT - 250))
-        screen.blit(text_K_label, (2.5 * SCREEN_WIDTH // 3.5 - text_K_label.get_width() // 2, SCREEN_HEIGHT - 210))
-        pygame.display.flip()
+        stimulus_planned_ns = fixation_onset_ns + scheduler.duration_ns(FIXATION_TIME)
+        stimulus_onset_ns = scheduler.flip("stimulus", stimulus_planned_ns)
+        warm_up.onset((stimulus_onset_ns - stimulus_planned_ns) / 1_000_000)
 
         pygame.event.clear()
-        trial_start = pygame.time.get_ticks()
         responded = False
         correct = False
         key_response = None
         key_locked = False
+        response_ns = None
 
-        while pygame.time.get_ticks() - trial_start < max_respond_time:
+        # The response window and reaction_time are measured from the stimulus flip, on the same
+        # clock as onset_ns / response_ns
+        response_deadline_ns = stimulus_onset_ns + max_respond_time * 1_000_000
+        while time.perf_counter_ns() < response_deadline_ns:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     pygame.quit()
@@ -312,15 +435,18 @@ def run_trials(phase):
                             key_response = "d"
                             correct = (cond["key_correct"] == "d")
                             key_locked = True
+                            response_ns = time.perf_counter_ns()
                         elif event.key == pygame.K_k:
                             responded = True
                             key_response = "k"
                             correct = (cond["key_correct"] == "k")
                             key_locked = True
+                            response_ns = time.perf_counter_ns()
             if responded:
                 break
 
-        reaction_time = pygame.time.get_ticks() - trial_start
+        # No response: the time the window stayed open
+        reaction_time = round(((response_ns or time.perf_counter_ns()) - stimulus_onset_ns) / 1_000_000, 3)
 
         # Create trial data
         trial_data = {
@@ -335,7 +461,9 @@ def run_trials(phase):
             "key_response": key_response,
             "correct": int(correct),
             "reaction_time": reaction_time,
-            "trial_end_time": time.time()  # Add end time for this trial
+            "trial_end_time": time.time(),  # Add end time for this trial
+            "onset_ns": stimulus_onset_ns,
+            "response_ns": response_ns
         }
 
         # Save trial immediately to CSV file
@@ -353,7 +481,7 @@ def run_trials(phase):
             
             if not responded:
                 # Show "Too Slow!" in yellow
-                feedback_text = font_medium.render("Too Slow!", True, YELLOW_RGB)  # Yellow color
+                feedback_text = render_text("Too Slow!", 48, YELLOW_RGB)  # Yellow color
                 feedback_rect = feedback_text.get_rect(center=(SCREEN_WIDTH // 2, feedback_y_position))
                 screen.blit(feedback_text, feedback_rect)
             else:
@@ -362,14 +490,26 @@ def run_trials(phase):
                 feedback_rect = feedback_img.get_rect(center=(SCREEN_WIDTH // 2, feedback_y_position))
                 screen.blit(feedback_img, feedback_rect)
             
-            pygame.display.flip()
-            pygame.time.delay(FEEDBACK_DURATION)  # 200ms additional feedback time
-        
+            feedback_onset_ns = scheduler.flip("feedback")
+            isi_deadline_ns = feedback_onset_ns + scheduler.duration_ns(FEEDBACK_DURATION)  # 200ms additional feedback time
+        else:
+            isi_deadline_ns = None
+
         # 4. ISI - Blank black screen between trials (500ms)
         screen.fill(GRAY_RGB)
-        pygame.display.flip()
-        pygame.time.delay(ISI_TIME)  # 500ms blank screen using new ISI_TIME
-
+        isi_onset_ns = scheduler.flip("isi", isi_deadline_ns)
+        next_onset_ns = isi_onset_ns + scheduler.duration_ns(ISI_TIME)
+        gc_quiet.release()  # collect while the ISI is on screen
+
+    # Keep the last ISI on screen for its full duration
+    if next_onset_ns is not None:
+        scheduler.wait_until(next_onset_ns)
+    # One database transaction for the rows of the block (--results-db)
+    results_writer.end_block()
+    print(f"Screen onsets for {phase} (planned vs actual): {scheduler.report()}")
+    print(f"Garbage collection pauses for {phase}: {gc_quiet.report()}")
+    print(f"Image cache after {phase}: {image_cache.stats()}")
+    print(f"Onset latency, first trial vs steady state, for {phase}: {warm_up.report()}")
     return record
 
 def show_results(phase, result):
@@ -394,7 +534,10 @@ def show_results(phase, result):
 
     waiting = True
     while waiting:
-        for event in pygame.event.get():
+        # Nothing changes on this page: sleep until the next key press
+        with idle_screen.measure("results"):
+            events = idle_screen.wait()
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
@@ -405,39 +548,41 @@ def show_results(phase, result):
                 elif event.key == pygame.K_SPACE:
                     waiting = False
 
+# Columns of the results file
+RESULTS_HEADER = [
+    "participant_id", "version", "mode", "item_number", "block", "object_id", "rotation_angle", "different",
+    "condition", "difficulty", "stimuli_path", "key_correct", "key_response",
+    "correct", "reaction_time_ms", "start_time", "end_time", "break_duration_ms"
+] + SESSION_COLUMNS + REALTIME_COLUMNS
+
 def initialize_results_file(phase):
     """Initialize CSV file with headers at the start of each phase"""
     if not os.path.exists(RESULT_DIR):
         os.makedirs(RESULT_DIR)
     
-    # Automatic file versioning system
+    # Automatic file versioning system (the filename is chosen on the first call only)
     global results_filename
     base_filename = f"{participant_id}_3D_results.csv"
     filepath = os.path.join(RESULT_DIR, base_filename)
-    if not os.path.exists(RESULT_DIR):
-        os.makedirs(RESULT_DIR)
-    if not os.path.exists(filepath):
-        results_filename = base_filename
-    else:
-        name_part, ext = os.path.splitext(base_filename)
-        version = 2
-        while True:
-            versioned_filename = f"{name_part}_{version}{ext}"
-            versioned_filepath = os.path.join(RESULT_DIR, versioned_filename)
-            if not os.path.exists(versioned_filepath):
-                results_filename = versioned_filename
-                break
-            version += 1
+    if results_filename is None:
+        if not os.path.exists(filepath):
+            results_filename = base_filename
+        else:
+            name_part, ext = os.path.splitext(base_filename)
+            version = 2
+            while True:
+                versioned_filename = f"{name_part}_{version}{ext}"
+                versioned_filepath = os.path.join(RESULT_DIR, versioned_filename)
+                if not os.path.exists(versioned_filepath):
+                    results_filename = versioned_filename
+                    break
+                version += 1
     # Create the new file with headers only if it doesn't exist
     filepath = os.path.join(RESULT_DIR, results_filename)
     if not os.path.exists(filepath):
         with open(filepath, "w", newline="") as f:
             writer = csv.writer(f)
-            writer.writerow([
-                "participant_id", "version", "mode", "item_number", "block", "object_id", "rotation_angle", "different",
-                "condition", "difficulty", "stimuli_path", "key_correct", "key_response",
-                "correct", "reaction_time_ms", "start_time", "end_time", "break_duration_ms"
-            ])
+            writer.writerow(RESULTS_HEADER)
         print(f"✅ Initialized results file: {results_filename}")
 
 def save_trial_immediately(phase, trial_data):
@@ -456,29 +601,28 @@ def save_trial_immediately(phase, trial_data):
     # Set mode value based on MODE variable
     mode_value = "full" if MODE == "actual" else "demo"
     filepath = os.path.join(RESULT_DIR, results_filename)
-    # Append the trial data to the file
-    with open(filepath, "a", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow([
-            participant_id,
-            VERSION,
-            mode_value,
-            trial_data["item_number"] + cumulative_id,
-            block,
-            trial_data["object_id"],
-            trial_data["rotation_angle"],
-            trial_data["different"],
-            trial_data["condition"],
-            trial_data["difficulty"],
-            trial_data["stimuli_path"],
-            trial_data["key_correct"],
-            trial_data["key_response"],
-            trial_data["correct"],
-            trial_data["reaction_time"],
-            time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(global_start_time)),
-            time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(trial_data["trial_end_time"])),
-            break_duration_ms if phase == "test2" else 0
-        ])
+    # Queue the trial data for the results writer thread (appends to the handle opened by the warm-up)
+    results_writer.write(filepath, [[
+        participant_id,
+        VERSION,
+        mode_value,
+        trial_data["item_number"] + cumulative_id,
+        block,
+        trial_data["object_id"],
+        trial_data["rotation_angle"],
+        trial_data["different"],
+        trial_data["condition"],
+        trial_data["difficulty"],
+        trial_data["stimuli_path"],
+        trial_data["key_correct"],
+        trial_data["key_response"],
+        trial_data["correct"],
+        trial_data["reaction_time"],
+        time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(global_start_time)),
+        time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(trial_data["trial_end_time"])),
+        break_duration_ms if phase == "test2" else 0
+    ] + session_clock.columns(trial_data["onset_ns"], trial_data["response_ns"]) + realtime_columns()],
+        header=RESULTS_HEADER)
     # Increment the trial counter for this phase
     trial_counters[phase] += 1
     print(f"✅ Saved trial {trial_counters[phase]} for phase {phase}")
@@ -503,6 +647,8 @@ RESULT_DIR = os.path.join(SCRIPT_DIR, "results")
 CONDITION_DIR = os.path.join(SCRIPT_DIR, "stimuli", "conditions")
 
 load_instructions()
+results_writer.close()
+print(f"Results writer (queue depth, write latency): {results_writer.report()}")
 
 global_end_time = time.time()
 print("Task completed!")